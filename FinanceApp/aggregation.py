@@ -0,0 +1,42 @@
+"""Vectorized group-by sums over integer-coded columns."""
+import numpy as np
+
+DENSE_CODES = 1 << 16
+
+
+def factorize(values):
+    """
+    Replace the values with integer codes.
+
+    :param values: values to encode
+    :type values: numpy.ndarray
+    :return: sorted distinct values and the code of every value
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    uniques, codes = np.unique(values, return_inverse=True)
+    return uniques, codes.reshape(-1)
+
+
+def code_sums(codes, amounts):
+    """
+    Sum the amounts by code.
+
+    Codes which are small compared to the number of rows are counted directly with :func:`numpy.bincount`,
+    other codes are factorized first.
+
+    :param codes: non-negative group code of every row
+    :type codes: numpy.ndarray
+    :param amounts: amount of every row
+    :type amounts: numpy.ndarray
+    :return: codes of the groups, sums of their amounts and numbers of their rows
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+    """
+    if not len(codes):
+        return codes[:0], np.zeros(0), np.zeros(0, dtype=np.int64)
+    if codes.max() < max(len(codes), DENSE_CODES):
+        counts = np.bincount(codes)
+        sums = np.bincount(codes, weights=amounts)
+        groups = np.flatnonzero(counts)
+        return groups, sums[groups], counts[groups]
+    groups, inverse = factorize(codes)
+    return groups, np.bincount(inverse, weights=amounts), np.bincount(inverse)
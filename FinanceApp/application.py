@@ -1,15 +1,24 @@
 """Base window of application."""
+import argparse
+import datetime
 import os
 import gettext
 import locale
 import platform
+import sys
 import tkinter as tk
+import tkinter.filedialog
+import tkinter.messagebox
 
 from tkinter import font
 
-from FinanceApp.month_window import MonthWindow
-from FinanceApp.statistic_window import StatisticsWindow
+from FinanceApp import importer, tracing
+from FinanceApp.month_window import MonthWindow, parse_date
+from FinanceApp.search_window import SearchWindow
+from FinanceApp.statistic_window import StatisticsWindow, prewarm_backend
+from FinanceApp.storage import JournalStorage, SQLiteStorage, YearFileStorage
 from FinanceApp.utils import config_widget
+from FinanceApp.years import MAX_YEARS, YearPartition, YearPartitions, YearSummaries, year_path
 
 if platform.system() != 'Windows':
     locale.setlocale(locale.LC_ALL, locale.getdefaultlocale())
@@ -17,30 +26,89 @@ localedir = gettext.find('Months')
 localedir = localedir if localedir is not None else os.path.dirname(__file__)
 gettext.install('Months', localedir, names=('ngettext', ))
 
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser('~'), '.financeapp')
+DEFAULT_DATABASE = os.path.join(DEFAULT_DIRECTORY, 'ledger.db')
+DEFAULT_JOURNAL = os.path.join(DEFAULT_DIRECTORY, 'journal')
+DEFAULT_YEAR_FILE = os.path.join(DEFAULT_DIRECTORY, 'ledger.year')
+DEFAULT_RULES = os.path.join(DEFAULT_DIRECTORY, 'rules.json')
+DEFAULT_SUMMARIES = os.path.join(DEFAULT_DIRECTORY, 'summaries.json')
+PREWARM_DELAY = 1000
+
 
 class Application(tk.Frame):
     """
     Main window class.
 
+    Every year is a partition with its own storage, year cube, search index and month windows. The
+    attributes of the selected year are available as the attributes of the application.
+
     :param master: master window
     :param title: title of the application
+    :param storage: storage of the month data of the selected year, the data is kept in memory only if not set
+    :type storage: storage.storage.Storage
+    :param commit_interval: interval in milliseconds between commits of the storage changes
+    :type commit_interval: int
+    :param rules: category rules for the imported statements
+    :type rules: List[importer.Rule]
+    :param prewarm: load the plotting libraries in the background after the window is shown or not
+    :type prewarm: bool
+    :param year: selected year, the current year if not set
+    :type year: int
+    :param partitions: open years, the other years are kept in memory only if not set
+    :type partitions: years.YearPartitions
     """
 
-    def __init__(self, master=None, title=_('Finance management app')):
+    def __init__(self, master=None, title=_('Finance management app'), storage=None, commit_interval=500,
+                 rules=(), prewarm=False, year=None, partitions=None):
         """Create main window of application with widgets."""
         if not master:
             master = tk.Tk()
         super().__init__(master=master, relief='ridge', bg='white', takefocus=1)
-        self.master.title(title)
         self.master.minsize(width=1265, height=755)
         self.font = font.Font(font=('Lucida Sans', 12, 'normal'))
+        self.app_title = title
+        self.year = year if year is not None else datetime.date.today().year
+        self.partitions = partitions if partitions is not None else YearPartitions()
+        if storage is not None:
+            self.partitions.add(YearPartition(self.year, storage))
+        self.partition = self.partitions.get(self.year)
+        self.commit_interval = commit_interval
+        self.rules = rules
         self._create_widgets()
         self.grid(sticky=tk.NSEW, row=0, column=0)
         config_widget(self.master)
         config_widget(self)
+        self.after(self.commit_interval, self._commit)
+        if prewarm:
+            self.after(PREWARM_DELAY, prewarm_backend)
 
     def _create_widgets(self):
         """Create all basic widgets of the main window."""
+        self.menu = tk.Menu(self.master)
+        self.file_menu = tk.Menu(self.menu, tearoff=0)
+        self.file_menu.add_command(label=_('Import statement'), command=self._import_statement)
+        self.menu.add_cascade(label=_('File'), menu=self.file_menu)
+        self.edit_menu = tk.Menu(self.menu, tearoff=0)
+        self.edit_menu.add_command(label=_('Undo'), command=self.undo, accelerator='Ctrl+Z')
+        self.edit_menu.add_command(label=_('Redo'), command=self.redo, accelerator='Ctrl+Y')
+        self.menu.add_cascade(label=_('Edit'), menu=self.edit_menu)
+        self.master.bind('<Control-z>', lambda event: self.undo())
+        self.master.bind('<Control-y>', lambda event: self.redo())
+        self.master.bind('<Control-Z>', lambda event: self.redo())
+        self.menu.add_command(label=_('Search'), command=self._open_search, accelerator='Ctrl+F')
+        self.master.bind('<Control-f>', lambda event: self._open_search())
+        self.year_menu = tk.Menu(self.menu, tearoff=0)
+        self.year_menu.add_command(label=_('Previous year'), command=lambda: self.change_year(self.year - 1),
+                                   accelerator='Ctrl+Page Up')
+        self.year_menu.add_command(label=_('Next year'), command=lambda: self.change_year(self.year + 1),
+                                   accelerator='Ctrl+Page Down')
+        self.year_menu.add_separator()
+        self.year_menu.add_command(label=_('Compare years'), command=self._draw_years_stats)
+        self.menu.add_cascade(label=_('Year'), menu=self.year_menu)
+        self.master.bind('<Control-Prior>', lambda event: self.change_year(self.year - 1))
+        self.master.bind('<Control-Next>', lambda event: self.change_year(self.year + 1))
+        self.master.config(menu=self.menu)
+
         self.months_frame = tk.Frame(self, borderwidth=5, bg='#3e3362')
         self.months_frame.grid(sticky=tk.NSEW, row=0, column=0, columnspan=1)
 
@@ -60,11 +128,9 @@ class Application(tk.Frame):
         self.groups_frame.grid(sticky=tk.NSEW, row=0, column=1, columnspan=4)
         config_widget(self.months_frame)
 
-        self.months_groups = {}
-        for month in range(12):
-            self.months_groups[month] = MonthWindow(self.groups_frame)
         config_widget(self.groups_frame)
         self.current_month = 0
+        self._show_title()
         self._change_month(self.months_buttons[self.current_month])
 
     def _change_month(self, month_button):
@@ -76,7 +142,232 @@ class Application(tk.Frame):
         self.months_buttons[self.current_month].configure(relief='flat')
         month_button.configure(relief='sunken')
         self.current_month = month_button.grid_info()['row']
-        self.months_groups[self.current_month].tkraise()
+        self.load_month(self.current_month).tkraise()
+
+    @property
+    def storage(self):
+        """Storage of the selected year, None if the year is kept in memory only."""
+        return self.partition.storage
+
+    @property
+    def year_cube(self):
+        """Year cube of the selected year."""
+        return self.partition.year_cube
+
+    @property
+    def search_index(self):
+        """Search index of the selected year."""
+        return self.partition.search_index
+
+    @property
+    def observers(self):
+        """Observers of the data changes of the selected year."""
+        return self.partition.observers
+
+    @property
+    def history(self):
+        """Log of the changes of the selected year."""
+        return self.partition.history
+
+    @property
+    def months_groups(self):
+        """Created month windows of the selected year by month number."""
+        return self.partition.months_groups
+
+    @property
+    def loaded_months(self):
+        """Numbers of the months of the selected year loaded from the storage."""
+        return self.partition.loaded_months
+
+    def change_year(self, year):
+        """
+        Select a year, opening it on first use.
+
+        The selected month stays selected. Opening a year may close the least recently used year, whose
+        month windows are destroyed.
+
+        :param year: year
+        :type year: int
+        """
+        if year == self.year:
+            return
+        self.year = year
+        self.partition = self.partitions.get(year)
+        self._show_title()
+        self.load_month(self.current_month).tkraise()
+
+    def _show_title(self):
+        """Show the selected year in the window title."""
+        self.master.title(f'{self.app_title} - {self.year}')
+
+    def load_month(self, month):
+        """
+        Get the month window, creating it and loading its data from the storage on first use.
+
+        Month windows are created only when a month is selected or its data is needed, so the start
+        of the application does not depend on the number of months.
+
+        :param month: month number
+        :type month: int
+        :return: month window
+        :rtype: month_window.month_window.MonthWindow
+        """
+        month_window = self.months_groups.get(month)
+        if month_window is None:
+            month_window = MonthWindow(self.groups_frame, month=month, observers=self.observers, history=self.history,
+                                       category_ids=self.partition.category_ids)
+            self.months_groups[month] = month_window
+            if month != self.current_month:
+                month_window.lower()
+            month_data = self.partition.months_data.pop(month, None)
+            if month_data is not None:
+                month_window.take_categories(month_data)
+                if month_window.categories:
+                    month_window.select_category(next(iter(month_window.layout)))
+        if self.storage is not None and month not in self.loaded_months:
+            self.storage.load_month(month_window)
+            self.loaded_months.add(month)
+            self.year_cube.add_month(month_window)
+            self.search_index.add_month(month_window)
+            if month_window.categories:
+                month_window.select_category(next(iter(month_window.layout)))
+        return month_window
+
+    def load_data(self):
+        """
+        Load the data of all months into the year cube and the search index without creating month windows.
+
+        The months without windows are read from the storage without widgets.
+        """
+        for month in range(len(self.months_names)):
+            self.partition.load_data(month)
+
+    def import_statement(self, path, batch_size=10000):
+        """
+        Import a CSV or OFX bank statement.
+
+        Every transaction goes to the month of its date, or to the selected month if the date is unknown,
+        and to the category given by the rules, or to the 'Imported' category. Transactions dated in other
+        years than the selected one are skipped. The lists and the opened statistics are refreshed once
+        per batch.
+
+        :param path: statement file path
+        :type path: str
+        :param batch_size: number of transactions appended at once
+        :type batch_size: int
+        :return: number of imported fields, the import speed and the number of skipped transactions
+        :rtype: importer.ImportReport
+        """
+        targets = {}
+        skipped = importer.SkipCounter()
+
+        def route(fields):
+            for name, field in fields:
+                date = parse_date(field['date'])
+                if date is not None and date.year != self.year:
+                    skipped.count += 1
+                    continue
+                yield (date.month - 1 if date is not None else self.current_month, name or _('Imported')), field
+
+        def resolve(target, field):
+            category = targets.get(target)
+            if category is None:
+                month, name = target
+                month_window = self.load_month(month)
+                category = month_window.category_by_name(name) or month_window.create_category(name)
+                targets[target] = category
+            return category
+
+        fields = route(importer.to_fields(importer.read_statement(path), self.rules, skipped=skipped))
+        return importer.import_fields(fields, resolve, batch_size=batch_size, on_batch=self._refresh_categories,
+                                      skipped=skipped)
+
+    def _import_statement(self):
+        """Ask for a bank statement and import it."""
+        path = tk.filedialog.askopenfilename(parent=self, title=_('Import statement'), filetypes=[
+            (_('Bank statements'), '*.csv *.ofx *.qfx'), (_('All files'), '*')])
+        if not path:
+            return
+        try:
+            report = self.import_statement(path)
+        except (OSError, ValueError) as error:
+            tk.messagebox.showwarning('Error', str(error), parent=self)
+            return
+        message = _('{} fields imported, {:.0f} fields per second').format(report.rows, report.rows_per_second)
+        if report.skipped:
+            skipped = ngettext('{} transaction skipped', '{} transactions skipped', report.skipped)
+            message += '\n' + skipped.format(report.skipped)
+        tk.messagebox.showinfo(_('Import statement'), message, parent=self)
+
+    def _refresh_categories(self, categories):
+        """
+        Refresh the lists showing the changed categories and the opened statistics.
+
+        :param categories: changed categories
+        :type categories: Set[month_window.category_button.Category]
+        """
+        for month_window in self.months_groups.values():
+            if month_window.categories.get(month_window.active_category) in categories:
+                month_window.refresh_list()
+        for widget in (self, *self.months_groups.values()):
+            for child in widget.winfo_children():
+                if isinstance(child, StatisticsWindow):
+                    child.refresh()
+        self.update_idletasks()
+
+    def undo(self):
+        """Undo the last change of the selected year and show its month."""
+        self._apply_history(self.history.undo)
+
+    def redo(self):
+        """Redo the last undone change of the selected year and show its month."""
+        self._apply_history(self.history.redo)
+
+    def _apply_history(self, action):
+        """
+        Undo or redo a change and show its month.
+
+        :param action: method of the history undoing or redoing a change
+        :type action: Callable[[], month_window.history.Command]
+        """
+        try:
+            command = action()
+        except ValueError as error:
+            tk.messagebox.showwarning('Error', str(error), parent=self)
+            return
+        if command is not None and command.month_window.month != self.current_month:
+            self._change_month(self.months_buttons[command.month_window.month])
+
+    def _commit(self):
+        """Commit the storage changes of the open years made since the last call."""
+        self.partitions.flush()
+        self.after(self.commit_interval, self._commit)
+
+    def _open_search(self):
+        """Open the search window, or raise it if it is open."""
+        for child in self.winfo_children():
+            if isinstance(child, SearchWindow):
+                child.lift()
+                child.entry.focus_set()
+                return
+        SearchWindow(self)
+
+    def show_field(self, month, category, index):
+        """
+        Show the month of a data field and select the field in its category.
+
+        :param month: month number
+        :type month: int
+        :param category: category of the field
+        :type category: month_window.category_button.Category
+        :param index: field index
+        :type index: int
+        """
+        self._change_month(self.months_buttons[month])
+        month_window = self.load_month(month)
+        if month_window.categories.get(category.id) is category:
+            month_window.select_category(category.id)
+            month_window.information_window.select_index(index)
 
     def _draw_month_stats(self, month_id):
         """
@@ -85,11 +376,67 @@ class Application(tk.Frame):
         :param month_id: selected month
         """
         def draw_month(event):
-            StatisticsWindow(self.months_groups[month_id], data_type='month', master=self)
+            StatisticsWindow(self.load_month(month_id), data_type='month', master=self)
         return draw_month
 
+    def _draw_years_stats(self):
+        """Open statistics window comparing the years by their summaries."""
+        StatisticsWindow(self.partitions.summarize(), data_type='years', master=self)
+
 
 def main():
     """Application entry."""
-    app = Application()
-    app.mainloop()
+    from FinanceApp import report
+
+    parser = argparse.ArgumentParser(prog='FinanceApp', description=_('Finance management app'))
+    parser.add_argument('--storage', choices=('sqlite', 'journal', 'year'), default='sqlite',
+                        help='ledger storage engine')
+    parser.add_argument('--database', default=DEFAULT_DATABASE,
+                        help='path to the ledger databases, the year is added to the name')
+    parser.add_argument('--journal', default=DEFAULT_JOURNAL,
+                        help='directory of the ledger journals, the year is added to the name')
+    parser.add_argument('--year-file', default=DEFAULT_YEAR_FILE,
+                        help='path to the memory-mapped year files, the year is added to the name')
+    parser.add_argument('--year', type=int, help='year to show first, the current year by default')
+    parser.add_argument('--max-years', type=int, default=MAX_YEARS,
+                        help='number of years kept open, the least recently used year is closed')
+    parser.add_argument('--summaries', default=DEFAULT_SUMMARIES, help='path to the summaries of the years')
+    parser.add_argument('--rules', default=DEFAULT_RULES, help='category rules for the imported statements')
+    parser.add_argument('--no-prewarm', action='store_true', help='load the plotting libraries on first use only')
+    parser.add_argument('--import-time', action='store_true',
+                        help='report the import time of the application modules and exit')
+    parser.add_argument('--import-budget', type=float,
+                        help='with --import-time, fail if importing the application takes longer, in milliseconds')
+    parser.add_argument('--trace', help='write the timing spans of the event handlers to a Chrome trace file')
+    parser.add_argument('--slow-callback', type=float,
+                        help='log the event handlers running longer, in milliseconds, with a stack sample')
+    commands = parser.add_subparsers(dest='command')
+    report.add_arguments(commands.add_parser('report', help='write the statistics of ledger files and exit'))
+    args = parser.parse_args()
+    if args.command == 'report':
+        sys.exit(report.run(args))
+    if args.import_time:
+        from FinanceApp import import_time
+
+        sys.exit(import_time.report(budget=args.import_budget))
+    rules = importer.load_rules(args.rules) if os.path.exists(args.rules) else ()
+    if args.storage == 'journal':
+        def open_storage(year):
+            return JournalStorage(year_path(args.journal, year))
+    elif args.storage == 'year':
+        def open_storage(year):
+            return YearFileStorage(year_path(args.year_file, year))
+    else:
+        def open_storage(year):
+            return SQLiteStorage(year_path(args.database, year))
+    partitions = YearPartitions(open_storage, max_years=args.max_years, summaries=YearSummaries(args.summaries))
+    if args.trace or args.slow_callback is not None:
+        tracing.TRACER.start(threshold=tracing.SLOW_CALLBACK if args.slow_callback is None else args.slow_callback)
+    try:
+        app = Application(rules=rules, prewarm=not args.no_prewarm, year=args.year, partitions=partitions)
+        app.mainloop()
+    finally:
+        partitions.close()
+        tracing.TRACER.stop()
+        if args.trace:
+            tracing.TRACER.export(args.trace)
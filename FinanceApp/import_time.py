@@ -0,0 +1,54 @@
+"""Import time report of the application modules."""
+import subprocess
+import sys
+
+MODULE = 'FinanceApp.application'
+
+
+def measure(module=MODULE):
+    """
+    Import the module in a new interpreter with ``-X importtime`` and collect the times.
+
+    :param module: name of the imported module
+    :type module: str
+    :return: self and cumulative import times in microseconds and names of the imported modules
+    :rtype: List[Tuple[int, int, str]]
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        times.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+    return times
+
+
+def report(module=MODULE, top=20, budget=None, file=None):
+    """
+    Print the modules with the longest cumulative import times and the total import time.
+
+    :param module: name of the imported module
+    :type module: str
+    :param top: number of printed modules
+    :type top: int
+    :param budget: maximum total import time in milliseconds
+    :type budget: float
+    :param file: output stream, standard output by default
+    :return: exit status, 1 if the total import time exceeds the budget, 0 otherwise
+    :rtype: int
+    """
+    file = file if file is not None else sys.stdout
+    times = measure(module)
+    total = sum(self_time for self_time, _, _ in times) / 1000
+    print(f'{"self, ms":>10} {"cumulative, ms":>15}  module', file=file)
+    for self_time, cumulative, name in sorted(times, key=lambda item: item[1], reverse=True)[:top]:
+        print(f'{self_time / 1000:>10.1f} {cumulative / 1000:>15.1f}  {name}', file=file)
+    print(f'{len(times)} modules imported in {total:.1f} ms', file=file)
+    if budget is not None and total > budget:
+        print(f'import time exceeds the budget of {budget:.1f} ms', file=file)
+        return 1
+    return 0
@@ -0,0 +1,268 @@
+"""Streaming import of bank statements into categories."""
+import csv
+import json
+import re
+import time
+
+from collections import namedtuple
+from itertools import islice
+
+Rule = namedtuple('Rule', ('pattern', 'category', 'subcategory'))
+ImportReport = namedtuple('ImportReport', ('rows', 'seconds', 'rows_per_second', 'skipped'), defaults=(0,))
+
+CSV_COLUMNS = {
+    'amount': ('amount', 'sum', 'value'),
+    'date': ('date', 'posted', 'transaction date'),
+    'description': ('description', 'memo', 'payee', 'name', 'details'),
+}
+OFX_TAGS = {'TRNAMT': 'amount', 'DTPOSTED': 'date', 'NAME': 'description', 'MEMO': 'memo'}
+
+
+class SkipCounter:
+    """Number of the transactions skipped by an import, the skipped transactions themselves are not kept."""
+
+    __slots__ = ('count', )
+
+    def __init__(self):
+        """Create a counter without skipped transactions."""
+        self.count = 0
+
+
+def load_rules(path):
+    """
+    Load category rules from a JSON file.
+
+    The file contains a list of objects with a regular expression ``pattern`` matched against the
+    description, a target ``category`` and an optional ``subcategory``.
+
+    :param path: rules file path
+    :type path: str
+    :return: rules
+    :rtype: List[importer.Rule]
+    """
+    with open(path, encoding='utf-8') as file:
+        return [Rule(re.compile(rule['pattern'], re.IGNORECASE), rule['category'], rule.get('subcategory'))
+                for rule in json.load(file)]
+
+
+def read_csv(path, columns=None, delimiter=None):
+    """
+    Read the transactions of a CSV statement one by one.
+
+    Blank rows are left out, the transactions of short rows have only the columns the rows have.
+
+    :param path: statement file path
+    :type path: str
+    :param columns: names of the amount, date and description columns, detected by the header if not set
+    :type columns: Dict[str, str]
+    :param delimiter: column delimiter, detected by the first line if not set
+    :type delimiter: str
+    :return: transactions with amount, date and description
+    :rtype: Iterator[Dict[str, str]]
+    """
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        if delimiter is None:
+            try:
+                delimiter = csv.Sniffer().sniff(file.readline(), delimiters=',;\t').delimiter
+            except csv.Error:
+                delimiter = ','
+            file.seek(0)
+        reader = csv.reader(file, delimiter=delimiter)
+        header = [name.strip().lower() for name in next(reader, [])]
+        if columns is None:
+            columns = {key: next((name for name in names if name in header), None)
+                       for key, names in CSV_COLUMNS.items()}
+        indexes = {key: header.index(name.lower()) for key, name in columns.items() if name is not None}
+        if 'amount' not in indexes:
+            raise ValueError(f'{path}: amount column not found')
+        for row in reader:
+            if any(cell.strip() for cell in row):
+                yield {key: row[index] for key, index in indexes.items() if index < len(row)}
+
+
+def read_ofx(path, block_size=1 << 16):
+    """
+    Read the transactions of an OFX statement one by one.
+
+    Both SGML and XML statements are supported, a transaction also ends where the next one starts.
+    The file is tokenized by blocks.
+
+    :param path: statement file path
+    :type path: str
+    :param block_size: number of characters read at once
+    :type block_size: int
+    :return: transactions with amount, date and description
+    :rtype: Iterator[Dict[str, str]]
+    """
+    transaction = None
+    for tag, value in _ofx_tokens(path, block_size):
+        if tag in ('STMTTRN', '/STMTTRN', '/BANKTRANLIST') and transaction is not None:
+            if 'memo' in transaction and not transaction.get('description'):
+                transaction['description'] = transaction['memo']
+            transaction.pop('memo', None)
+            date = transaction.get('date', '')
+            if len(date) >= 8 and date[:8].isdigit():
+                transaction['date'] = f'{date[:4]}-{date[4:6]}-{date[6:8]}'
+            yield transaction
+            transaction = None
+        if tag == 'STMTTRN':
+            transaction = {}
+        elif transaction is not None and tag in OFX_TAGS:
+            transaction[OFX_TAGS[tag]] = value
+
+
+def _ofx_tokens(path, block_size):
+    """
+    Split an OFX file into tags with their text values.
+
+    :param path: statement file path
+    :type path: str
+    :param block_size: number of characters read at once
+    :type block_size: int
+    :return: tag names and values
+    :rtype: Iterator[Tuple[str, str]]
+    """
+    with open(path, encoding='utf-8', errors='replace') as file:
+        rest = ''
+        while True:
+            block = file.read(block_size)
+            tokens = (rest + block).split('<')
+            rest = tokens.pop() if block else ''
+            for token in tokens:
+                tag, _, value = token.partition('>')
+                if tag:
+                    yield tag.strip().upper(), value.strip()
+            if not block:
+                if rest:
+                    tag, _, value = rest.partition('>')
+                    yield tag.strip().upper(), value.strip()
+                return
+
+
+def read_statement(path, **kwargs):
+    """
+    Read the transactions of a statement by the file extension.
+
+    :param path: statement file path
+    :type path: str
+    :return: transactions with amount, date and description
+    :rtype: Iterator[Dict[str, str]]
+    """
+    if path.lower().endswith(('.ofx', '.qfx')):
+        return read_ofx(path, **kwargs)
+    return read_csv(path, **kwargs)
+
+
+def parse_amount(text):
+    """
+    Parse an amount written with a decimal point or comma and optional thousands separators.
+
+    The last point or comma followed by other separators of the other kind is the decimal separator, several
+    separators of one kind are thousands separators, a single separator is the decimal one.
+
+    :param text: amount text
+    :type text: str
+    :return: amount
+    :rtype: float
+    """
+    text = re.sub(r"[\s'\u00a0\u202f]", '', text)
+    points, commas = text.count('.'), text.count(',')
+    if points and commas:
+        decimal = '.' if text.rfind('.') > text.rfind(',') else ','
+        thousands = ',' if decimal == '.' else '.'
+        if text.count(decimal) > 1:
+            raise ValueError(f'invalid amount: {text!r}')
+        text = text.replace(thousands, '')
+    elif points > 1 or commas > 1:
+        text = text.replace('.' if points else ',', '')
+    return float(text.replace(',', '.'))
+
+
+def to_fields(transactions, rules=(), expenses_sign=-1, skipped=None):
+    """
+    Convert transactions to category data fields.
+
+    Transactions whose amount has the other sign than ``expenses_sign`` are left out, transactions without
+    an amount or whose amount is not a number are skipped.
+
+    :param transactions: transactions with amount, date and description
+    :type transactions: Iterable[Dict[str, str]]
+    :param rules: category rules, the first matching rule is used
+    :type rules: Iterable[importer.Rule]
+    :param expenses_sign: sign of the expenses amounts in the statement
+    :type expenses_sign: int
+    :param skipped: counter of the skipped transactions
+    :type skipped: importer.SkipCounter
+    :return: target category name, or None if no rule matches, and data field
+    :rtype: Iterator[Tuple[str, Dict[str, float]]]
+    """
+    rules = tuple(rules)
+    for transaction in transactions:
+        try:
+            amount = parse_amount(transaction.get('amount', '')) * expenses_sign
+        except ValueError:
+            if skipped is not None:
+                skipped.count += 1
+            continue
+        if amount <= 0:
+            continue
+        description = ' '.join(transaction.get('description', '').split())
+        category, subcategory = None, ''
+        for rule in rules:
+            if rule.pattern.search(description):
+                category, subcategory = rule.category, rule.subcategory or ''
+                break
+        yield category, {'amount': amount, 'date': transaction.get('date', '').strip(),
+                         'description': description, 'subcategory': subcategory}
+
+
+def batches(items, size):
+    """
+    Split an iterable into lists of the given size.
+
+    :param items: items to split
+    :type items: Iterable
+    :param size: batch size
+    :type size: int
+    :return: batches
+    :rtype: Iterator[List]
+    """
+    items = iter(items)
+    while True:
+        batch = list(islice(items, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_fields(fields, resolve, batch_size=10000, on_batch=None, skipped=None):
+    """
+    Append data fields to categories batch by batch.
+
+    :param fields: target category names and data fields
+    :type fields: Iterable[Tuple[str, Dict[str, float]]]
+    :param resolve: callback returning the target category of a category name and a data field
+    :type resolve: function
+    :param batch_size: number of data fields appended at once
+    :type batch_size: int
+    :param on_batch: callback called with the set of changed categories after every batch
+    :type on_batch: function
+    :param skipped: counter of the transactions skipped while the fields were made
+    :type skipped: importer.SkipCounter
+    :return: number of imported fields, the import speed and the number of skipped transactions
+    :rtype: importer.ImportReport
+    """
+    start = time.perf_counter()
+    rows = 0
+    for batch in batches(fields, batch_size):
+        targets = {}
+        for name, field in batch:
+            category = resolve(name, field)
+            targets.setdefault(category, []).append(field)
+        for category, category_fields in targets.items():
+            category.add_fields(category_fields)
+        rows += len(batch)
+        if on_batch is not None:
+            on_batch(set(targets))
+    seconds = time.perf_counter() - start
+    return ImportReport(rows, seconds, rows / seconds if seconds else 0., skipped.count if skipped is not None else 0)
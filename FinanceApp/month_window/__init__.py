@@ -1,5 +1,11 @@
 """Month window package."""
+from .ledger import (UNKNOWN_DATE, DateIndex, DateView, Field, Ledger, LedgerObserver, StringPool, Totals,
+                     date_ordinal, parse_date)
+from .image_cache import IMAGE_CACHE, ImageCache
+from .history import History
 from .category_button import Category, CategoryButton
+from .layout import CategoryIds, CategoryLayout
+from .month_data import MonthData
 from .category_window import CategoryWindow
 from .information_window import InformationWindow
 from .entry_window import EntryWindow
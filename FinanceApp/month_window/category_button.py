@@ -2,7 +2,7 @@
 import tkinter as tk
 
 from tkinter import font, Canvas
-from PIL import ImageTk
+from FinanceApp.month_window import Ledger
 from FinanceApp.utils import config_widget
 
 
@@ -13,7 +13,7 @@ class CategoryButton:
     :param master: master window
     :type master: tkinter.Frame
     :param image: background image
-    :type image: PIL.Image.Image
+    :type image: PIL.ImageTk.PhotoImage
     :param position: coordinates of the button in the category grid
     :type position: Tuple[int, int]
     :param state: button visibility mode
@@ -25,7 +25,7 @@ class CategoryButton:
         self.text = None
         self.font = font.Font(font=('Lucida Sans', 22, 'normal'))
         self.position = tuple(position)
-        self.tk_image = ImageTk.PhotoImage(image, master=master)
+        self.tk_image = image
         self.widget = Canvas(master, width=60, height=60, bd=0, highlightthickness=0, bg='#e2ddec')
         self.widget_image = self.widget.create_image(0, 0, image=self.tk_image, anchor='nw', state=state)
         self.widget_text = self.widget.create_text(30, 30, font=self.font, text=self.text, state=state,
@@ -89,17 +89,24 @@ class Category:
     """
     Category data.
 
-    :param position: coordinates of the button in the category grid
-    :type position: Tuple[int, int]
+    The category is identified by an id which does not depend on its place in the category grid,
+    the categories of different months with the same id are the same category.
+
+    :param category_id: category id
+    :type category_id: int
     :param name: category name
     :type name: str
+    :param observers: objects notified about the data changes
+    :type observers: List[month_window.ledger.LedgerObserver]
     """
 
-    def __init__(self, position, name):
+    def __init__(self, category_id, name, observers=None):
         """Create a category data container."""
-        self.position = position
+        self.id = category_id
         self.name = name
-        self.fields = []
+        self.fields = Ledger()
+        self.storage_id = None
+        self.observers = observers if observers is not None else []
 
     def add_field(self, amount, date, description, subcategory):
         """
@@ -114,7 +121,44 @@ class Category:
         :param subcategory: subcategory of expenses
         :type subcategory: str
         """
-        self.fields.append({'amount': amount, 'date': date, 'description': description, 'subcategory': subcategory})
+        self.fields.append(amount, date, description, subcategory)
+        for observer in self.observers:
+            observer.field_added(self, len(self.fields) - 1)
+
+    def insert_field(self, index, amount, date, description, subcategory, row_id=None):
+        """
+        Insert a category data field before the index.
+
+        :param index: index of the inserted data field
+        :type index: int
+        :param amount: amount of expenses
+        :type amount: float
+        :param date: date of expenses
+        :type date: str
+        :param description: description of expenses
+        :type description: str
+        :param subcategory: subcategory of expenses
+        :type subcategory: str
+        :param row_id: id of the data field, a new id by default
+        :type row_id: int
+        """
+        self.fields.insert(index, amount, date, description, subcategory, row_id=row_id)
+        for observer in self.observers:
+            observer.field_added(self, index)
+
+    def add_fields(self, fields, row_ids=None):
+        """
+        Add several category data fields at once.
+
+        :param fields: data fields with amount, date, description and subcategory
+        :type fields: Iterable[Dict[str, float]]
+        :param row_ids: ids of the data fields, new ids by default
+        :type row_ids: Iterable[int]
+        """
+        start = len(self.fields)
+        self.fields.extend(fields, row_ids=row_ids)
+        for observer in self.observers:
+            observer.fields_added(self, start, len(self.fields))
 
     def delete_field(self, index):
         """
@@ -123,7 +167,10 @@ class Category:
         :param index: index of the data field to delete
         :type index: int
         """
+        row_id, old = self.fields.ids[index], self.fields.get_row(index)
         del self.fields[index]
+        for observer in self.observers:
+            observer.field_deleted(self, index, row_id, old)
 
     def change_field(self, index, amount=None, date=None, description=None, subcategory=None):
         """
@@ -142,7 +189,9 @@ class Category:
         """
         if index >= len(self.fields):
             return
-        for key, value in zip(('amount',  'date', 'description', 'subcategory'),
-                              (amount, date, description, subcategory)):
-            if value is not None:
-                self.fields[index][key] = value
+        values = {key: value for key, value in zip(Ledger.COLUMNS, (amount, date, description, subcategory))
+                  if value is not None}
+        old = self.fields.get_row(index)
+        self.fields.change(index, **values)
+        for observer in self.observers:
+            observer.field_changed(self, index, old)
@@ -1,14 +1,23 @@
 """Month category window."""
 import os
 
-from FinanceApp.month_window import CategoryButton
-from PIL import Image, ImageTk
+from FinanceApp.month_window import CategoryButton, IMAGE_CACHE
+from FinanceApp.tracing import traced
+
+ROOT = os.path.dirname(os.path.realpath(__file__))
+CREATE_IMAGE = os.path.join(ROOT, 'images', 'create_button.png')
+BUTTON_IMAGE = os.path.join(ROOT, 'images', 'category_window.png')
+RESIZE_DELAY = 100
 
 
 class CategoryWindow:
     """
     A category button controller.
 
+    All buttons show the same background image, scaled once per size by the shared image cache. Resize
+    events are coalesced, the images are scaled only when the size has not changed for ``RESIZE_DELAY``
+    milliseconds.
+
     :param master: master window
     :type master: tkinter.Frame
     :param grid_shape: category grid size
@@ -17,65 +26,75 @@ class CategoryWindow:
 
     def __init__(self, master, grid_shape):
         """Create month category window."""
+        self.master = master
         self.grid_shape = grid_shape
-        self.last_pos = (0, 0)
-        self.button_names = []
-        root = os.path.dirname(os.path.realpath(__file__))
-        self.create_image = Image.open(os.path.join(root, 'images', 'create_button.png'))
-        self.button_image = Image.open(os.path.join(root, 'images', 'category_window.png'))
+        self.pending_resizes = {}
         self.buttons = {}
+        button_image = IMAGE_CACHE.get(master, BUTTON_IMAGE)
         for ypos in range(self.grid_shape[0]):
             for xpos in range(self.grid_shape[1]):
-                button = CategoryButton(master, self.button_image, (ypos, xpos), state='hidden')
+                button = CategoryButton(master, button_image, (ypos, xpos), state='hidden')
                 if not xpos and not ypos:
-                    button.widget.bind("<Configure>", self._resize_button_callback)
+                    button.widget.bind("<Configure>", traced(self._resize_button_callback))
                 self.buttons[(ypos, xpos)] = button
-        self.create_button = CategoryButton(master, self.create_image, (0, 0))
-        self.create_button.widget.bind("<Configure>", self._resize_create_callback)
+        self.create_button = CategoryButton(master, IMAGE_CACHE.get(master, CREATE_IMAGE), (0, 0))
+        self.create_button.widget.bind("<Configure>", traced(self._resize_create_callback))
 
-    def show_category(self, text):
+    def show_category(self, position, text):
         """
-        Change the category button visibility.
+        Show a category button.
 
+        :param position: category button id
+        :type position: Tuple[int, int]
         :param text: category name.
         :type text: str
         """
-        button = self.buttons[self.last_pos]
-        self._change_last_pos()
-        if self.last_pos[0] != self.grid_shape[0]:
-            self.create_button.change_position(self.last_pos)
-        else:
-            self.create_button.widget.grid_forget()
-            self.create_button.set_state('hidden')
-            self.create_button.widget.unbind('<Button-1>')
+        button = self.buttons[position]
         button.set_text(text)
-        self.button_names.append(text)
         button.set_state('normal')
 
-    def delete_category(self, button_id):
+    def hide_category(self, position):
         """
-        Delete the category button.
+        Hide a category button, the other buttons are not changed.
 
-        :param button_id: category button id to delete
-        :type button_id: Tuple[int, int]
-        :return: flag for binding the create button to mouse click callback
-        :rtype: bool
-        """
-        self._change_last_pos(increase=False)
-        self.buttons[self.last_pos].set_state('hidden')
-        self.buttons[self.last_pos].widget.unbind('<Button-1>')
-        self.buttons[self.last_pos].widget.unbind('<Double-Button-1>')
-        last_index = self.grid_shape[0] * button_id[0] + button_id[1]
-        self.create_button.change_position(self.last_pos)
-        for index, text in enumerate(self.button_names[last_index+1:], start=last_index):
-            button = self.buttons[(index // self.grid_shape[0], index % self.grid_shape[1])]
-            button.set_text(text)
-        del self.button_names[last_index]
-        if self.last_pos[0] == self.grid_shape[0] - 1 and self.last_pos[1] == self.grid_shape[1] - 1:
-            self.create_button.set_state('normal')
-            return True
+        :param position: category button id
+        :type position: Tuple[int, int]
+        """
+        button = self.buttons[position]
+        button.set_state('hidden')
+        button.set_active(active=False)
+        for bind_name in ('<Button-1>', '<Double-Button-1>', '<ButtonRelease-1>'):
+            button.widget.unbind(bind_name)
+
+    def place_create_button(self, position):
+        """
+        Show the create button at a free position of the grid.
+
+        :param position: free position, the button is hidden if not set
+        :type position: Tuple[int, int]
+        """
+        if position is None:
+            self.create_button.widget.grid_forget()
+            self.create_button.set_state('hidden')
         else:
-            return False
+            self.create_button.change_position(position)
+            self.create_button.set_state('normal')
+
+    def position_of(self, widget):
+        """
+        Find the grid position of a category button widget or of the create button.
+
+        :param widget: widget
+        :type widget: tkinter.Widget
+        :return: button position, None if the widget is not a button of the grid
+        :rtype: Tuple[int, int]
+        """
+        if widget is self.create_button.widget:
+            return self.create_button.position
+        for position, button in self.buttons.items():
+            if button.widget is widget:
+                return position
+        return None
 
     def tag_bind(self, button_id, bind_name, callback):
         """
@@ -89,7 +108,7 @@ class CategoryWindow:
         :type callback: method
         """
         button = self.buttons[button_id]
-        button.widget.tag_bind(button.widget_image, bind_name, callback(button))
+        button.widget.tag_bind(button.widget_image, bind_name, traced(callback(button)))
 
     def bind(self, button_id, bind_name, callback):
         """
@@ -103,23 +122,7 @@ class CategoryWindow:
         :type callback: method
         """
         button = self.buttons[button_id]
-        button.widget.bind(bind_name, callback(button))
-
-    def _change_last_pos(self, increase=True):
-        """
-        Change the last position of the widget in the grid.
-
-        :param increase: increase the position number or not
-        :type increase: bool
-        """
-        last_pos = list(self.last_pos)
-        if increase:
-            last_pos[0] += (last_pos[1] == self.grid_shape[1] - 1)
-            last_pos[1] = (last_pos[1] + 1) % self.grid_shape[1]
-        elif last_pos[0] or last_pos[1]:
-            last_pos[0] -= last_pos[0] and not last_pos[1]
-            last_pos[1] = (last_pos[1] - 1) % self.grid_shape[1]
-        self.last_pos = tuple(last_pos)
+        button.widget.bind(bind_name, traced(callback(button)))
 
     def _resize_create_callback(self, event):
         """
@@ -128,9 +131,7 @@ class CategoryWindow:
         :param event: window resize event
         :type event: tkinter.Event
         """
-        event.width = event.height
-        image = self.create_image.resize((event.width, event.height))
-        self._resize_image(self.create_button, image, (event.width, event.height))
+        self._schedule_resize('create', (event.height, event.height))
 
     def _resize_button_callback(self, event):
         """
@@ -139,25 +140,53 @@ class CategoryWindow:
         :param event: window resize event
         :type event: tkinter.Event
         """
-        image = self.button_image.resize((event.width, event.height))
-        for ypos in range(self.grid_shape[0]):
-            for xpos in range(self.grid_shape[1]):
-                button = self.buttons[(ypos, xpos)]
-                self._resize_image(button, image, (event.width, event.height))
+        self._schedule_resize('buttons', (event.width, event.height))
+
+    def _schedule_resize(self, name, shape):
+        """
+        Resize the widgets after the resize events stop, replacing the resize scheduled before.
+
+        :param name: 'create' for the create widget, 'buttons' for the category widgets
+        :type name: str
+        :param shape: image shape
+        :type shape: Tuple[int, int]
+        """
+        if name in self.pending_resizes:
+            self.master.after_cancel(self.pending_resizes[name])
+        self.pending_resizes[name] = self.master.after(RESIZE_DELAY, traced(self._resize), name, shape)
+
+    def _resize(self, name, shape):
+        """
+        Show the widget images scaled to the shape.
+
+        :param name: 'create' for the create widget, 'buttons' for the category widgets
+        :type name: str
+        :param shape: image shape
+        :type shape: Tuple[int, int]
+        """
+        del self.pending_resizes[name]
+        if name == 'create':
+            self._resize_image(self.create_button, IMAGE_CACHE.get(self.master, CREATE_IMAGE, shape), shape)
+            return
+        image = IMAGE_CACHE.get(self.master, BUTTON_IMAGE, shape)
+        for button in self.buttons.values():
+            self._resize_image(button, image, shape)
 
     @staticmethod
     def _resize_image(button, image, shape):
         """
-        Resize the button image when the window size changes.
+        Show the resized button image.
 
         :param button: category button to resize
         :type button: month_window.category_button.CategoryButton
-        :param image: button image to resize
-        :type image: PIL.Image.Image
+        :param image: scaled button image
+        :type image: PIL.ImageTk.PhotoImage
         :param shape: image shape
         :type shape: Tuple[int, int]
         """
+        if button.tk_image is image:
+            return
         button.widget.config(width=shape[0], height=shape[1])
-        button.tk_image = ImageTk.PhotoImage(image)
+        button.tk_image = image
         button.widget.itemconfig(button.widget_image, image=button.tk_image)
         button.widget.coords(button.widget_text, shape[0] // 2, shape[1] // 2)
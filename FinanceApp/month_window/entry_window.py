@@ -6,6 +6,8 @@ from functools import partial
 from math import isnan
 from tkinter import font, StringVar
 
+from FinanceApp.month_window import parse_date
+
 
 class EntryWindow:
     """
@@ -38,6 +40,9 @@ class EntryWindow:
         """
         Validate input by field name.
 
+        Dates can be left empty or written in a format read by :func:`month_window.ledger.parse_date`, they are
+        rewritten in the ISO format.
+
         :param name: field name
         :type name: str
         :return: validation successful or not
@@ -45,6 +50,11 @@ class EntryWindow:
         """
         value = self.widgets[name]['var'].get()
         value = ' '.join(value.split())
+        if name == 'date' and value:
+            date = parse_date(value)
+            if date is None:
+                return False
+            value = date.isoformat()
         self.widgets[name]['var'].set(value)
         if name in ('category', 'date', 'description', 'subcategory'):
             return str.isprintable(value) and (name != 'category' or len(value))
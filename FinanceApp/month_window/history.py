@@ -0,0 +1,300 @@
+"""Undo and redo of the data changes."""
+import time
+
+from collections import deque
+
+MAX_SIZE = 100000
+COALESCE_INTERVAL = 1.
+
+
+class Command:
+    """
+    Change of the month data which can be undone and redone.
+
+    A command keeps only the delta of the change: the changed values and their position. Commands are
+    undone and redone in the reverse order of their making, so the positions stay valid.
+
+    :param month_window: month window containing the changed category
+    :type month_window: month_window.month_window.MonthWindow
+    :param category: changed category
+    :type category: month_window.category_button.Category
+    """
+
+    size = 1
+
+    def __init__(self, month_window, category):
+        """Create a command of a made change."""
+        self.month_window = month_window
+        self.category = category
+
+    def undo(self):
+        """Revert the change."""
+        raise NotImplementedError
+
+    def redo(self):
+        """Make the change again."""
+        raise NotImplementedError
+
+    def merge(self, command):
+        """
+        Merge the next command into this one if they change the same data field.
+
+        :param command: command made after this one
+        :type command: month_window.history.Command
+        :return: the command has been merged
+        :rtype: bool
+        """
+        return False
+
+
+class AddField(Command):
+    """
+    Addition of a data field.
+
+    :param month_window: month window containing the changed category
+    :type month_window: month_window.month_window.MonthWindow
+    :param category: changed category
+    :type category: month_window.category_button.Category
+    :param index: index of the added field
+    :type index: int
+    """
+
+    def __init__(self, month_window, category, index):
+        """Keep the added field."""
+        super().__init__(month_window, category)
+        self.index = index
+        self.row_id = category.fields.ids[index]
+        self.values = category.fields.get_row(index)
+
+    def undo(self):
+        """Delete the added field."""
+        self.month_window.delete_field(self.category, self.index)
+
+    def redo(self):
+        """Insert the field again with its id."""
+        self.month_window.insert_field(self.category, self.index, self.values, row_id=self.row_id)
+
+    def merge(self, command):
+        """
+        Merge a change of the added field, so that it is added with the changed values.
+
+        :param command: command made after this one
+        :type command: month_window.history.Command
+        :return: the command has been merged
+        :rtype: bool
+        """
+        if not isinstance(command, ChangeField) or (command.category, command.index) != (self.category, self.index):
+            return False
+        self.values = dict(command.new)
+        return True
+
+
+class DeleteField(Command):
+    """
+    Deletion of a data field.
+
+    :param month_window: month window containing the changed category
+    :type month_window: month_window.month_window.MonthWindow
+    :param category: changed category
+    :type category: month_window.category_button.Category
+    :param index: index the field had
+    :type index: int
+    :param row_id: id the field had
+    :type row_id: int
+    :param values: values of the deleted field
+    :type values: Dict[str, float]
+    """
+
+    def __init__(self, month_window, category, index, row_id, values):
+        """Keep the deleted field."""
+        super().__init__(month_window, category)
+        self.index = index
+        self.row_id = row_id
+        self.values = values
+
+    def undo(self):
+        """Insert the field back at its index with its id."""
+        self.month_window.insert_field(self.category, self.index, self.values, row_id=self.row_id)
+
+    def redo(self):
+        """Delete the field again."""
+        self.month_window.delete_field(self.category, self.index)
+
+
+class ChangeField(Command):
+    """
+    Change of a data field.
+
+    :param month_window: month window containing the changed category
+    :type month_window: month_window.month_window.MonthWindow
+    :param category: changed category
+    :type category: month_window.category_button.Category
+    :param index: index of the changed field
+    :type index: int
+    :param old: field values before the change
+    :type old: Dict[str, float]
+    """
+
+    def __init__(self, month_window, category, index, old):
+        """Keep the values before and after the change."""
+        super().__init__(month_window, category)
+        self.index = index
+        self.old = old
+        self.new = category.fields.get_row(index)
+
+    def undo(self):
+        """Set the values before the change."""
+        self.month_window.change_field(self.category, self.index, self.old)
+
+    def redo(self):
+        """Set the values after the change."""
+        self.month_window.change_field(self.category, self.index, self.new)
+
+    def merge(self, command):
+        """
+        Merge another change of the same field, keeping the values before the first change.
+
+        :param command: command made after this one
+        :type command: month_window.history.Command
+        :return: the command has been merged
+        :rtype: bool
+        """
+        if not isinstance(command, ChangeField) or (command.category, command.index) != (self.category, self.index):
+            return False
+        self.new = command.new
+        return True
+
+
+class CreateCategory(Command):
+    """
+    Creation of a category.
+
+    :param month_window: month window containing the category
+    :type month_window: month_window.month_window.MonthWindow
+    :param category: created category
+    :type category: month_window.category_button.Category
+    """
+
+    def __init__(self, month_window, category):
+        """Keep the created category and its slot in the grid."""
+        super().__init__(month_window, category)
+        self.slot = month_window.layout.slot(category.id)
+
+    def undo(self):
+        """Delete the created category."""
+        self.month_window.remove_category(self.category)
+
+    def redo(self):
+        """Put the category back to its slot."""
+        self.month_window.restore_category(self.category, self.slot)
+
+
+class DeleteCategory(Command):
+    """
+    Deletion of a category.
+
+    The deleted category keeps its data fields, so the size of the command is the number of the fields.
+    The command must be made before the category is removed.
+
+    :param month_window: month window which contained the category
+    :type month_window: month_window.month_window.MonthWindow
+    :param category: deleted category
+    :type category: month_window.category_button.Category
+    """
+
+    def __init__(self, month_window, category):
+        """Keep the deleted category and its slot in the grid."""
+        super().__init__(month_window, category)
+        self.size = len(category.fields) + 1
+        self.slot = month_window.layout.slot(category.id)
+
+    def undo(self):
+        """Put the category back to its slot with its data fields."""
+        self.month_window.restore_category(self.category, self.slot)
+
+    def redo(self):
+        """Delete the category again."""
+        self.month_window.remove_category(self.category)
+
+
+class History:
+    """
+    Log of the undoable changes.
+
+    The memory of the log is bounded by the total size of the kept commands, a data field counting as one:
+    the oldest commands are forgotten when the size exceeds ``max_size``. A change of the field changed
+    by the previous command less than ``coalesce_interval`` seconds before is merged into that command,
+    so rapid edits are undone at once. Undo and redo apply only the delta of a command, the lists showing
+    the changed category are updated field by field.
+
+    :param max_size: maximum total size of the kept commands
+    :type max_size: int
+    :param coalesce_interval: interval in seconds in which the changes of a field are merged
+    :type coalesce_interval: float
+    """
+
+    def __init__(self, max_size=MAX_SIZE, coalesce_interval=COALESCE_INTERVAL):
+        """Create an empty log."""
+        self.max_size = max_size
+        self.coalesce_interval = coalesce_interval
+        self.undo_commands = deque()
+        self.redo_commands = []
+        self.size = 0
+        self.last_time = None
+
+    def record(self, command):
+        """
+        Add a made change to the log, forgetting the undone changes.
+
+        :param command: command of the change
+        :type command: month_window.history.Command
+        """
+        now = time.monotonic()
+        coalesce = self.last_time is not None and now - self.last_time < self.coalesce_interval
+        self.last_time = now
+        for undone in self.redo_commands:
+            self.size -= undone.size
+        self.redo_commands.clear()
+        if coalesce and self.undo_commands and self.undo_commands[-1].merge(command):
+            return
+        self.undo_commands.append(command)
+        self.size += command.size
+        while self.size > self.max_size:
+            self.size -= self.undo_commands.popleft().size
+
+    def undo(self):
+        """
+        Revert the last change.
+
+        :return: undone command, None if there is nothing to undo
+        :rtype: month_window.history.Command
+        """
+        if not self.undo_commands:
+            return None
+        command = self.undo_commands[-1]
+        command.undo()
+        self.redo_commands.append(self.undo_commands.pop())
+        self.last_time = None
+        return command
+
+    def redo(self):
+        """
+        Make the last undone change again.
+
+        :return: redone command, None if there is nothing to redo
+        :rtype: month_window.history.Command
+        """
+        if not self.redo_commands:
+            return None
+        command = self.redo_commands[-1]
+        command.redo()
+        self.undo_commands.append(self.redo_commands.pop())
+        self.last_time = None
+        return command
+
+    def clear(self):
+        """Forget all changes."""
+        self.undo_commands.clear()
+        self.redo_commands.clear()
+        self.size = 0
+        self.last_time = None
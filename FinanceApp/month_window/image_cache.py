@@ -0,0 +1,71 @@
+"""Shared cache of scaled widget images."""
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+
+class ImageCache:
+    """
+    Least recently used cache of images scaled to widget sizes.
+
+    Source images are loaded once per file. Scaled images are kept per Tk interpreter, file and size, so
+    all widgets showing a file at one size share a single ``PhotoImage``. When the cache is full, the
+    least recently used image is evicted; widgets still showing it keep their own reference.
+
+    :param maxsize: maximum number of scaled images
+    :type maxsize: int
+    """
+
+    def __init__(self, maxsize=16):
+        """Create an empty cache."""
+        self.maxsize = maxsize
+        self.sources = {}
+        self.images = OrderedDict()
+
+    def source(self, path):
+        """
+        Get the source image of the file.
+
+        :param path: image file path
+        :type path: str
+        :return: source image
+        :rtype: PIL.Image.Image
+        """
+        image = self.sources.get(path)
+        if image is None:
+            image = self.sources[path] = Image.open(path)
+            image.load()
+        return image
+
+    def get(self, master, path, size=None):
+        """
+        Get the image of the file scaled to the size.
+
+        :param master: widget the image is shown in
+        :type master: tkinter.Widget
+        :param path: image file path
+        :type path: str
+        :param size: width and height, the source size if not set
+        :type size: Tuple[int, int]
+        :return: scaled image
+        :rtype: PIL.ImageTk.PhotoImage
+        """
+        key = (master.tk, path, size)
+        image = self.images.get(key)
+        if image is not None:
+            self.images.move_to_end(key)
+            return image
+        source = self.source(path)
+        if size is not None and size != source.size:
+            source = source.resize(size)
+        image = self.images[key] = ImageTk.PhotoImage(source, master=master)
+        while len(self.images) > self.maxsize:
+            self.images.popitem(last=False)
+        return image
+
+    def clear(self):
+        """Remove all scaled images."""
+        self.images.clear()
+
+
+IMAGE_CACHE = ImageCache()
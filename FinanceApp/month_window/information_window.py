@@ -1,7 +1,9 @@
 """Month information window."""
 import tkinter as tk
+import tkinter.messagebox
 
 from tkinter import font
+from FinanceApp.month_window import UNKNOWN_DATE, DateView, Ledger, date_ordinal
 from FinanceApp.utils import config_widget
 
 
@@ -9,6 +11,8 @@ class InformationWindow:
     """
     A window for displaying and controlling a list of information about categories.
 
+    The list can be limited to a date range, the fields are then shown in chronological order.
+
     :param master: master window
     :type master: tkinter.Frame
     """
@@ -33,25 +37,81 @@ class InformationWindow:
             widget.grid(row=i+1, column=0)
             self.control_widgets[name] = {'widget': widget}
 
+        label = tk.Label(self.information_frame, text='#', font=self.label_font, bg='#e2ddec', relief='flat',
+                         state=state)
+        label.grid(row=0, column=0)
+        widget = self._create_listbox(7, state)
+        widget.grid(row=1, column=0, padx=5, pady=5)
+        self.index_widgets = {'index': {'widget': widget, 'label': label}}
+
         self.list_widgets = {}
         for i, (name, text) in enumerate(zip(
                 ('amount', 'date', 'description', 'subcategory'),
                 (_('amount'), _('date'), _('description'), _('subcategory'))
-        )):
+        ), start=1):
             label = tk.Label(self.information_frame, text=text.capitalize(), font=self.label_font, bg='#e2ddec',
                              relief='flat', state=state)
             label.grid(row=0, column=i)
-            widget = tk.Listbox(self.information_frame,  relief='solid', highlightthickness=0, bg='#f0f4f9',
-                                font=self.widget_font, width=25, height=5, state=state, selectmode=tk.BROWSE,
-                                exportselection=False)
+            widget = self._create_listbox(22, state)
             widget.grid(row=1, column=i, padx=5, pady=5)
-            widget.bind("<<ListboxSelect>>", self._select_row)
-            self.list_widgets[name] = {'widget': widget, 'label': label, 'length': 0}
+            self.list_widgets[name] = {'widget': widget, 'label': label}
+        self.scrollbar = tk.Scrollbar(self.information_frame, orient=tk.VERTICAL, command=self._scroll)
+        self.scrollbar.grid(row=1, column=len(self.list_widgets) + 1, sticky=tk.NS, pady=5)
+
+        filter_frame = tk.Frame(self.information_frame, bg='#e2ddec')
+        filter_frame.grid(row=2, column=0, columnspan=len(self.list_widgets) + 2, pady=(0, 5))
+        self.filter_widgets = {}
+        for i, (name, text) in enumerate(zip(('from', 'to'), (_('From'), _('To')))):
+            label = tk.Label(filter_frame, text=text, font=self.label_font, bg='#e2ddec', relief='flat', state=state)
+            label.grid(row=0, column=2 * i, padx=5)
+            widget = tk.Entry(filter_frame, relief='groove', width=12, font=self.widget_font, state=state)
+            widget.grid(row=0, column=2 * i + 1)
+            widget.bind('<Return>', self._apply_date_filter)
+            self.filter_widgets[name] = {'widget': widget, 'label': label}
+        widget = tk.Button(filter_frame, text=_('Filter by date'), font=self.label_font, highlightbackground='#e2ddec',
+                           relief='solid', state=state, command=self._apply_date_filter)
+        widget.grid(row=0, column=4, padx=5)
+        self.filter_widgets['filter'] = {'widget': widget}
+
+        self.ledger = []
+        self.date_range = None
+        self.fields = []
+        self.first = 0
+        self.rows = int(self.index_widgets['index']['widget'].cget('height'))
+        self.selected = None
 
         config_widget(master)
         config_widget(self.control_frame)
         config_widget(self.information_frame)
 
+    def _create_listbox(self, width, state):
+        """
+        Create a list widget of the information window.
+
+        :param width: list width in characters
+        :type width: int
+        :param state: list state
+        :type state: str
+        :return: list widget
+        :rtype: tkinter.Listbox
+        """
+        widget = tk.Listbox(self.information_frame,  relief='solid', highlightthickness=0, bg='#f0f4f9',
+                            font=self.widget_font, width=width, height=5, state=state, selectmode=tk.BROWSE,
+                            exportselection=False)
+        widget.bind("<<ListboxSelect>>", self._select_row)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            widget.bind(sequence, self._scroll_wheel)
+        return widget
+
+    def _listboxes(self):
+        """
+        Get the index list widget followed by the field list widgets.
+
+        :return: list widgets
+        :rtype: List[tkinter.Listbox]
+        """
+        return [widgets['widget'] for widgets in (*self.index_widgets.values(), *self.list_widgets.values())]
+
     def _select_row(self, event):
         """
         Select a list row by mouse click.
@@ -61,27 +121,124 @@ class InformationWindow:
         """
         selection = event.widget.curselection()
         if selection:
-            for name in self.list_widgets:
-                widget = self.list_widgets[name]['widget']
-                index = widget.curselection()
-                if not index or index != selection[0]:
-                    self.list_widgets[name]['widget'].select_clear(0, 'end')
-                    self.list_widgets[name]['widget'].select_set(selection[0])
+            self.selected = self.first + selection[0]
+            self._show_selection()
 
-    def get_selected_index(self):
+    def _show_selection(self):
+        """Highlight the selected row in all list widgets if it is visible."""
+        for widget in self._listboxes():
+            widget.select_clear(0, tk.END)
+            if self.selected is not None and 0 <= self.selected - self.first < widget.size():
+                widget.select_set(self.selected - self.first)
+
+    def _scroll_wheel(self, event):
+        """
+        Scroll the list by the mouse wheel.
+
+        :param event: mouse wheel event
+        :type event: tkinter.Event
+        :return: break the default scrolling of the list widget
+        :rtype: str
         """
-        Get the index of the selected row.
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first - 1)
+        elif event.num == 5 or event.delta < 0:
+            self.scroll_to(self.first + 1)
+        return 'break'
 
-        :return: selected row index
+    def _scroll(self, command, value, unit=None):
+        """
+        Scroll the list by the scrollbar.
+
+        :param command: 'moveto' or 'scroll'
+        :type command: str
+        :param value: position fraction to move to or number of units to scroll
+        :type value: str
+        :param unit: 'units' or 'pages'
+        :type unit: str
+        """
+        if command == 'moveto':
+            self.scroll_to(round(float(value) * len(self.fields)))
+        else:
+            self.scroll_to(self.first + int(value) * (self.rows if unit == 'pages' else 1))
+
+    def scroll_to(self, first):
+        """
+        Show the rows starting from the given one.
+
+        :param first: index of the first visible row
+        :type first: int
+        """
+        first = max(0, min(first, len(self.fields) - self.rows))
+        if first != self.first:
+            self.first = first
+            self._render()
+
+    def _visible_stop(self):
+        """
+        Get the index after the last visible row.
+
+        :return: row index
         :rtype: int
         """
+        return min(self.first + self.rows, len(self.fields))
+
+    def _render(self):
+        """Fill the list widgets with the visible rows only."""
+        stop = self._visible_stop()
         for name in self.list_widgets:
             widget = self.list_widgets[name]['widget']
-            selection = widget.curselection()
-            if not selection:
-                return None
-            else:
-                return selection[0]
+            widget.delete(0, tk.END)
+            for idx in range(self.first, stop):
+                widget.insert(tk.END, self.fields[idx][name])
+        self._render_index()
+        self._show_selection()
+
+    def _render_index(self):
+        """Label the visible rows with their indexes in the category and move the scrollbar."""
+        widget = self.index_widgets['index']['widget']
+        stop = self._visible_stop()
+        widget.delete(0, tk.END)
+        for idx in range(self.first, stop):
+            widget.insert(tk.END, self._ledger_index(idx))
+        if self.fields:
+            self.scrollbar.set(self.first / len(self.fields), stop / len(self.fields))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _ledger_index(self, position):
+        """
+        Get the index in the category of a list row.
+
+        :param position: row position in the list
+        :type position: int
+        :return: field index
+        :rtype: int
+        """
+        return self.fields.rows[position] if isinstance(self.fields, DateView) else position
+
+    def get_selected_index(self):
+        """
+        Get the index in the category of the selected row.
+
+        :return: selected field index
+        :rtype: int
+        """
+        if self.selected is None:
+            return None
+        return self._ledger_index(self.selected)
+
+    def select_index(self, index):
+        """
+        Select the row and scroll the list to show it.
+
+        :param index: row index
+        :type index: int
+        """
+        self.selected = index
+        if not self.first <= index < self._visible_stop():
+            self.scroll_to(index)
+        self._show_selection()
 
     def change_index_field(self, index, field):
         """
@@ -92,30 +249,152 @@ class InformationWindow:
         :param field: field value
         :type field: Dict[str, float]
         """
+        if self.date_range is not None:
+            self._refilter(self.get_selected_index())
+            return
+        if not self.first <= index < self._visible_stop():
+            return
         for name in self.list_widgets:
             widget = self.list_widgets[name]['widget']
-            widget.delete(index)
-            widget.insert(index, f'{index}: {field[name]}')
+            widget.delete(index - self.first)
+            widget.insert(index - self.first, field[name])
+        self._show_selection()
+
+    def insert_index_field(self, index):
+        """
+        Show a field inserted into the fields at the index.
+
+        Only the inserted row is rendered, the rows after it keep their text.
+
+        :param index: index of the inserted field
+        :type index: int
+        """
+        if self.date_range is not None:
+            selected = self.get_selected_index()
+            self._refilter(selected + (selected >= index) if selected is not None else None)
+            return
+        if self.selected is not None and self.selected >= index:
+            self.selected += 1
+        if index < self.first:
+            self.first += 1
+        elif index < self.first + self.rows:
+            for name in self.list_widgets:
+                widget = self.list_widgets[name]['widget']
+                widget.insert(index - self.first, self.fields[index][name])
+                if widget.size() > self.rows:
+                    widget.delete(self.rows)
+        self._render_index()
+        self._show_selection()
+
+    def remove_index_field(self, index):
+        """
+        Hide a field removed from the fields at the index.
+
+        Only the removed row and the row scrolled into the view are rendered.
+
+        :param index: index the removed field had
+        :type index: int
+        """
+        if self.date_range is not None:
+            selected = self.get_selected_index()
+            self._refilter(selected - (selected > index) if selected not in (None, index) else None)
+            return
+        if self.selected == index:
+            self.selected = None
+        elif self.selected is not None and self.selected > index:
+            self.selected -= 1
+        if index < self.first:
+            self.first -= 1
+        elif self.first and self.first + self.rows > len(self.fields):
+            self.first -= 1
+            self._render()
+            return
+        elif index < self.first + self.rows:
+            stop = self.first + self.rows - 1
+            for name in self.list_widgets:
+                widget = self.list_widgets[name]['widget']
+                widget.delete(index - self.first)
+                if stop < len(self.fields):
+                    widget.insert(tk.END, self.fields[stop][name])
+        self._render_index()
+        self._show_selection()
 
     def update_list(self, fields, delete_list=False):
         """
-        Update the list with new fields.
+        Show the fields in the list.
 
-        :param fields: fields to add
-        :type fields: List
-        :param delete_list: delete the list or not
+        Only the visible rows are rendered, the fields are read on demand.
+
+        :param fields: fields to show
+        :type fields: Sequence[Dict[str, float]]
+        :param delete_list: reset the scroll position and the selection or keep them
         :type delete_list: bool
         """
-        if isinstance(fields, dict):
-            fields = [fields]
-        for name in self.list_widgets:
-            widget = self.list_widgets[name]
-            if delete_list:
-                widget['widget'].delete(0, tk.END)
-                widget['length'] = 0
-            for idx, field in enumerate(fields, start=widget['length']):
-                widget['widget'].insert(tk.END, f'{idx}: {field[name]}')
-            widget['length'] += len(fields)
+        self.ledger = fields
+        if delete_list:
+            self.first = 0
+            self.selected = None
+        self._filter()
+        self._render()
+
+    def set_date_range(self, first=None, last=None):
+        """
+        Show only the fields dated in a range, the fields with unknown dates are hidden.
+
+        All fields are shown when neither bound is set.
+
+        :param first: first day number, unbounded if not set
+        :type first: int
+        :param last: last day number, inclusive, unbounded if not set
+        :type last: int
+        """
+        if first is None and last is None:
+            self.date_range = None
+        else:
+            self.date_range = (UNKNOWN_DATE + 1 if first is None else first, last)
+        self.first = 0
+        self.selected = None
+        self._filter()
+        self._render()
+
+    def _apply_date_filter(self, event=None):
+        """
+        Limit the list to the dates entered in the filter widgets.
+
+        :param event: key press event
+        :type event: tkinter.Event
+        """
+        bounds = []
+        for name in ('from', 'to'):
+            widget = self.filter_widgets[name]['widget']
+            text = widget.get().strip()
+            bounds.append(date_ordinal(text) if text else None)
+            if bounds[-1] == UNKNOWN_DATE:
+                tk.messagebox.showwarning('Error', 'Invalid date', parent=widget)
+                return
+        self.set_date_range(*bounds)
+
+    def _filter(self):
+        """Select the fields of the date range with the date index of the category."""
+        if self.date_range is None or not isinstance(self.ledger, Ledger):
+            self.fields = self.ledger
+        else:
+            self.fields = DateView(self.ledger, self.ledger.date_rows(*self.date_range))
+
+    def _refilter(self, selected):
+        """
+        Select the fields of the date range again after a change and show them.
+
+        :param selected: index in the category of the field to select
+        :type selected: int
+        """
+        self._filter()
+        try:
+            self.selected = None if selected is None else self.fields.rows.index(selected)
+        except ValueError:
+            self.selected = None
+        self.first = max(0, min(self.first, len(self.fields) - self.rows))
+        self._render()
 
     def bind(self, button_name, bind_name, callback):
         """
@@ -148,8 +427,7 @@ class InformationWindow:
         :param state: window visibility mode
         :type state: str
         """
-        for widgets in (self.list_widgets, self.control_widgets):
+        for widgets in (self.index_widgets, self.list_widgets, self.control_widgets, self.filter_widgets):
             for name in widgets:
-                for widget_name, widget in widgets[name].items():
-                    if widget_name != 'length':
-                        widget.config(state=state)
+                for widget in widgets[name].values():
+                    widget.config(state=state)
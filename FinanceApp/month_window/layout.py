@@ -0,0 +1,161 @@
+"""Category ids and their places in the category grid."""
+
+
+class CategoryIds:
+    """
+    Stable ids of the categories of a year.
+
+    A category name gets an id when it is first seen, the categories of all months with that name share it,
+    so the months can be joined on the id. A second category with the same name in one month gets a new id.
+    Ids are never reused.
+    """
+
+    def __init__(self):
+        """Create a registry without ids."""
+        self.ids = {}
+        self.names = []
+
+    def get(self, name, taken=()):
+        """
+        Get the id of a category name.
+
+        :param name: category name
+        :type name: str
+        :param taken: ids which cannot be used, the ids of the month categories
+        :type taken: Container[int]
+        :return: category id
+        :rtype: int
+        """
+        category_id = self.ids.get(name)
+        if category_id is None or category_id in taken:
+            category_id = len(self.names)
+            self.names.append(name)
+            self.ids.setdefault(name, category_id)
+        return category_id
+
+
+class CategoryLayout:
+    """
+    Places of the category ids in the category grid.
+
+    The grid slots are numbered row by row. A deleted category frees only its slot and a moved category
+    swaps the slots of two categories, the other categories keep their places. New categories take the
+    first free slot.
+
+    :param grid_shape: category grid size
+    :type grid_shape: Tuple[int, int]
+    """
+
+    def __init__(self, grid_shape):
+        """Create an empty layout."""
+        self.grid_shape = grid_shape
+        self.slots = [None] * (grid_shape[0] * grid_shape[1])
+        self.places = {}
+
+    def __len__(self):
+        """Get the number of the placed categories."""
+        return len(self.places)
+
+    def __iter__(self):
+        """Iterate over the category ids in the grid order."""
+        return (category_id for category_id in self.slots if category_id is not None)
+
+    def __contains__(self, category_id):
+        """Check if the category is placed."""
+        return category_id in self.places
+
+    def free_slot(self):
+        """
+        Get the first free slot.
+
+        :return: slot number, None if the grid is full
+        :rtype: int
+        """
+        for slot, category_id in enumerate(self.slots):
+            if category_id is None:
+                return slot
+        return None
+
+    def place(self, category_id, slot=None):
+        """
+        Put a category into a slot.
+
+        :param category_id: category id
+        :type category_id: int
+        :param slot: preferred slot, the first free slot is taken if it is not set or not free
+        :type slot: int
+        :return: slot of the category
+        :rtype: int
+        """
+        if slot is None or not 0 <= slot < len(self.slots) or self.slots[slot] is not None:
+            slot = self.free_slot()
+            if slot is None:
+                raise ValueError(_('No free place for a new category'))
+        self.slots[slot] = category_id
+        self.places[category_id] = slot
+        return slot
+
+    def remove(self, category_id):
+        """
+        Free the slot of a category.
+
+        :param category_id: category id
+        :type category_id: int
+        :return: freed slot
+        :rtype: int
+        """
+        slot = self.places.pop(category_id)
+        self.slots[slot] = None
+        return slot
+
+    def move(self, category_id, slot):
+        """
+        Move a category to a slot, the category in the slot takes the old slot of the moved one.
+
+        :param category_id: category id
+        :type category_id: int
+        :param slot: new slot
+        :type slot: int
+        :return: changed slots
+        :rtype: Tuple[int, int]
+        """
+        old = self.places[category_id]
+        other = self.slots[slot]
+        self.slots[old], self.slots[slot] = other, category_id
+        self.places[category_id] = slot
+        if other is not None:
+            self.places[other] = old
+        return old, slot
+
+    def slot(self, category_id):
+        """
+        Get the slot of a category.
+
+        :param category_id: category id
+        :type category_id: int
+        :return: slot number
+        :rtype: int
+        """
+        return self.places[category_id]
+
+    def position(self, slot):
+        """
+        Get the grid position of a slot.
+
+        :param slot: slot number
+        :type slot: int
+        :return: row and column
+        :rtype: Tuple[int, int]
+        """
+        return divmod(slot, self.grid_shape[1])
+
+    def at(self, position):
+        """
+        Get the category at a grid position.
+
+        :param position: row and column
+        :type position: Tuple[int, int]
+        :return: category id, None if the place is free
+        :rtype: int
+        """
+        return self.slots[position[0] * self.grid_shape[1] + position[1]]
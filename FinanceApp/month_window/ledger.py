@@ -0,0 +1,804 @@
+"""Columnar storage of category data fields."""
+import datetime
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
+
+DATE_FORMATS = ('%d.%m.%Y', '%d/%m/%Y')
+UNKNOWN_DATE = 0
+
+
+def parse_date(text):
+    """
+    Parse a date in the ISO format or written as day.month.year or day/month/year.
+
+    :param text: date text
+    :type text: str
+    :return: parsed date, None if the text is not a date
+    :rtype: datetime.date
+    """
+    text = str(text).strip()
+    if not text:
+        return None
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).date()
+        except ValueError:
+            pass
+    return None
+
+
+def date_ordinal(text):
+    """
+    Get the day number of a date counted from January 1 of year 1.
+
+    :param text: date text
+    :type text: str
+    :return: day number, ``UNKNOWN_DATE`` if the text is not a date
+    :rtype: int
+    """
+    date = parse_date(text)
+    return date.toordinal() if date is not None else UNKNOWN_DATE
+
+
+class StringPool:
+    """
+    Dictionary encoding of column values.
+
+    Every distinct value is stored once, rows keep only its integer code.
+    """
+
+    __slots__ = ('values', 'codes')
+
+    def __init__(self):
+        """Create an empty string pool."""
+        self.values = []
+        self.codes = {}
+
+    def __len__(self):
+        """Get the number of distinct values."""
+        return len(self.values)
+
+    def encode(self, value):
+        """
+        Get the code of the value, adding it to the pool if necessary.
+
+        :param value: value to encode
+        :type value: str
+        :return: value code
+        :rtype: int
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def decode(self, code):
+        """
+        Get the value by its code.
+
+        :param code: value code
+        :type code: int
+        :return: encoded value
+        :rtype: str
+        """
+        return self.values[code]
+
+
+class Totals:
+    """
+    Running sums of the ledger amounts.
+
+    Besides the sum of all amounts, sums are kept for every code of the grouped columns together with the
+    number of rows, so that a group is dropped when its last row is deleted.
+    """
+
+    __slots__ = ('amount', 'groups')
+
+    def __init__(self):
+        """Create zero totals."""
+        self.amount = 0.
+        self.groups = {name: {} for name in Ledger.GROUPED_COLUMNS}
+
+    def add(self, amount, codes, sign=1):
+        """
+        Add a row to the sums or subtract it.
+
+        :param amount: row amount
+        :type amount: float
+        :param codes: row codes by grouped column name
+        :type codes: Dict[str, int]
+        :param sign: 1 to add the row, -1 to subtract it
+        :type sign: int
+        """
+        self.amount += sign * amount
+        for name, group in self.groups.items():
+            code = codes[name]
+            entry = group.get(code)
+            if entry is None:
+                entry = group[code] = [0., 0]
+            entry[0] += sign * amount
+            entry[1] += sign
+            if not entry[1]:
+                del group[code]
+
+
+class DateIndex:
+    """
+    Row indexes of a ledger sorted by date.
+
+    Every distinct date is parsed once into its day number. Rows of the same day are kept in the ledger order,
+    rows with unknown dates come first. Dates are found by binary search, so a date range costs a logarithm
+    of the number of rows plus the number of the found rows.
+    """
+
+    __slots__ = ('ordinals', 'rows', 'parsed')
+
+    def __init__(self):
+        """Create an empty index."""
+        self.ordinals = array('q')
+        self.rows = array('q')
+        self.parsed = {}
+
+    @classmethod
+    def build(cls, ledger):
+        """
+        Index all rows of a ledger.
+
+        :param ledger: indexed ledger
+        :type ledger: month_window.ledger.Ledger
+        :return: date index
+        :rtype: month_window.ledger.DateIndex
+        """
+        import numpy as np
+
+        index = cls()
+        codes, inverse = np.unique(ledger.arrays()['date'], return_inverse=True)
+        ordinals = np.array([index.ordinal(ledger, code) for code in codes.tolist()], dtype=np.int64)
+        ordinals = ordinals[inverse.reshape(-1)]
+        order = np.argsort(ordinals, kind='stable')
+        index.ordinals.frombytes(ordinals[order].tobytes())
+        index.rows.frombytes(order.astype(np.int64).tobytes())
+        return index
+
+    def ordinal(self, ledger, code):
+        """
+        Get the day number of a date code, parsing the date on first use.
+
+        :param ledger: indexed ledger
+        :type ledger: month_window.ledger.Ledger
+        :param code: date code
+        :type code: int
+        :return: day number
+        :rtype: int
+        """
+        ordinal = self.parsed.get(code)
+        if ordinal is None:
+            ordinal = self.parsed[code] = date_ordinal(ledger.pools['date'].decode(code))
+        return ordinal
+
+    def insert(self, ordinal, row, shift=False):
+        """
+        Add a row to the index.
+
+        :param ordinal: day number of the row
+        :type ordinal: int
+        :param row: row index
+        :type row: int
+        :param shift: increment the indexes of the following rows, for a row inserted into the ledger
+        :type shift: bool
+        """
+        if shift:
+            import numpy as np
+
+            rows = np.frombuffer(self.rows, dtype=np.int64)
+            rows[rows >= row] += 1
+            del rows
+        position = self._position(ordinal, row)
+        self.ordinals.insert(position, ordinal)
+        self.rows.insert(position, row)
+
+    def remove(self, ordinal, row, shift=True):
+        """
+        Remove a row from the index.
+
+        :param ordinal: day number of the row
+        :type ordinal: int
+        :param row: row index
+        :type row: int
+        :param shift: decrement the indexes of the following rows, for a row deleted from the ledger
+        :type shift: bool
+        """
+        position = self._position(ordinal, row)
+        del self.ordinals[position], self.rows[position]
+        if shift:
+            import numpy as np
+
+            rows = np.frombuffer(self.rows, dtype=np.int64)
+            rows[rows > row] -= 1
+            del rows
+
+    def between(self, first=None, last=None):
+        """
+        Get the rows dated in a range.
+
+        :param first: first day number, unbounded if not set
+        :type first: int
+        :param last: last day number, inclusive, unbounded if not set
+        :type last: int
+        :return: row indexes sorted by date
+        :rtype: array.array
+        """
+        start = 0 if first is None else bisect_left(self.ordinals, first)
+        stop = len(self.ordinals) if last is None else bisect_right(self.ordinals, last, start)
+        return self.rows[start:stop]
+
+    def _position(self, ordinal, row):
+        """Get the position of a row in the index by its day number and index."""
+        start = bisect_left(self.ordinals, ordinal)
+        return bisect_left(self.rows, row, start, bisect_right(self.ordinals, ordinal, start))
+
+
+class Field(Mapping):
+    """
+    Read-only view of a single ledger row.
+
+    :param ledger: ledger containing the row
+    :type ledger: month_window.ledger.Ledger
+    :param index: row index
+    :type index: int
+    """
+
+    __slots__ = ('_ledger', '_index')
+
+    def __init__(self, ledger, index):
+        """Create a row view."""
+        self._ledger = ledger
+        self._index = index
+
+    def __getitem__(self, key):
+        """Get the row value by column name."""
+        return self._ledger.get_value(self._index, key)
+
+    def __iter__(self):
+        """Iterate over the column names."""
+        return iter(Ledger.COLUMNS)
+
+    def __len__(self):
+        """Get the number of columns."""
+        return len(Ledger.COLUMNS)
+
+    def __repr__(self):
+        """Represent the row as a dict."""
+        return repr(dict(self))
+
+
+class DateView(Sequence):
+    """
+    Read-only view of the ledger rows selected by date.
+
+    :param ledger: ledger containing the rows
+    :type ledger: month_window.ledger.Ledger
+    :param rows: indexes of the selected rows
+    :type rows: Sequence[int]
+    """
+
+    def __init__(self, ledger, rows):
+        """Create a view of the rows."""
+        self.ledger = ledger
+        self.rows = rows
+
+    def __len__(self):
+        """Get the number of rows."""
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        """Get the row view by index in the view."""
+        if isinstance(index, slice):
+            return [Field(self.ledger, row) for row in self.rows[index]]
+        return Field(self.ledger, self.rows[index])
+
+
+class Ledger(Sequence):
+    """
+    Category data fields stored column by column.
+
+    Amounts are kept in a typed array, dates, descriptions and subcategories are dictionary-encoded:
+    the typed arrays contain codes into a per-column string pool. Indexing the ledger returns a
+    lightweight row view, so the ledger can be used as a list of fields. Every row also gets an id
+    which does not change when other rows are deleted.
+
+    A ledger can also be attached to read-only buffers, e.g. slices of a memory-mapped file, with
+    :meth:`from_buffers`. The buffers are copied into arrays only when the ledger is changed.
+
+    The sums of the amounts by date and subcategory are updated with every change, so reading them
+    costs only the number of groups. The sums of a ledger attached to buffers are computed on first use
+    with :func:`aggregation.code_sums`. The rows sorted by date are indexed on first use too, and the
+    index is then updated with every change.
+    """
+
+    COLUMNS = ('amount', 'date', 'description', 'subcategory')
+    ENCODED_COLUMNS = ('date', 'description', 'subcategory')
+    TYPECODES = {'amount': 'd', 'date': 'q', 'description': 'i', 'subcategory': 'i'}
+    GROUPED_COLUMNS = ('date', 'subcategory')
+    totals = None
+    dates = None
+
+    def __init__(self, fields=()):
+        """Create a ledger, optionally filled with fields."""
+        self.columns = {name: array(self.TYPECODES[name]) for name in self.COLUMNS}
+        self.pools = {name: StringPool() for name in self.ENCODED_COLUMNS}
+        self.ids = array('q')
+        self.next_id = 0
+        self.mapped = False
+        self.totals = Totals()
+        self.dates = None
+        self.extend(fields)
+
+    @classmethod
+    def from_buffers(cls, columns, ids, pools, next_id):
+        """
+        Create a ledger viewing the buffers without copying them.
+
+        :param columns: buffers with the column values by column name, in the :attr:`TYPECODES` formats
+        :type columns: Dict[str, memoryview]
+        :param ids: buffer with the row ids
+        :type ids: memoryview
+        :param pools: encoded column values by column name
+        :type pools: Dict[str, month_window.ledger.StringPool]
+        :param next_id: next free row id
+        :type next_id: int
+        :return: ledger
+        :rtype: month_window.ledger.Ledger
+        """
+        ledger = cls()
+        ledger.columns = {name: memoryview(columns[name]).cast('B').cast(cls.TYPECODES[name]) for name in cls.COLUMNS}
+        ledger.ids = memoryview(ids).cast('B').cast('q')
+        ledger.pools = dict(pools)
+        ledger.next_id = next_id
+        ledger.mapped = True
+        ledger.totals = None
+        ledger.dates = None
+        return ledger
+
+    def __len__(self):
+        """Get the number of rows."""
+        return len(self.columns['amount'])
+
+    def __getitem__(self, index):
+        """Get the row view by index."""
+        if isinstance(index, slice):
+            return [Field(self, idx) for idx in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('ledger index out of range')
+        return Field(self, index)
+
+    def __delitem__(self, index):
+        """Delete the row by index."""
+        self._materialize()
+        if self.totals is not None:
+            self.totals.add(self.columns['amount'][index], self._codes(index), -1)
+        if self.dates is not None:
+            if index < 0:
+                index += len(self)
+            self.dates.remove(self.dates.ordinal(self, self.columns['date'][index]), index)
+        for column in self.columns.values():
+            del column[index]
+        del self.ids[index]
+        if self.totals is not None and not self.ids:
+            self.totals.amount = 0.
+
+    def find(self, row_id):
+        """
+        Get the index of the row by its id.
+
+        :param row_id: row id
+        :type row_id: int
+        :return: row index
+        :rtype: int
+        """
+        self._materialize()
+        return self.ids.index(row_id)
+
+    def get_value(self, index, name):
+        """
+        Get a single value of the row.
+
+        :param index: row index
+        :type index: int
+        :param name: column name
+        :type name: str
+        :return: stored value
+        """
+        value = self.columns[name][index]
+        if name in self.pools:
+            return self.pools[name].decode(value)
+        return value
+
+    def get_row(self, index):
+        """
+        Get a copy of the row values.
+
+        :param index: row index
+        :type index: int
+        :return: row values by column name
+        :rtype: Dict[str, float]
+        """
+        return {name: self.get_value(index, name) for name in self.COLUMNS}
+
+    def append(self, amount, date, description, subcategory, row_id=None):
+        """
+        Append a row to the ledger.
+
+        :param amount: amount of expenses
+        :type amount: float
+        :param date: date of expenses
+        :type date: str
+        :param description: description of expenses
+        :type description: str
+        :param subcategory: subcategory of expenses
+        :type subcategory: str
+        :param row_id: id of the row, the next free id by default
+        :type row_id: int
+        :return: id of the row
+        :rtype: int
+        """
+        self._materialize()
+        for name, value in zip(self.COLUMNS, (amount, date, description, subcategory)):
+            if name in self.pools:
+                value = self.pools[name].encode(value)
+            self.columns[name].append(value)
+        if self.totals is not None:
+            self.totals.add(amount, self._codes(-1))
+        if self.dates is not None:
+            self.dates.insert(self.dates.ordinal(self, self.columns['date'][-1]), len(self) - 1)
+        if row_id is None:
+            row_id = self.next_id
+        self.ids.append(row_id)
+        self.next_id = max(self.next_id, row_id + 1)
+        return row_id
+
+    def insert(self, index, amount, date, description, subcategory, row_id=None):
+        """
+        Insert a row before the index, moving the following rows.
+
+        A deleted row restored with its id at its index keeps the rows ordered by id.
+
+        :param index: index of the inserted row
+        :type index: int
+        :param amount: amount of expenses
+        :type amount: float
+        :param date: date of expenses
+        :type date: str
+        :param description: description of expenses
+        :type description: str
+        :param subcategory: subcategory of expenses
+        :type subcategory: str
+        :param row_id: id of the row, the next free id by default
+        :type row_id: int
+        :return: id of the row
+        :rtype: int
+        """
+        if index >= len(self):
+            return self.append(amount, date, description, subcategory, row_id=row_id)
+        self._materialize()
+        for name, value in zip(self.COLUMNS, (amount, date, description, subcategory)):
+            if name in self.pools:
+                value = self.pools[name].encode(value)
+            self.columns[name].insert(index, value)
+        if self.totals is not None:
+            self.totals.add(amount, self._codes(index))
+        if self.dates is not None:
+            self.dates.insert(self.dates.ordinal(self, self.columns['date'][index]), index, shift=True)
+        if row_id is None:
+            row_id = self.next_id
+        self.ids.insert(index, row_id)
+        self.next_id = max(self.next_id, row_id + 1)
+        return row_id
+
+    def extend(self, fields, row_ids=None):
+        """
+        Append several rows to the ledger.
+
+        :param fields: fields to append
+        :type fields: Iterable[Dict[str, float]]
+        :param row_ids: ids of the rows, the next free ids by default
+        :type row_ids: Iterable[int]
+        """
+        if row_ids is None:
+            for field in fields:
+                self.append(*(field[name] for name in self.COLUMNS))
+            return
+        for field, row_id in zip(fields, row_ids):
+            self.append(*(field[name] for name in self.COLUMNS), row_id=row_id)
+
+    def change(self, index, **values):
+        """
+        Change row values.
+
+        :param index: row index
+        :type index: int
+        :param values: new values by column name
+        """
+        self._materialize()
+        if self.totals is not None:
+            self.totals.add(self.columns['amount'][index], self._codes(index), -1)
+        old_date = self.columns['date'][index]
+        for name, value in values.items():
+            if name in self.pools:
+                value = self.pools[name].encode(value)
+            self.columns[name][index] = value
+        if self.totals is not None:
+            self.totals.add(self.columns['amount'][index], self._codes(index))
+        if self.dates is not None and self.columns['date'][index] != old_date:
+            if index < 0:
+                index += len(self)
+            self.dates.remove(self.dates.ordinal(self, old_date), index, shift=False)
+            self.dates.insert(self.dates.ordinal(self, self.columns['date'][index]), index)
+
+    def total(self, first=None, last=None):
+        """
+        Get the sum of the amounts, optionally of the rows dated in a range.
+
+        :param first: first day number, unbounded if not set
+        :type first: int
+        :param last: last day number, inclusive, unbounded if not set
+        :type last: int
+        :return: sum of the amounts
+        :rtype: float
+        """
+        if first is None and last is None:
+            return self._get_totals().amount
+        return sum(self.group_totals('date', first, last).values())
+
+    def group_totals(self, name, first=None, last=None):
+        """
+        Get the sums of the amounts grouped by the column values, optionally of the rows dated in a range.
+
+        The sums of all rows are kept up to date, the sums of a date range are computed from the rows found by
+        the date index.
+
+        :param name: grouped column name, one of :attr:`GROUPED_COLUMNS`
+        :type name: str
+        :param first: first day number, unbounded if not set
+        :type first: int
+        :param last: last day number, inclusive, unbounded if not set
+        :type last: int
+        :return: sums of the amounts by decoded column value
+        :rtype: Dict[str, float]
+        """
+        pool = self.pools[name]
+        if first is None and last is None:
+            return {pool.decode(code): entry[0] for code, entry in self._get_totals().groups[name].items()}
+        import numpy as np
+
+        from FinanceApp import aggregation
+
+        rows = np.frombuffer(self.date_rows(first, last), dtype=np.int64)
+        arrays = self.arrays()
+        codes, sums, _ = aggregation.code_sums(arrays[name][rows], arrays['amount'][rows])
+        del arrays
+        totals = {}
+        for code, amount in zip(codes.tolist(), sums.tolist()):
+            value = pool.decode(code)
+            totals[value] = totals.get(value, 0.) + amount
+        return totals
+
+    def date_rows(self, first=None, last=None):
+        """
+        Get the rows dated in a range, indexing the dates on first use.
+
+        :param first: first day number, unbounded if not set
+        :type first: int
+        :param last: last day number, inclusive, unbounded if not set
+        :type last: int
+        :return: row indexes sorted by date, rows with unknown dates first
+        :rtype: array.array
+        """
+        if self.dates is None:
+            self.dates = DateIndex.build(self)
+        return self.dates.between(first, last)
+
+    def group_counts(self, name):
+        """
+        Get the numbers of the rows grouped by the column values.
+
+        :param name: grouped column name, one of :attr:`GROUPED_COLUMNS`
+        :type name: str
+        :return: numbers of the rows by decoded column value
+        :rtype: Dict[str, int]
+        """
+        pool = self.pools[name]
+        return {pool.decode(code): entry[1] for code, entry in self._get_totals().groups[name].items()}
+
+    def arrays(self):
+        """
+        Get the columns as NumPy arrays without copying.
+
+        The arrays share memory with the ledger, which cannot grow or shrink while they are alive.
+        Encoded columns contain codes, the values can be obtained from :attr:`pools`.
+
+        :return: arrays by column name
+        :rtype: Dict[str, numpy.ndarray]
+        """
+        import numpy as np
+
+        return {name: np.frombuffer(self.columns[name], dtype=np.dtype(self.TYPECODES[name])) for name in self.COLUMNS}
+
+    def decoded_arrays(self):
+        """
+        Get the columns as NumPy arrays with decoded values.
+
+        Values of pools other than :class:`StringPool` are decoded only for the codes in use.
+
+        :return: arrays by column name
+        :rtype: Dict[str, numpy.ndarray]
+        """
+        import numpy as np
+
+        arrays = self.arrays()
+        for name, pool in self.pools.items():
+            if isinstance(pool, StringPool):
+                values = np.empty(len(pool), dtype=object)
+                values[:] = pool.values
+                arrays[name] = values[arrays[name]]
+            else:
+                codes, inverse = np.unique(arrays[name], return_inverse=True)
+                values = np.empty(len(codes), dtype=object)
+                values[:] = [pool.decode(code) for code in codes]
+                arrays[name] = values[inverse]
+        return arrays
+
+    def _codes(self, index):
+        """Get the codes of the grouped columns of the row."""
+        return {name: self.columns[name][index] for name in self.GROUPED_COLUMNS}
+
+    def _get_totals(self):
+        """Get the running sums, computing them if the ledger does not keep them yet."""
+        if self.totals is None:
+            from FinanceApp import aggregation
+
+            arrays = self.arrays()
+            totals = Totals()
+            totals.amount = float(arrays['amount'].sum())
+            for name in self.GROUPED_COLUMNS:
+                codes, sums, counts = aggregation.code_sums(arrays[name], arrays['amount'])
+                totals.groups[name] = {code: [amount, count] for code, amount, count in
+                                       zip(codes.tolist(), sums.tolist(), counts.tolist())}
+            self.totals = totals
+        return self.totals
+
+    def copy(self):
+        """
+        Copy the rows into a new ledger with its own arrays and string pools.
+
+        The copy does not keep the running sums and the date index, they are computed on first use.
+
+        :return: copied ledger
+        :rtype: month_window.ledger.Ledger
+        """
+        ledger = type(self)()
+        for name in self.COLUMNS:
+            ledger.columns[name].frombytes(memoryview(self.columns[name]).cast('B'))
+        ledger.ids.frombytes(memoryview(self.ids).cast('B'))
+        for name, pool in self.pools.items():
+            if isinstance(pool, StringPool):
+                ledger.pools[name].values, ledger.pools[name].codes = list(pool.values), dict(pool.codes)
+            else:
+                ledger.pools[name] = pool
+        ledger.next_id = self.next_id
+        ledger.totals = None
+        return ledger
+
+    def detach(self):
+        """Copy the viewed buffers into arrays, so that the ledger no longer depends on them."""
+        self._materialize()
+
+    def _materialize(self):
+        """Copy the viewed buffers into arrays, so that the ledger can be changed."""
+        if not self.mapped:
+            return
+        columns = {name: array(self.TYPECODES[name]) for name in self.COLUMNS}
+        for name, column in columns.items():
+            column.frombytes(self.columns[name].cast('B'))
+        ids = array('q')
+        ids.frombytes(self.ids.cast('B'))
+        self.columns, self.ids, self.mapped = columns, ids, False
+
+
+class LedgerObserver:
+    """
+    Base class for objects notified about changes of the month data.
+
+    Categories and month windows call the hooks after the change has been made.
+    """
+
+    def category_created(self, month_window, category):
+        """
+        Handle a category creation.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: created category
+        :type category: month_window.category_button.Category
+        """
+
+    def category_deleted(self, month_window, category):
+        """
+        Handle a category deletion.
+
+        :param month_window: month window which contained the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        """
+
+    def category_moved(self, month_window, category):
+        """
+        Handle a move of a category to another slot of the grid.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: moved category
+        :type category: month_window.category_button.Category
+        """
+
+    def field_added(self, category, index):
+        """
+        Handle a data field addition.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the added field
+        :type index: int
+        """
+
+    def fields_added(self, category, start, stop):
+        """
+        Handle an addition of several data fields.
+
+        Calls :meth:`field_added` for every field by default.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param start: index of the first added field
+        :type start: int
+        :param stop: index after the last added field
+        :type stop: int
+        """
+        for index in range(start, stop):
+            self.field_added(category, index)
+
+    def field_changed(self, category, index, old):
+        """
+        Handle a data field change.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the changed field
+        :type index: int
+        :param old: field values before the change
+        :type old: Dict[str, float]
+        """
+
+    def field_deleted(self, category, index, row_id, old):
+        """
+        Handle a data field deletion.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index the field had
+        :type index: int
+        :param row_id: id the field had
+        :type row_id: int
+        :param old: values of the deleted field
+        :type old: Dict[str, float]
+        """
@@ -0,0 +1,221 @@
+"""Month categories without widgets."""
+from FinanceApp.month_window import Category, CategoryIds, CategoryLayout, Ledger
+
+
+class MonthData:
+    """
+    Categories of a month.
+
+    Month data can be loaded from a storage and aggregated without Tk, the month window extends it with
+    the widgets. The categories are kept by id, their places in the grid are kept by the layout.
+
+    :param month: month number
+    :type month: int
+    :param observers: objects notified about the data changes
+    :type observers: List[month_window.ledger.LedgerObserver]
+    :param grid_shape: category grid size
+    :type grid_shape: Tuple[int, int]
+    :param category_ids: ids of the category names shared by the months of a year, ids of the month if not set
+    :type category_ids: month_window.layout.CategoryIds
+    """
+
+    def __init__(self, month=None, observers=None, grid_shape=(6, 4), category_ids=None):
+        """Create a month without categories."""
+        self.grid_shape = grid_shape
+        self.month = month
+        self.observers = observers if observers is not None else []
+        self.category_ids = category_ids if category_ids is not None else CategoryIds()
+        self.categories = {}
+        self.layout = CategoryLayout(grid_shape)
+
+    def add_category(self, name, slot=None):
+        """
+        Add a category to the grid without notifying the observers.
+
+        :param name: category name
+        :type name: str
+        :param slot: preferred slot of the grid, the first free slot if not set or not free
+        :type slot: int
+        :return: created category
+        :rtype: month_window.category_button.Category
+        """
+        if self.layout.free_slot() is None:
+            raise ValueError(_('No free place for a new category'))
+        category_id = self.category_ids.get(name, self.categories)
+        return self._place_category(Category(category_id, name, observers=self.observers), slot)
+
+    def _place_category(self, category, slot=None):
+        """
+        Put a category into the grid without notifying the observers.
+
+        :param category: category
+        :type category: month_window.category_button.Category
+        :param slot: preferred slot of the grid, the first free slot if not set or not free
+        :type slot: int
+        :return: placed category
+        :rtype: month_window.category_button.Category
+        """
+        self.layout.place(category.id, slot)
+        self.categories[category.id] = category
+        return category
+
+    def take_categories(self, month_data):
+        """
+        Take over the categories of the month loaded without widgets, keeping their places in the grid.
+
+        The observers are not notified, they already know the categories.
+
+        :param month_data: month loaded without widgets
+        :type month_data: month_window.month_data.MonthData
+        """
+        for slot, category_id in enumerate(month_data.layout.slots):
+            if category_id is not None:
+                self._place_category(month_data.categories[category_id], slot)
+
+    def restore_category(self, category, slot=None):
+        """
+        Put a deleted category back to the grid with its data fields.
+
+        The observers are notified about the category creation and about the addition of its fields. The fields
+        keep their ids, so the deleted fields restored later by the log of the changes do not clash with them.
+
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        :param slot: slot the category had, the first free slot is taken if it is not set or not free
+        :type slot: int
+        """
+        if self.layout.free_slot() is None:
+            raise ValueError(_('No free place for a new category'))
+        fields, category.fields = category.fields, Ledger()
+        category.fields.next_id = fields.next_id
+        self._place_category(category, slot)
+        for observer in self.observers:
+            observer.category_created(self, category)
+        category.add_fields(fields, row_ids=fields.ids)
+
+    def remove_category(self, category):
+        """
+        Delete a category, only its place in the grid is freed.
+
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        """
+        if self.categories.get(category.id) is not category:
+            return
+        del self.categories[category.id]
+        self.layout.remove(category.id)
+        for observer in self.observers:
+            observer.category_deleted(self, category)
+
+    def move_category(self, category, slot):
+        """
+        Move a category to a slot of the grid, swapping it with the category in the slot.
+
+        The observers are notified about the new slots of the both categories.
+
+        :param category: moved category
+        :type category: month_window.category_button.Category
+        :param slot: new slot
+        :type slot: int
+        :return: changed slots
+        :rtype: Tuple[int, int]
+        """
+        slots = self.layout.move(category.id, slot)
+        for changed in slots:
+            category_id = self.layout.slots[changed]
+            if category_id is None:
+                continue
+            for observer in self.observers:
+                observer.category_moved(self, self.categories[category_id])
+        return slots
+
+    def insert_field(self, category, index, values, row_id=None):
+        """
+        Insert a data field into the category.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the inserted field
+        :type index: int
+        :param values: field values by column name
+        :type values: Dict[str, float]
+        :param row_id: id of the field, a new id by default
+        :type row_id: int
+        """
+        category.insert_field(index, **values, row_id=row_id)
+
+    def delete_field(self, category, index):
+        """
+        Delete a data field from the category.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the deleted field
+        :type index: int
+        """
+        category.delete_field(index)
+
+    def change_field(self, category, index, values):
+        """
+        Change a data field of the category.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the changed field
+        :type index: int
+        :param values: new field values by column name
+        :type values: Dict[str, float]
+        """
+        category.change_field(index, **values)
+
+    def category_by_name(self, name):
+        """
+        Find a category by name.
+
+        :param name: category name
+        :type name: str
+        :return: found category or None
+        :rtype: month_window.category_button.Category
+        """
+        for category in self.categories.values():
+            if category.name == name:
+                return category
+        return None
+
+    def category_totals(self, first=None, last=None):
+        """
+        Get the expenses of the categories having data fields, optionally dated in a range.
+
+        :param first: first day number, unbounded if not set
+        :type first: int
+        :param last: last day number, inclusive, unbounded if not set
+        :type last: int
+        :return: sums of the amounts by category name
+        :rtype: Dict[str, float]
+        """
+        totals = {}
+        for category in self.categories.values():
+            if first is None and last is None:
+                amounts = [category.fields.total()] if len(category.fields) else []
+            else:
+                amounts = category.fields.group_totals('date', first, last).values()
+            if amounts:
+                totals[category.name] = totals.get(category.name, 0.) + sum(amounts)
+        return totals
+
+    def date_totals(self, first=None, last=None):
+        """
+        Get the expenses of all categories by date, optionally dated in a range.
+
+        :param first: first day number, unbounded if not set
+        :type first: int
+        :param last: last day number, inclusive, unbounded if not set
+        :type last: int
+        :return: sums of the amounts by date
+        :rtype: Dict[str, float]
+        """
+        totals = {}
+        for category in self.categories.values():
+            for date, amount in category.fields.group_totals('date', first, last).items():
+                totals[date] = totals.get(date, 0.) + amount
+        return totals
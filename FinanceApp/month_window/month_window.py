@@ -4,11 +4,14 @@ import tkinter.messagebox
 
 from tkinter import font
 
-from FinanceApp.month_window import Category, EntryWindow, CategoryWindow, InformationWindow
+from FinanceApp.month_window import EntryWindow, CategoryWindow, InformationWindow, MonthData
+from FinanceApp.month_window.history import (AddField, ChangeField, CreateCategory, DeleteCategory, DeleteField,
+                                             History)
 from FinanceApp.statistic_window import StatisticsWindow
+from FinanceApp.tracing import traced
 
 
-class MonthWindow(tk.Frame):
+class MonthWindow(tk.Frame, MonthData):
     """
     A month window containing entry, information and category widgets.
 
@@ -16,14 +19,22 @@ class MonthWindow(tk.Frame):
     :type master: tkinter.Frame
     :param grid_shape: category grid size
     :type grid_shape: Tuple[int, int]
+    :param month: month number
+    :type month: int
+    :param observers: objects notified about the data changes
+    :type observers: List[month_window.ledger.LedgerObserver]
+    :param history: log the changes made with the buttons are recorded to, a log of the month if not set
+    :type history: month_window.history.History
+    :param category_ids: ids of the category names shared by the months of a year, ids of the month if not set
+    :type category_ids: month_window.layout.CategoryIds
     """
 
-    def __init__(self, master, grid_shape=(6, 4)):
+    def __init__(self, master, grid_shape=(6, 4), month=None, observers=None, history=None, category_ids=None):
         """Create a month window of application."""
         super().__init__(master=master, relief='ridge', bg='#e2ddec', takefocus=1)
         self.font = font.Font(font=('Lucida Sans', 12, 'normal'))
-        self.grid_shape = grid_shape
-        self.categories = {}
+        MonthData.__init__(self, month=month, observers=observers, grid_shape=grid_shape, category_ids=category_ids)
+        self.history = history if history is not None else History()
         self.active_category = None
         self.control_frame = tk.Frame(self, relief='ridge', bg='#e2ddec', takefocus=1)
         self.category_frame = tk.Frame(self, relief='ridge', bg='#e2ddec', takefocus=1)
@@ -51,7 +62,7 @@ class MonthWindow(tk.Frame):
         self.information_window = InformationWindow(self.information_frame)
 
         create_button = self.category_window.create_button
-        create_button.widget.bind('<Button-1>', self._create_category)
+        create_button.widget.bind('<Button-1>', traced(self._create_category))
 
     def _set_active(self, button):
         """
@@ -63,14 +74,36 @@ class MonthWindow(tk.Frame):
         :rtype: function
         """
         def config(event):
-            if self.active_category:
-                self.category_window.buttons[self.active_category].set_active(active=False)
-            self.active_category = button.position
-            button.set_active()
-            self._information_window_bind(button.position)
-            self.information_window.update_list(self.categories[button.position].fields, delete_list=True)
+            category_id = self.layout.at(button.position)
+            if category_id is not None:
+                self.select_category(category_id)
         return config
 
+    def select_category(self, category_id):
+        """
+        Make the category active and show its data fields.
+
+        :param category_id: category id
+        :type category_id: int
+        """
+        if self.active_category in self.categories:
+            self._button(self.active_category).set_active(active=False)
+        self.active_category = category_id
+        self._button(category_id).set_active()
+        self._information_window_bind(category_id)
+        self.information_window.update_list(self.categories[category_id].fields, delete_list=True)
+
+    def _button(self, category_id):
+        """
+        Get the button showing a category.
+
+        :param category_id: category id
+        :type category_id: int
+        :return: category button
+        :rtype: month_window.category_button.CategoryButton
+        """
+        return self.category_window.buttons[self.layout.position(self.layout.slot(category_id))]
+
     def _draw_category_stats(self, button):
         """
         Draw active category statistics on double mouse1 click.
@@ -81,34 +114,53 @@ class MonthWindow(tk.Frame):
         :rtype: function
         """
         def draw_category(event):
-            self.category_window.buttons[button.position].widget.event_generate('<Button-1>')
-            self.active_category = button.position
-            StatisticsWindow(self.categories[self.active_category], data_type='category', master=self)
+            category_id = self.layout.at(button.position)
+            if category_id is None:
+                return
+            self.select_category(category_id)
+            StatisticsWindow(self.categories[category_id], data_type='category', master=self)
         return draw_category
 
-    def _information_window_bind(self, button_id):
+    def _drop_category(self, button):
+        """
+        Move the category to the button the mouse is released over.
+
+        :param button: button that was dragged
+        :type button: month_window.category_button.CategoryButton
+        :return: mouse release callback
+        :rtype: function
+        """
+        def drop(event):
+            category_id = self.layout.at(button.position)
+            position = self.category_window.position_of(self.winfo_containing(event.x_root, event.y_root))
+            if category_id is None or position is None or position == button.position:
+                return
+            self.move_category(self.categories[category_id], position[0] * self.grid_shape[1] + position[1])
+        return drop
+
+    def _information_window_bind(self, category_id):
         """
         Bind the information window buttons to a category.
 
-        :param button_id: category button id
-        :type button_id: Tuple[int, int]
+        :param category_id: category id
+        :type category_id: int
         """
-        self.information_window.bind('add', '<Button-1>', self._update_category(button_id))
-        self.information_window.bind('remove', '<Button-1>', self._remove_category_field(button_id))
-        self.information_window.bind('change', '<Button-1>', self._change_category_field(button_id))
-        self.information_window.bind('delete', '<Button-1>', self._delete_category)
+        self.information_window.bind('add', '<Button-1>', traced(self._update_category(category_id)))
+        self.information_window.bind('remove', '<Button-1>', traced(self._remove_category_field(category_id)))
+        self.information_window.bind('change', '<Button-1>', traced(self._change_category_field(category_id)))
+        self.information_window.bind('delete', '<Button-1>', traced(self._delete_category))
 
     def _information_window_unbind(self):
         """Unbind the information window buttons."""
         for name in ('add', 'remove', 'change', 'delete'):
             self.information_window.unbind(name, '<Button-1>')
 
-    def _change_category_field(self, button_id):
+    def _change_category_field(self, category_id):
         """
         Change the category field using the button.
 
-        :param button_id: category button id to change
-        :type button_id: Tuple[int, int]
+        :param category_id: id of the category to change
+        :type category_id: int
         :return: mouse click callback
         :rtype: function
         """
@@ -123,17 +175,18 @@ class MonthWindow(tk.Frame):
             if index is None:
                 tk.messagebox.showwarning('Error', 'Field not selected', parent=self)
             else:
-                category = self.categories[button_id]
-                category.change_field(index, **text)
-                self.information_window.change_index_field(index, category.fields[index])
+                category = self.categories[category_id]
+                old = category.fields.get_row(index)
+                self.change_field(category, index, text)
+                self.history.record(ChangeField(self, category, index, old))
         return change
 
-    def _remove_category_field(self, button_id):
+    def _remove_category_field(self, category_id):
         """
         Remove the category field using the button.
 
-        :param button_id: category button id to remove the field
-        :type button_id: Tuple[int, int]
+        :param category_id: id of the category to remove the field
+        :type category_id: int
         :return: mouse click callback
         :rtype: function
         """
@@ -143,17 +196,18 @@ class MonthWindow(tk.Frame):
             if index is None:
                 tk.messagebox.showwarning('Error', 'Field not selected', parent=self)
             else:
-                category = self.categories[button_id]
-                category.delete_field(index)
-                self.information_window.update_list(category.fields, delete_list=True)
+                category = self.categories[category_id]
+                row_id, values = category.fields.ids[index], category.fields.get_row(index)
+                self.delete_field(category, index)
+                self.history.record(DeleteField(self, category, index, row_id, values))
         return remove
 
-    def _update_category(self, button_id):
+    def _update_category(self, category_id):
         """
         Update the category field using the button.
 
-        :param button_id: category button id to update
-        :type button_id: Tuple[int, int]
+        :param category_id: id of the category to update
+        :type category_id: int
         :return: mouse click callback
         :rtype: function
         """
@@ -164,10 +218,67 @@ class MonthWindow(tk.Frame):
                     self.control_window.validate_error(name, message=f'Invalid {name} field')
                     return
                 text[name] = self.control_window.validate_success(name)
-            self.categories[button_id].add_field(**text)
-            self.information_window.update_list(text)
+            category = self.categories[category_id]
+            self.insert_field(category, len(category.fields), text)
+            self.history.record(AddField(self, category, len(category.fields) - 1))
         return update
 
+    def _is_shown(self, category):
+        """
+        Check if the data fields of the category are shown in the list.
+
+        :param category: category
+        :type category: month_window.category_button.Category
+        :return: the category is active
+        :rtype: bool
+        """
+        return self.categories.get(self.active_category) is category
+
+    def insert_field(self, category, index, values, row_id=None):
+        """
+        Insert a data field into the category and into the list if the category is shown.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the inserted field
+        :type index: int
+        :param values: field values by column name
+        :type values: Dict[str, float]
+        :param row_id: id of the field, a new id by default
+        :type row_id: int
+        """
+        super().insert_field(category, index, values, row_id=row_id)
+        if self._is_shown(category):
+            self.information_window.insert_index_field(index)
+
+    def delete_field(self, category, index):
+        """
+        Delete a data field from the category and from the list if the category is shown.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the deleted field
+        :type index: int
+        """
+        super().delete_field(category, index)
+        if self._is_shown(category):
+            self.information_window.remove_index_field(index)
+
+    def change_field(self, category, index, values):
+        """
+        Change a data field of the category and of the list if the category is shown.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the changed field
+        :type index: int
+        :param values: new field values by column name
+        :type values: Dict[str, float]
+        """
+        super().change_field(category, index, values)
+        if self._is_shown(category):
+            self.information_window.change_index_field(index, category.fields[index])
+
     def _create_category(self, event):
         """
         Create the category field using the button.
@@ -179,21 +290,100 @@ class MonthWindow(tk.Frame):
             self.control_window.validate_error('category', message='Invalid category name')
             return
         text = self.control_window.validate_success('category')
-        last_pos = self.category_window.last_pos
-        category = Category(last_pos, text)
-        self.categories[last_pos] = category
-        self.category_window.show_category(text)
-        self.category_window.bind(last_pos, '<Button-1>', self._set_active)
-        self.category_window.bind(last_pos, '<Double-Button-1>', self._draw_category_stats)
-        self.control_window.set_state('normal')
-        self.information_window.set_state('normal')
-        self._information_window_bind(last_pos)
-        self.information_window.update_list([], delete_list=True)
-        self.category_window.buttons[last_pos].widget.event_generate('<Button-1>')
-        self.active_category = last_pos
+        category = self.create_category(text)
+        self.history.record(CreateCategory(self, category))
+        self.select_category(category.id)
         self.update_idletasks()
         self.update()
 
+    def create_category(self, name):
+        """
+        Create a category at the first free place of the grid.
+
+        :param name: category name
+        :type name: str
+        :return: created category
+        :rtype: month_window.category_button.Category
+        """
+        category = self.add_category(name)
+        for observer in self.observers:
+            observer.category_created(self, category)
+        if self.active_category not in self.categories:
+            self.select_category(category.id)
+        return category
+
+    def refresh_list(self):
+        """Show the data fields of the active category again."""
+        if self.active_category in self.categories:
+            self.information_window.update_list(self.categories[self.active_category].fields)
+
+    def restore_category(self, category, slot=None):
+        """
+        Put a deleted category back to the grid with its data fields and select it.
+
+        The observers are notified about the category creation and about the addition of its fields.
+
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        :param slot: slot the category had, the first free slot is taken if it is not set or not free
+        :type slot: int
+        """
+        super().restore_category(category, slot)
+        self.select_category(category.id)
+
+    def _place_category(self, category, slot=None):
+        """
+        Show a category in the grid without notifying the observers.
+
+        :param category: category
+        :type category: month_window.category_button.Category
+        :param slot: preferred slot of the grid, the first free slot if not set or not free
+        :type slot: int
+        :return: placed category
+        :rtype: month_window.category_button.Category
+        """
+        super()._place_category(category, slot)
+        position = self.layout.position(self.layout.slot(category.id))
+        self.category_window.show_category(position, category.name)
+        self.category_window.bind(position, '<Button-1>', self._set_active)
+        self.category_window.bind(position, '<Double-Button-1>', self._draw_category_stats)
+        self.category_window.bind(position, '<ButtonRelease-1>', self._drop_category)
+        self._place_create_button()
+        self.control_window.set_state('normal')
+        self.information_window.set_state('normal')
+        return category
+
+    def _place_create_button(self):
+        """Show the create button at the first free place of the grid."""
+        slot = self.layout.free_slot()
+        self.category_window.place_create_button(self.layout.position(slot) if slot is not None else None)
+
+    def move_category(self, category, slot):
+        """
+        Move a category to a slot of the grid, only the buttons of the two slots change.
+
+        :param category: moved category
+        :type category: month_window.category_button.Category
+        :param slot: new slot
+        :type slot: int
+        :return: changed slots
+        :rtype: Tuple[int, int]
+        """
+        slots = super().move_category(category, slot)
+        for changed in slots:
+            position = self.layout.position(changed)
+            category_id = self.layout.slots[changed]
+            if category_id is None:
+                self.category_window.hide_category(position)
+                continue
+            self.category_window.show_category(position, self.categories[category_id].name)
+            self.category_window.bind(position, '<Button-1>', self._set_active)
+            self.category_window.bind(position, '<Double-Button-1>', self._draw_category_stats)
+            self.category_window.bind(position, '<ButtonRelease-1>', self._drop_category)
+            self.category_window.buttons[position].set_active(category_id == self.active_category)
+        self._place_create_button()
+        return slots
+
     def _delete_category(self, event):
         """
         Delete the category field using the button.
@@ -201,29 +391,32 @@ class MonthWindow(tk.Frame):
         :param event: mouse click event
         :type event: tkinter.Event
         """
-        if not self.active_category:
+        if self.active_category not in self.categories:
             return
-        del self.categories[self.active_category]
+        category = self.categories[self.active_category]
+        self.history.record(DeleteCategory(self, category))
+        self.remove_category(category)
+
+    def remove_category(self, category):
+        """
+        Delete a category, only its button is hidden and the first category is selected if it was active.
+
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        """
+        if self.categories.get(category.id) is not category:
+            return
+        position = self.layout.position(self.layout.slot(category.id))
+        super().remove_category(category)
+        self.category_window.hide_category(position)
+        self._place_create_button()
+        if self.active_category != category.id:
+            return
+        self.active_category = None
         self.information_window.update_list([], delete_list=True)
-        if len(self.categories):
-            self._information_window_bind((0, 0))
-            new_categories = {}
-            for button_id, category in self.categories.items():
-                if (button_id[0] >= self.active_category[0] and button_id[1] >= self.active_category[1]
-                        and (button_id[0] or button_id[1])):
-                    button_id = list(button_id)
-                    button_id[0] -= button_id[0] and not button_id[1]
-                    button_id[1] = (button_id[1] - 1) % self.grid_shape[1]
-                new_categories[tuple(button_id)] = category
-            self.categories = new_categories
+        if self.categories:
+            self.select_category(next(iter(self.layout)))
         else:
             self._information_window_unbind()
             self.control_window.set_state('disable')
             self.information_window.set_state('disable')
-        create_button_bind = self.category_window.delete_category(self.active_category)
-        if create_button_bind:
-            create_button = self.category_window.create_button
-            create_button.widget.bind('<Button-1>', self._create_category)
-        self.active_category = (0, 0)
-        if self.category_window.buttons[self.active_category].get_state() == 'normal':
-            self.category_window.buttons[self.active_category].widget.event_generate('<Button-1>')
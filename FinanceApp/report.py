@@ -0,0 +1,206 @@
+"""Headless statistics reports of ledger files."""
+import csv
+import gettext
+import os
+import sys
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from FinanceApp.month_window import MonthData
+from FinanceApp.statistic_window import BarChart, load_backend
+from FinanceApp.statistic_window.statistic_window import sorted_totals
+from FinanceApp.storage import JournalStorage, SQLiteStorage, YearFileStorage
+
+MONTHS = 12
+CHART_SIZE = (1200, 800)
+
+
+def install_translations():
+    """Install the translations of the texts of the reports, the worker processes start without them."""
+    localedir = gettext.find('Months')
+    localedir = localedir if localedir is not None else os.path.dirname(__file__)
+    gettext.install('Months', localedir, names=('ngettext', ))
+
+
+def open_storage(path):
+    """
+    Open a ledger file without changing it.
+
+    :param path: journal directory, year file with the '.year' extension or SQLite database
+    :type path: str
+    :return: storage
+    :rtype: storage.storage.Storage
+    """
+    if os.path.isdir(path):
+        return JournalStorage(path, read_only=True)
+    if not os.path.exists(path):
+        raise FileNotFoundError('ledger file not found')
+    if path.endswith('.year'):
+        return YearFileStorage(path, read_only=True)
+    return SQLiteStorage(path, read_only=True)
+
+
+def load_year(path):
+    """
+    Load all months of a ledger file.
+
+    :param path: ledger file path
+    :type path: str
+    :return: data of every month
+    :rtype: List[month_window.month_data.MonthData]
+    """
+    storage = open_storage(path)
+    try:
+        months = [MonthData(month) for month in range(MONTHS)]
+        for month in months:
+            storage.load_month(month)
+    finally:
+        storage.close()
+    return months
+
+
+def report_tables(months):
+    """
+    Compute the tables of the statistics window for the year and every month with data.
+
+    :param months: data of every month
+    :type months: List[month_window.month_data.MonthData]
+    :return: table name, grouping column, title and sums of the amounts by group of every table
+    :rtype: List[Tuple[str, str, str, Dict[str, float]]]
+    """
+    by_category, by_month = {}, {}
+    tables = []
+    for month in months:
+        category_totals = month.category_totals()
+        if not category_totals:
+            continue
+        for name, amount in category_totals.items():
+            by_category[name] = by_category.get(name, 0.) + amount
+            by_month[month.month + 1] = by_month.get(month.month + 1, 0.) + amount
+        tables.append((f'{month.month + 1:02}-category', 'category', _('Expenses by category'), category_totals))
+        tables.append((f'{month.month + 1:02}-date', 'date', _('Expenses by date'), month.date_totals()))
+    if by_category:
+        tables[:0] = [('year-category', 'category', _('Expenses by category'), by_category),
+                      ('year-month', 'month', _('Expenses by month'), by_month)]
+    return tables
+
+
+def report_name(path):
+    """
+    Get the name of the report subdirectory of a ledger file.
+
+    :param path: ledger file path
+    :type path: str
+    :return: ledger file name without the extension
+    :rtype: str
+    """
+    return os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+
+
+def write_report(path, directory, charts=True):
+    """
+    Write the statistics tables of a ledger file as CSV files and bar charts as PNG images.
+
+    The files are written to a subdirectory named after the ledger file.
+
+    :param path: ledger file path
+    :type path: str
+    :param directory: reports directory
+    :type directory: str
+    :param charts: draw the charts or not
+    :type charts: bool
+    :return: written file paths
+    :rtype: List[str]
+    """
+    months = load_year(path)
+    output = os.path.join(directory, report_name(path))
+    os.makedirs(output, exist_ok=True)
+    written = []
+    chart = None
+    for name, column, title, totals in report_tables(months):
+        keys, amounts = sorted_totals(column, totals)
+        table_path = os.path.join(output, f'{name}.csv')
+        with open(table_path, 'w', newline='', encoding='utf-8') as table:
+            writer = csv.writer(table)
+            writer.writerow((_(column), _('amount')))
+            writer.writerows(zip(keys, amounts))
+        written.append(table_path)
+        if charts:
+            if chart is None:
+                load_backend()
+                chart = BarChart()
+            chart.update(keys, amounts, xlabel=_(column), ylabel=_('amount'), title=title)
+            chart_path = os.path.join(output, f'{name}.png')
+            chart.render(CHART_SIZE).save(chart_path)
+            written.append(chart_path)
+    return written
+
+
+def write_reports(paths, directory, charts=True, jobs=None):
+    """
+    Write the reports of several ledger files in parallel processes.
+
+    Ledger files with the same report name are not reported, their reports would overwrite each other.
+
+    :param paths: ledger file paths
+    :type paths: Iterable[str]
+    :param directory: reports directory
+    :type directory: str
+    :param charts: draw the charts or not
+    :type charts: bool
+    :param jobs: number of processes, the number of processors by default
+    :type jobs: int
+    :return: written file paths or the error by ledger file path
+    :rtype: Dict[str, Union[List[str], Exception]]
+    """
+    results = {}
+    names = {}
+    for path in dict.fromkeys(paths):
+        names.setdefault(report_name(path), []).append(path)
+    for name, same in names.items():
+        if len(same) > 1:
+            for path in same:
+                results[path] = ValueError(f'the report {name!r} is shared by {", ".join(same)}')
+    with ProcessPoolExecutor(max_workers=jobs, initializer=install_translations) as executor:
+        futures = {executor.submit(write_report, same[0], directory, charts): same[0]
+                   for same in names.values() if len(same) == 1}
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as error:
+                results[futures[future]] = error
+    return results
+
+
+def add_arguments(parser):
+    """
+    Add the report command arguments.
+
+    :param parser: command parser
+    :type parser: argparse.ArgumentParser
+    """
+    parser.add_argument('ledgers', nargs='+', help='SQLite databases, journal directories or year files')
+    parser.add_argument('--output', default='reports', help='reports directory')
+    parser.add_argument('--jobs', type=int, help='number of parallel processes')
+    parser.add_argument('--no-charts', action='store_true', help='write the tables only')
+
+
+def run(args):
+    """
+    Run the report command.
+
+    :param args: parsed command arguments
+    :type args: argparse.Namespace
+    :return: exit status, 1 if a report failed, 0 otherwise
+    :rtype: int
+    """
+    results = write_reports(args.ledgers, args.output, charts=not args.no_charts, jobs=args.jobs)
+    status = 0
+    for path in args.ledgers:
+        result = results[path]
+        if isinstance(result, Exception):
+            print(f'{path}: {result}', file=sys.stderr)
+            status = 1
+        else:
+            print(f'{path}: {len(result)} files written')
+    return status
@@ -0,0 +1,358 @@
+"""Full-text search of the data fields by description and subcategory."""
+import bisect
+import re
+
+from collections import Counter, namedtuple
+
+from FinanceApp.month_window import LedgerObserver
+
+SearchResult = namedtuple('SearchResult', ('month', 'category', 'index'))
+
+INDEXED_COLUMNS = ('description', 'subcategory')
+TOKEN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """
+    Split a text into lowercase words.
+
+    :param text: text to split
+    :type text: str
+    :return: words of the text
+    :rtype: List[str]
+    """
+    return TOKEN.findall(str(text).casefold())
+
+
+def deletions(token):
+    """
+    Get the strings made by deleting one character of a token.
+
+    :param token: word
+    :type token: str
+    :return: token variants
+    :rtype: Set[str]
+    """
+    return {token[:index] + token[index + 1:] for index in range(len(token))}
+
+
+def edit_distance(first, second):
+    """
+    Get the edit distance of two strings.
+
+    Insertions, deletions and substitutions of characters and transpositions of adjacent characters are
+    counted as one edit.
+
+    :param first: first string
+    :type first: str
+    :param second: second string
+    :type second: str
+    :return: edit distance
+    :rtype: int
+    """
+    previous, current = None, list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        previous, before, current = current, previous, [i] + [0] * len(second)
+        for j in range(1, len(second) + 1):
+            cost = first[i - 1] != second[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[-1]
+
+
+class SearchIndex(LedgerObserver):
+    """
+    Inverted index of the words of the data field descriptions and subcategories.
+
+    Every word maps to the distinct values containing it, every value to the categories whose fields have it
+    and the codes of the value in the category ledger. Words are looked up by prefix in a sorted list and with
+    one typo in an index of the words with one character deleted. The rows of the found values are read from
+    the ledger codes at query time, so the index does not depend on the row positions.
+
+    The index is updated as an observer of the month data, months loaded from a storage are added with
+    :meth:`add_month`.
+    """
+
+    def __init__(self):
+        """Create an empty index."""
+        self.months = {}
+        self.values = {}
+        self.postings = {}
+        self.tokens = {}
+        self.sorted_tokens = []
+        self.variants = {}
+
+    def add_month(self, month_window):
+        """
+        Add the categories and data fields of a month.
+
+        :param month_window: month window with the loaded categories
+        :type month_window: month_window.month_window.MonthWindow
+        """
+        for category in month_window.categories.values():
+            self.category_created(month_window, category)
+
+    def category_created(self, month_window, category):
+        """
+        Add the category and its data fields.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: created category
+        :type category: month_window.category_button.Category
+        """
+        if category in self.months:
+            return
+        from FinanceApp import aggregation
+
+        self.months[category] = month_window.month
+        self.values[category] = {column: {} for column in INDEXED_COLUMNS}
+        arrays = category.fields.arrays()
+        for column in INDEXED_COLUMNS:
+            pool = category.fields.pools[column]
+            codes, _, counts = aggregation.code_sums(arrays[column], arrays['amount'])
+            for code, count in zip(codes.tolist(), counts.tolist()):
+                self._add(category, column, pool.decode(code), code, count)
+
+    def category_deleted(self, month_window, category):
+        """
+        Remove the category and its data fields.
+
+        :param month_window: month window which contained the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        """
+        if category not in self.months:
+            return
+        for column, values in self.values[category].items():
+            for value, (count, _) in list(values.items()):
+                self._add(category, column, value, None, -count)
+        del self.months[category], self.values[category]
+
+    def field_added(self, category, index):
+        """
+        Add the data field.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the added field
+        :type index: int
+        """
+        self.fields_added(category, index, index + 1)
+
+    def fields_added(self, category, start, stop):
+        """
+        Add several data fields.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param start: index of the first added field
+        :type start: int
+        :param stop: index after the last added field
+        :type stop: int
+        """
+        if category not in self.months:
+            return
+        for column in INDEXED_COLUMNS:
+            pool = category.fields.pools[column]
+            for code, count in Counter(category.fields.columns[column][start:stop]).items():
+                self._add(category, column, pool.decode(code), code, count)
+
+    def field_changed(self, category, index, old):
+        """
+        Move the data field to its new values.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the changed field
+        :type index: int
+        :param old: field values before the change
+        :type old: Dict[str, float]
+        """
+        if category not in self.months:
+            return
+        for column in INDEXED_COLUMNS:
+            value = category.fields.get_value(index, column)
+            if value != old[column]:
+                self._add(category, column, old[column], None, -1)
+                self._add(category, column, value, category.fields.columns[column][index], 1)
+
+    def field_deleted(self, category, index, row_id, old):
+        """
+        Remove the data field.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index the field had
+        :type index: int
+        :param row_id: id the field had
+        :type row_id: int
+        :param old: values of the deleted field
+        :type old: Dict[str, float]
+        """
+        if category not in self.months:
+            return
+        for column in INDEXED_COLUMNS:
+            self._add(category, column, old[column], None, -1)
+
+    def lookup(self, token, prefix=True, fuzzy=False):
+        """
+        Find the indexed words matching a word.
+
+        :param token: lowercase word
+        :type token: str
+        :param prefix: match the words starting with the word
+        :type prefix: bool
+        :param fuzzy: match the words differing from the word by one character
+        :type fuzzy: bool
+        :return: matching indexed words
+        :rtype: Set[str]
+        """
+        matches = {token} if token in self.tokens else set()
+        if prefix:
+            start = bisect.bisect_left(self.sorted_tokens, token)
+            stop = bisect.bisect_left(self.sorted_tokens, token + '\U0010ffff', start)
+            matches.update(self.sorted_tokens[start:stop])
+        if fuzzy:
+            for variant in deletions(token) | {token}:
+                for candidate in self.variants.get(variant, ()):
+                    if candidate not in matches and edit_distance(token, candidate) <= 1:
+                        matches.add(candidate)
+        return matches
+
+    def search(self, query, limit=100, fuzzy=False):
+        """
+        Find the data fields whose description or subcategory contains every word of the query.
+
+        Query words match the words starting with them, and with ``fuzzy`` also the words with one typo.
+
+        :param query: searched text
+        :type query: str
+        :param limit: maximum number of results
+        :type limit: int
+        :param fuzzy: match the words with typos
+        :type fuzzy: bool
+        :return: found fields ordered by month, category and index
+        :rtype: List[search_index.SearchResult]
+        """
+        values = None
+        for token in tokenize(query):
+            matches = set()
+            for match in self.lookup(token, fuzzy=fuzzy):
+                matches.update(self.tokens[match])
+            values = matches if values is None else values & matches
+            if not values:
+                return []
+        codes = {}
+        for value in values or ():
+            for category, column in self.postings[value]:
+                column_codes = codes.setdefault(category, {}).setdefault(column, set())
+                column_codes.update(self.values[category][column][value][1])
+        return self._rows(codes, limit)
+
+    def _rows(self, codes, limit):
+        """
+        Find the rows having the codes.
+
+        :param codes: codes by column name by category
+        :type codes: Dict[month_window.category_button.Category, Dict[str, Set[int]]]
+        :param limit: maximum number of results
+        :type limit: int
+        :return: found fields ordered by month, category and index
+        :rtype: List[search_index.SearchResult]
+        """
+        import numpy as np
+
+        results = []
+        for category in sorted(codes, key=lambda category: (self.months[category] or 0, category.id)):
+            arrays = category.fields.arrays()
+            found = np.zeros(len(category.fields), dtype=bool)
+            for column, column_codes in codes[category].items():
+                found |= np.isin(arrays[column], np.fromiter(column_codes, dtype=np.int64, count=len(column_codes)))
+            del arrays
+            month = self.months[category]
+            results.extend(SearchResult(month, category, index)
+                           for index in np.flatnonzero(found)[:limit - len(results)].tolist())
+            if len(results) >= limit:
+                break
+        return results
+
+    def _add(self, category, column, value, code, count):
+        """
+        Add fields having a value to the index or remove them.
+
+        :param category: category of the fields
+        :type category: month_window.category_button.Category
+        :param column: column of the value
+        :type column: str
+        :param value: decoded value
+        :type value: str
+        :param code: code of the value in the category ledger, None when removing
+        :type code: int
+        :param count: number of the added fields, negative to remove the fields
+        :type count: int
+        """
+        values = self.values[category][column]
+        entry = values.get(value)
+        if entry is None:
+            if count <= 0:
+                return
+            entry = values[value] = [0, set()]
+            self._add_posting(value, (category, column))
+        entry[0] += count
+        if code is not None:
+            entry[1].add(code)
+        if entry[0] <= 0:
+            del values[value]
+            self._remove_posting(value, (category, column))
+
+    def _add_posting(self, value, key):
+        """
+        Add a category column to the postings of a value, indexing the words of a new value.
+
+        :param value: decoded value
+        :type value: str
+        :param key: category and column name
+        :type key: Tuple[month_window.category_button.Category, str]
+        """
+        postings = self.postings.get(value)
+        if postings is None:
+            postings = self.postings[value] = set()
+            for token in set(tokenize(value)):
+                token_values = self.tokens.get(token)
+                if token_values is None:
+                    token_values = self.tokens[token] = set()
+                    bisect.insort(self.sorted_tokens, token)
+                    for variant in deletions(token) | {token}:
+                        self.variants.setdefault(variant, set()).add(token)
+                token_values.add(value)
+        postings.add(key)
+
+    def _remove_posting(self, value, key):
+        """
+        Remove a category column from the postings of a value, forgetting the words of an unused value.
+
+        :param value: decoded value
+        :type value: str
+        :param key: category and column name
+        :type key: Tuple[month_window.category_button.Category, str]
+        """
+        postings = self.postings[value]
+        postings.discard(key)
+        if postings:
+            return
+        del self.postings[value]
+        for token in set(tokenize(value)):
+            token_values = self.tokens[token]
+            token_values.discard(value)
+            if token_values:
+                continue
+            del self.tokens[token]
+            del self.sorted_tokens[bisect.bisect_left(self.sorted_tokens, token)]
+            for variant in deletions(token) | {token}:
+                variant_tokens = self.variants[variant]
+                variant_tokens.discard(token)
+                if not variant_tokens:
+                    del self.variants[variant]
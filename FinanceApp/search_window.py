@@ -0,0 +1,104 @@
+"""Window searching the data fields of all months."""
+import time
+import tkinter as tk
+
+from tkinter import font
+
+from FinanceApp.tracing import traced
+from FinanceApp.utils import config_widget
+
+SEARCH_DELAY = 150
+MAX_RESULTS = 200
+
+
+class SearchWindow(tk.Toplevel):
+    """
+    Search of the data fields by description and subcategory.
+
+    The search runs when the query has not changed for ``SEARCH_DELAY`` milliseconds. A double click on a
+    found field shows it in its month.
+
+    :param master: application
+    :type master: application.Application
+    """
+
+    def __init__(self, master):
+        """Create the search window and load all months to search."""
+        super().__init__(master=master)
+        self.title(_('Search'))
+        self.geometry('900x500')
+        self.configure(bg='#e2ddec')
+        self.font = font.Font(font=('Lucida Sans', 12, 'normal'))
+        self.results = []
+        self.pending = None
+        self.query = tk.StringVar(self)
+        self.fuzzy = tk.BooleanVar(self, value=False)
+        self._create_widgets()
+        master.load_data()
+        self.entry.focus_set()
+
+    def _create_widgets(self):
+        """Create the query, result list and status widgets."""
+        self.entry = tk.Entry(self, textvariable=self.query, font=self.font)
+        self.entry.grid(sticky=tk.EW, row=0, column=0, padx=5, pady=5)
+        self.entry.bind('<Return>', traced(self.search))
+        self.query.trace_add('write', lambda *args: self._schedule_search())
+        fuzzy_button = tk.Checkbutton(self, text=_('Allow typos'), variable=self.fuzzy, font=self.font,
+                                      bg='#e2ddec', command=self._schedule_search)
+        fuzzy_button.grid(row=0, column=1, columnspan=2, padx=5, pady=5)
+
+        self.listbox = tk.Listbox(self, font=self.font, activestyle='none')
+        self.listbox.grid(sticky=tk.NSEW, row=1, column=0, columnspan=2, padx=(5, 0))
+        self.listbox.bind('<Double-Button-1>', traced(self._show_selected))
+        self.listbox.bind('<Return>', traced(self._show_selected))
+        scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.listbox.yview)
+        scrollbar.grid(sticky=tk.NS, row=1, column=2, padx=(0, 5))
+        self.listbox.configure(yscrollcommand=scrollbar.set)
+        self.status = tk.Label(self, font=self.font, bg='#e2ddec', anchor='w')
+        self.status.grid(sticky=tk.EW, row=2, column=0, columnspan=3, padx=5, pady=5)
+
+        config_widget(self)
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure(0, weight=1)
+
+    def _schedule_search(self):
+        """Search after the query stops changing, replacing the search scheduled before."""
+        if self.pending is not None:
+            self.after_cancel(self.pending)
+        self.pending = self.after(SEARCH_DELAY, traced(self.search))
+
+    def search(self, event=None):
+        """
+        Search the fields matching the query and show them.
+
+        :param event: key press event
+        :type event: tkinter.Event
+        """
+        if self.pending is not None:
+            self.after_cancel(self.pending)
+            self.pending = None
+        start = time.perf_counter()
+        self.results = self.master.search_index.search(self.query.get(), limit=MAX_RESULTS, fuzzy=self.fuzzy.get())
+        milliseconds = (time.perf_counter() - start) * 1000
+        self.listbox.delete(0, tk.END)
+        for result in self.results:
+            field = result.category.fields.get_row(result.index)
+            self.listbox.insert(tk.END, ' | '.join((self.master.months_names[result.month], result.category.name,
+                                                    field['date'], str(field['amount']), field['description'],
+                                                    field['subcategory'])))
+        self.status.configure(text=ngettext('{} field found in {:.1f} ms', '{} fields found in {:.1f} ms',
+                                            len(self.results)).format(len(self.results), milliseconds))
+
+    def _show_selected(self, event):
+        """
+        Show the selected field in its month.
+
+        :param event: mouse click or key press event
+        :type event: tkinter.Event
+        """
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        result = self.results[selection[0]]
+        if result.index < len(result.category.fields):
+            self.master.show_field(result.month, result.category, result.index)
@@ -1,2 +1,3 @@
 """Statistic window package."""
-from .statistic_window import StatisticsWindow
+from .bar_chart import BarChart
+from .statistic_window import StatisticsWindow, load_backend, prewarm_backend
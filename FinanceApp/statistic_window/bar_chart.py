@@ -0,0 +1,117 @@
+"""Bar chart reusing its figure between draws."""
+import PIL.Image
+
+FIGURE_WIDTH = 12
+SATURATION = 0.75
+
+
+def figure_image(fig):
+    """
+    Get the pixels of a drawn figure.
+
+    The image is a view of the RGBA buffer of the Agg renderer obtained through the buffer protocol, it
+    changes when the figure is drawn again at the same size.
+
+    :param fig: drawn figure with an Agg canvas
+    :type fig: matplotlib.figure.Figure
+    :return: figure pixels
+    :rtype: PIL.Image.Image
+    """
+    return PIL.Image.frombuffer('RGBA', fig.canvas.get_width_height(), fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+
+
+class BarChart:
+    """
+    Bar chart keeping its figure, bars and value labels alive between draws.
+
+    Updating the chart changes only the bars whose key or value differ from the shown ones, bars are
+    added or removed when the number of groups changes. The bars are colored like seaborn bar plots.
+    A chart must not be used by several threads at once.
+    """
+
+    def __init__(self):
+        """Create an empty chart."""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.figure = Figure(figsize=(FIGURE_WIDTH, FIGURE_WIDTH * 2 / 3))
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.subplots()
+        self.ax.grid(alpha=0.35)
+        self.bars = []
+        self.labels = []
+        self.keys = []
+        self.values = []
+
+    def update(self, keys, values, xlabel='', ylabel='', title=None):
+        """
+        Show new data.
+
+        :param keys: bar keys
+        :type keys: Iterable
+        :param values: bar heights
+        :type values: Iterable[float]
+        :param xlabel: x axis label
+        :type xlabel: str
+        :param ylabel: y axis label
+        :type ylabel: str
+        :param title: chart title
+        :type title: str
+        """
+        keys, values = [str(key) for key in keys], [float(value) for value in values]
+        resized = len(keys) != len(self.bars)
+        while len(self.bars) > len(keys):
+            self.bars.pop().remove()
+            self.labels.pop().remove()
+        while len(self.bars) < len(keys):
+            position = len(self.bars)
+            self.bars.extend(self.ax.bar([position], [0.], width=0.8))
+            self.labels.append(self.ax.text(position, 0., '', ha='center'))
+        if resized:
+            self._color_bars()
+            self.ax.set_xlim(-0.5, len(keys) - 0.5)
+        if keys != self.keys:
+            self.ax.set_xticks(range(len(keys)))
+            self.ax.set_xticklabels(keys)
+        old_values = self.values + [None] * (len(values) - len(self.values))
+        for bar, label, value, old_value in zip(self.bars, self.labels, values, old_values):
+            if value != old_value:
+                bar.set_height(value)
+                label.set_y(value)
+                label.set_text('{:.2f}'.format(value))
+        if values != self.values:
+            self.ax.relim()
+            self.ax.autoscale_view()
+        self.keys, self.values = keys, values
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        self.ax.set_title(title or '', y=1.03)
+
+    def render(self, size):
+        """
+        Draw the chart to an image of the given size.
+
+        The figure keeps a fixed width in inches and the resolution follows the image width, so the
+        chart layout does not depend on the size. The pixels are copied once out of the renderer buffer,
+        which is reused by the next draw.
+
+        :param size: image width and height
+        :type size: Tuple[int, int]
+        :return: drawn chart
+        :rtype: PIL.Image.Image
+        """
+        dpi = size[0] / FIGURE_WIDTH
+        self.figure.set_dpi(dpi)
+        self.figure.set_size_inches(FIGURE_WIDTH, size[1] / dpi)
+        self.figure.canvas.draw()
+        return figure_image(self.figure).copy()
+
+    def _color_bars(self):
+        """Color the bars with the palette seaborn uses for the number of bars."""
+        import seaborn
+
+        palette = seaborn.color_palette()
+        if len(self.bars) > len(palette):
+            palette = seaborn.husl_palette(len(self.bars))
+        for bar, color in zip(self.bars, palette):
+            bar.set_facecolor(seaborn.desaturate(color, SATURATION))
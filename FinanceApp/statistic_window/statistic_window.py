@@ -1,16 +1,196 @@
 """Module for plotting expenses statistics."""
+import math
+import threading
 import tkinter as tk
-import pandas as pd
-import matplotlib
-import matplotlib.pyplot as plt
-import seaborn as sns
 import PIL
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from FinanceApp.month_window import UNKNOWN_DATE, date_ordinal
+from FinanceApp.statistic_window.bar_chart import BarChart
+from FinanceApp.tracing import TRACER, traced
 from FinanceApp.utils import config_widget
 from tkinter import font
-matplotlib.use('agg')
-sns.set(font='Times New Roman', font_scale=2)
-sns.set_style("ticks", {"xtick.major.size": 8, "ytick.major.size": 8})
+
+pd = sns = None
+_backend_lock = threading.Lock()
+
+RESIZE_DELAY = 150
+RENDER_CACHE_SIZE = 32
+RENDER_POLL = 30
+_renders = OrderedDict()
+_render_pool = None
+
+
+def load_backend():
+    """
+    Import and configure pandas, matplotlib and seaborn.
+
+    The libraries are loaded on the first call only, so starting the application does not pay for them.
+    The function is thread-safe and can be called in the background to prewarm the statistics.
+    """
+    global pd, sns
+    with _backend_lock:
+        if sns is not None:
+            return
+        import pandas
+        import matplotlib
+        matplotlib.use('agg')
+        import seaborn
+        seaborn.set(font='Times New Roman', font_scale=2)
+        seaborn.set_style("ticks", {"xtick.major.size": 8, "ytick.major.size": 8})
+        pd, sns = pandas, seaborn
+
+
+def sorted_totals(column, totals):
+    """
+    Sort the sums of the amounts by group for a plot.
+
+    Dates are sorted chronologically with the unknown dates shown last as 'unknown', months and years are sorted
+    as numbers and other groups as strings.
+
+    :param column: name of the grouping column
+    :type column: str
+    :param totals: sums of the amounts by group
+    :type totals: Dict[str, float]
+    :return: sorted groups and their sums
+    :rtype: Tuple[List, List[float]]
+    """
+    if column == 'date' and '' in totals:
+        totals = dict(totals)
+        unknown = totals.pop('')
+        totals['unknown'] = totals.get('unknown', 0.) + unknown
+    if column == 'date':
+        keys = sorted(totals, key=lambda date: (date_ordinal(date) or math.inf, str(date)))
+    else:
+        keys = sorted(totals, key=None if column in ('month', 'year') else str)
+    return keys, [totals[key] for key in keys]
+
+
+def draw_chart(data, x, y, title, size, chart=None):
+    """
+    Draw a bar chart to an image of the given size.
+
+    The chart is not registered in pyplot, so it can be drawn outside of the main thread.
+
+    :param data: table to plot
+    :type data: pandas.DataFrame
+    :param x: x axis column name in data
+    :type x: str
+    :param y: y axis column name in data
+    :type y: str
+    :param title: chart title
+    :type title: str
+    :param size: image width and height
+    :type size: Tuple[int, int]
+    :param chart: chart to update and draw, a new chart is used if not set
+    :type chart: statistic_window.bar_chart.BarChart
+    :return: drawn chart
+    :rtype: PIL.Image.Image
+    """
+    chart = chart if chart is not None else BarChart()
+    chart.update(data[x], data[y], xlabel=x, ylabel=y, title=title)
+    return chart.render(size)
+
+
+def cached_chart(data, x, y, title, size):
+    """
+    Get a chart rendered before.
+
+    Renders are cached by the plotted values and the size.
+
+    :param data: table to plot
+    :type data: pandas.DataFrame
+    :param x: x axis column name in data
+    :type x: str
+    :param y: y axis column name in data
+    :type y: str
+    :param title: chart title
+    :type title: str
+    :param size: image width and height
+    :type size: Tuple[int, int]
+    :return: rendered chart or None
+    :rtype: PIL.Image.Image
+    """
+    key = (x, y, title, tuple(data[x]), tuple(data[y]), size)
+    image = _renders.get(key)
+    if image is not None:
+        _renders.move_to_end(key)
+    return image
+
+
+def cache_chart(data, x, y, title, size, image):
+    """
+    Keep a rendered chart, evicting the least recently used renders.
+
+    :param data: table to plot
+    :type data: pandas.DataFrame
+    :param x: x axis column name in data
+    :type x: str
+    :param y: y axis column name in data
+    :type y: str
+    :param title: chart title
+    :type title: str
+    :param size: image width and height
+    :type size: Tuple[int, int]
+    :param image: rendered chart
+    :type image: PIL.Image.Image
+    """
+    _renders[(x, y, title, tuple(data[x]), tuple(data[y]), size)] = image
+    while len(_renders) > RENDER_CACHE_SIZE:
+        _renders.popitem(last=False)
+
+
+def render_chart(data, x, y, title, size):
+    """
+    Render a bar chart to an image of the given size, reusing the cached renders.
+
+    :param data: table to plot
+    :type data: pandas.DataFrame
+    :param x: x axis column name in data
+    :type x: str
+    :param y: y axis column name in data
+    :type y: str
+    :param title: chart title
+    :type title: str
+    :param size: image width and height
+    :type size: Tuple[int, int]
+    :return: rendered chart
+    :rtype: PIL.Image.Image
+    """
+    image = cached_chart(data, x, y, title, size)
+    if image is None:
+        image = draw_chart(data, x, y, title, size)
+        cache_chart(data, x, y, title, size, image)
+    return image
+
+
+def render_pool():
+    """
+    Get the pool drawing the charts in the background.
+
+    A single worker is used, so that charts are drawn one at a time.
+
+    :return: chart drawing pool
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chart')
+    return _render_pool
+
+
+def prewarm_backend():
+    """
+    Load the plotting libraries in a background thread.
+
+    :return: loading thread
+    :rtype: threading.Thread
+    """
+    thread = threading.Thread(target=load_backend, daemon=True)
+    thread.start()
+    return thread
 
 
 class StatisticsWindow(tk.Toplevel):
@@ -21,9 +201,10 @@ class StatisticsWindow(tk.Toplevel):
         Configure statistics window and draw basic plots.
 
         :param raw_data: data to plot
-        :param data_type: type of data. Supports 'month' or 'category'.
+        :param data_type: type of data. Supports 'month', 'category' or 'years' for the summaries of the years.
         :param master: master
         """
+        load_backend()
         super().__init__(master=master)
         self.title('Stats')
         self.geometry('1200x600')
@@ -33,11 +214,14 @@ class StatisticsWindow(tk.Toplevel):
         self.data_type = data_type
         self.is_valid = self.validate_data()
         self.plot_changed = False
+        self.year_shown = False
+        self.date_range = (None, None)
         self.widgets = {}
         self.titles = {
             'date': _('Expenses by date'),
             'category': _('Expenses by category'),
-            'month': _('Expenses by month')
+            'month': _('Expenses by month'),
+            'year': _('Expenses by year')
         }
         self._collect_data()
         if draw:
@@ -55,83 +239,120 @@ class StatisticsWindow(tk.Toplevel):
             self.widgets[idx] = {}
             widget = self.widgets[idx]
             widget['canvas'] = tk.Canvas(self, bd=0, highlightthickness=0, bg='#e2ddec')
-            widget['canvas'].bind('<Configure>', self.resize_plot(idx))
+            widget['canvas'].bind('<Configure>', traced(self.resize_plot(idx)))
             widget['canvas'].grid(sticky=tk.NSEW, row=0, column=idx, padx=5, pady=5)
             widget['widget_img'] = widget['canvas'].create_image(0, 0, anchor='nw')
+            widget['figure'] = BarChart()
+            widget['placeholder'] = widget['canvas'].create_text(0, 0, text=_('Rendering...'), font=self.font,
+                                                                 state='hidden')
             config_widget(self.widgets[idx]['canvas'])
 
+        if self.data_type != 'years':
+            self._create_buttons()
+        config_widget(self.buttons_frame)
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+
+    def _create_buttons(self):
+        """Create the buttons switching the statistics and filtering them by date."""
         if self.data_type == 'month':
             self.draw_year_button = tk.Button(master=self.buttons_frame, text=_('Show year statistics'), bg='#f0f4f9')
         else:
             self.draw_year_button = tk.Button(master=self.buttons_frame, text=_('Show month statistics'), bg='#f0f4f9')
         self.draw_year_button.grid(sticky=tk.NS, row=0, column=0, columnspan=2, padx=5, pady=5)
-        self.draw_year_button.configure(command=self.show_yearly_stats)
+        self.draw_year_button.configure(command=traced(self.show_yearly_stats))
 
-        config_widget(self.buttons_frame)
-        self.rowconfigure(0, weight=1)
-        self.columnconfigure(0, weight=1)
-        self.columnconfigure(1, weight=1)
+        self.date_entries = []
+        for idx, text in enumerate((_('From'), _('To'))):
+            label = tk.Label(master=self.buttons_frame, text=text, font=self.font, bg='#e2ddec')
+            label.grid(row=0, column=2 + 2 * idx, padx=5)
+            entry = tk.Entry(master=self.buttons_frame, width=12, font=self.font, relief='groove')
+            entry.grid(row=0, column=3 + 2 * idx, pady=5)
+            entry.bind('<Return>', traced(self.filter_by_date))
+            self.date_entries.append(entry)
+        self.filter_button = tk.Button(master=self.buttons_frame, text=_('Filter by date'), bg='#f0f4f9',
+                                       command=traced(self.filter_by_date))
+        self.filter_button.grid(sticky=tk.NS, row=0, column=6, padx=5, pady=5)
 
     def _draw(self):
         """Draw default statistics from data."""
         if not self.is_valid:
             return
         self.plot(0, self.data_by_category, x='category', y='amount', title=self.titles['category'])
-        self.plot(1, self.data_by_date, x='date', y='amount', title=self.titles['date'])
+        if self.data_type == 'years':
+            self.plot(1, self.data_by_year, x='year', y='amount', title=self.titles['year'])
+        else:
+            self.plot(1, self.data_by_date, x='date', y='amount', title=self.titles['date'])
 
     def _collect_data(self):
-        """Process gathered data for plot."""
+        """Build the plot tables from the running sums of the data fields."""
         columns = {
             'category': _('category'),
             'date': _('date'),
             'amount': _('amount'),
-            'month': _('month')
+            'month': _('month'),
+            'year': _('year')
         }
         self.columns = columns
         if not self.is_valid:
             return
         if self.data_type == 'month':
-            self.data = []
-            for category in self.raw_data.categories:
-                category_name = self.raw_data.categories[category].name
-                category_data = pd.DataFrame(self.raw_data.categories[category].fields)
-                category_data['category'] = category_name
-                self.data.append(category_data)
-            self.data = pd.concat(self.data, ignore_index=True)
-            self.data.rename(columns=columns, inplace=True)
-            self.data.replace({columns['date']: {'': 'unknown'}}, inplace=True)
-            self.data_by_category = self.data.groupby([columns['category']])[columns['amount']].sum().reset_index()
-            self.data_by_date = self.data.groupby([columns['date']])[columns['amount']].sum().reset_index()
+            self.data_by_category = self._table('category', self.raw_data.category_totals(*self.date_range))
+            self.data_by_date = self._table('date', self.raw_data.date_totals(*self.date_range))
         elif self.data_type == 'category':
-            self.data = pd.DataFrame(self.raw_data.fields)
-            self.data.rename(columns={'subcategory': 'category'}, inplace=True)
-            self.data.rename(columns=columns, inplace=True)
-            self.data.replace({'date': {'': 'unknown'}}, inplace=True)
-            self.data_by_category = self.data.groupby([columns['category']])[columns['amount']].sum().reset_index()
-            self.data_by_date = self.data.groupby([columns['date']])[columns['amount']].sum().reset_index()
+            fields = self.raw_data.fields
+            self.data_by_category = self._table('category', fields.group_totals('subcategory', *self.date_range))
+            self.data_by_date = self._table('date', fields.group_totals('date', *self.date_range))
+        elif self.data_type == 'years':
+            self.data_by_category = self._table('category', self.raw_data.totals('category'))
+            self.data_by_year = self._table('year', self.raw_data.totals('year'))
         else:
             raise AttributeError('unknown data type')
 
     def _collect_year_data(self):
-        """Collect yearly statistics."""
-        if self.data_type == 'category' or self.plot_changed:
+        """Collect yearly statistics from the year cube of the application."""
+        if self.data_type == 'category':
             return
         app = self.master
-        self.year_data = []
-        for month_id, month in app.months_groups.items():
-            month_name = month_id + 1
-            for category in month.categories:
-                category_name = month.categories[category].name
-                category_data = pd.DataFrame(month.categories[category].fields)
-                category_data['category'] = category_name
-                category_data['month'] = month_name
-                self.year_data.append(category_data)
-        self.year_data = pd.concat(self.year_data, ignore_index=True)
-        self.year_data.rename(columns=self.columns, inplace=True)
-        self.year_data.replace({self.columns['date']: {'': 'unknown'}}, inplace=True)
-        self.data_by_category = self.year_data.groupby([self.columns['category']])[
-            self.columns['amount']].sum().reset_index()
-        self.data_by_month = self.year_data.groupby([self.columns['month']])[self.columns['amount']].sum().reset_index()
+        app.load_data()
+        self.data_by_category = self._table('category', app.year_cube.totals('category'))
+        self.data_by_month = self._table('month', {month + 1: amount for month, amount in
+                                                   app.year_cube.totals('month').items()})
+
+    def _table(self, column, totals):
+        """
+        Create a plot table from the sums of the amounts.
+
+        :param column: name of the grouping column
+        :type column: str
+        :param totals: sums of the amounts by group
+        :type totals: Dict[str, float]
+        :return: table sorted by group
+        :rtype: pandas.DataFrame
+        """
+        keys, amounts = sorted_totals(column, totals)
+        return pd.DataFrame({self.columns[column]: keys, self.columns['amount']: amounts})
+
+    @property
+    def data(self):
+        """
+        Get the plotted data fields as a table.
+
+        The table is built from the data fields on every access, plots use the running sums instead.
+
+        :return: data fields with the category names, the expenses by year for the summaries of the years
+        :rtype: pandas.DataFrame
+        """
+        if self.data_type == 'years':
+            return self.data_by_year
+        if self.data_type == 'month':
+            data = pd.concat([pd.DataFrame(category.fields.decoded_arrays()).assign(category=category.name)
+                              for category in self.raw_data.categories.values()], ignore_index=True)
+        else:
+            data = pd.DataFrame(self.raw_data.fields.decoded_arrays()).rename(columns={'subcategory': 'category'})
+        data = data.rename(columns=self.columns)
+        return data.replace({self.columns['date']: {'': 'unknown'}})
 
     def _draw_by_category(self):
         """Draw barplot of expenses per category."""
@@ -145,6 +366,9 @@ class StatisticsWindow(tk.Toplevel):
         """
         Plot bars according to given data.
 
+        The chart of a canvas which is not shown yet is rendered by its first ``<Configure>`` event, at the
+        size the canvas gets.
+
         :param idx: canvas id for plot
         :param data: data to use for plot
         :type data: pandas.DataFrame
@@ -152,22 +376,95 @@ class StatisticsWindow(tk.Toplevel):
         :param y: y axis column name in data
         :param title: plot title
         """
-        fig, ax = plt.subplots(figsize=(12, 8))
-        sns.barplot(ax=ax, data=data, x=self.columns[x], y=self.columns[y])
-        self.show_values_on_bars(ax)
-        plt.grid(alpha=0.35)
-        if title:
-            plt.title(title, y=1.03)
-        fig.canvas.draw()
+        with TRACER.span('StatisticsWindow.plot'):
+            widget = self.widgets[idx]
+            widget['chart'] = (data, self.columns[x], self.columns[y], title)
+            widget['canvas'].itemconfig(widget['widget_img'], state='hidden')
+            size = self._canvas_size(idx)
+            if size is not None:
+                self._show_chart(idx, size)
+
+    def _canvas_size(self, idx):
+        """
+        Get the canvas size in pixels.
+
+        :param idx: canvas id
+        :return: canvas width and height, None if the canvas is not shown yet
+        :rtype: Tuple[int, int]
+        """
+        canvas = self.widgets[idx]['canvas']
+        width, height = canvas.winfo_width(), canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return None
+        return width, height
 
+    def _show_chart(self, idx, size):
+        """
+        Show the chart of the canvas rendered at the size.
+
+        A cached render is shown at once, otherwise the chart is drawn in the background and the
+        placeholder is shown over the hidden chart until the image arrives. A render started before
+        for the canvas is cancelled.
+
+        :param idx: canvas id
+        :param size: image width and height
+        :type size: Tuple[int, int]
+        """
+        widget = self.widgets[idx]
+        widget.pop('resize', None)
+        if 'chart' not in widget:
+            return
+        if 'render' in widget:
+            widget.pop('render').cancel()
+        image = cached_chart(*widget['chart'], size)
+        if image is not None:
+            self._set_image(idx, image)
+            return
+        canvas = widget['canvas']
+        if canvas.itemcget(widget['widget_img'], 'state') == 'hidden':
+            canvas.coords(widget['placeholder'], canvas.winfo_width() // 2, canvas.winfo_height() // 2)
+            canvas.itemconfig(widget['placeholder'], state='normal')
+        future = widget['render'] = render_pool().submit(draw_chart, *widget['chart'], size, widget['figure'])
+        self.after(RENDER_POLL, traced(self._deliver_chart), idx, future, widget['chart'], size)
+
+    def _deliver_chart(self, idx, future, chart, size):
+        """
+        Show the chart drawn in the background when it is ready.
+
+        Renders which have been replaced by a newer one are dropped.
+
+        :param idx: canvas id
+        :param future: chart drawing
+        :type future: concurrent.futures.Future
+        :param chart: plotted table, column names and title
+        :type chart: Tuple
+        :param size: image width and height
+        :type size: Tuple[int, int]
+        """
+        widget = self.widgets[idx]
+        if widget.get('render') is not future or not self.winfo_exists():
+            return
+        if not future.done():
+            self.after(RENDER_POLL, traced(self._deliver_chart), idx, future, chart, size)
+            return
+        del widget['render']
+        image = future.result()
+        cache_chart(*chart, size, image)
+        self._set_image(idx, image)
+
+    def _set_image(self, idx, image):
+        """
+        Show the rendered chart on the canvas.
+
+        :param idx: canvas id
+        :param image: rendered chart
+        :type image: PIL.Image.Image
+        """
         widget = self.widgets[idx]
-        image = PIL.Image.frombytes('RGB', fig.canvas.get_width_height(), fig.canvas.tostring_rgb())
         widget['img'] = image
-        if self.plot_changed:
-            image = widget['img'].resize((widget['tk_img'].width(), widget['tk_img'].height()))
         widget['tk_img'] = PIL.ImageTk.PhotoImage(image, master=self)
-        widget['canvas'].itemconfig(widget['widget_img'], image=widget['tk_img'])
-        plt.close()
+        widget['canvas'].itemconfig(widget['placeholder'], state='hidden')
+        widget['canvas'].itemconfig(widget['widget_img'], image=widget['tk_img'], state='normal')
 
     def _plot_year(self):
         """Plot yearly statistics."""
@@ -175,14 +472,20 @@ class StatisticsWindow(tk.Toplevel):
         self.plot(1, self.data_by_month, x='month', y='amount', title=self.titles['month'])
 
     def resize_plot(self, canvas_id):
-        """Resize callback for canvas widgets."""
+        """
+        Resize callback for canvas widgets.
+
+        A chart which is neither shown nor being rendered is rendered at once at the canvas size, a shown
+        chart is rendered again when the size has not changed for ``RESIZE_DELAY`` milliseconds.
+        """
 
         def _resize_image(event):
             widget = self.widgets[canvas_id]
             widget['canvas'].config(width=event.width, height=event.height)
-            image = widget['img'].resize((event.width, event.height))
-            widget['tk_img'] = PIL.ImageTk.PhotoImage(image)
-            widget['canvas'].itemconfig(widget['widget_img'], image=widget['tk_img'])
+            if 'resize' in widget:
+                self.after_cancel(widget['resize'])
+            delay = RESIZE_DELAY if 'img' in widget or 'render' in widget else 0
+            widget['resize'] = self.after(delay, traced(self._show_chart), canvas_id, (event.width, event.height))
 
         return _resize_image
 
@@ -193,6 +496,7 @@ class StatisticsWindow(tk.Toplevel):
         if self.data_type == 'month':
             self._collect_year_data()
             self.plot_changed = True
+            self.year_shown = True
             self._plot_year()
         else:
             self.data_type = 'month'
@@ -201,27 +505,61 @@ class StatisticsWindow(tk.Toplevel):
             self.plot_changed = True
             self._draw()
 
+    def set_date_range(self, first=None, last=None):
+        """
+        Plot only the expenses dated in a range, the expenses with unknown dates are left out.
+
+        All expenses are plotted when neither bound is set. The year statistics are not filtered.
+
+        :param first: first day number, unbounded if not set
+        :type first: int
+        :param last: last day number, inclusive, unbounded if not set
+        :type last: int
+        """
+        if first is None and last is None:
+            self.date_range = (None, None)
+        else:
+            self.date_range = (UNKNOWN_DATE + 1 if first is None else first, last)
+        if not self.year_shown:
+            self._collect_data()
+            self._draw()
+
+    def filter_by_date(self, event=None):
+        """
+        Plot the expenses of the dates entered in the filter entries.
+
+        :param event: key press event
+        :type event: tkinter.Event
+        """
+        bounds = []
+        for entry in self.date_entries:
+            text = entry.get().strip()
+            bounds.append(date_ordinal(text) if text else None)
+            if bounds[-1] == UNKNOWN_DATE:
+                tk.messagebox.showwarning('Error', 'Invalid date', parent=self)
+                return
+        self.set_date_range(*bounds)
+
+    def refresh(self):
+        """Collect the data again and redraw the shown plots."""
+        if self.year_shown:
+            self._collect_year_data()
+            self._plot_year()
+        else:
+            self._collect_data()
+            self._draw()
+
     def validate_data(self):
         """Validate input data."""
         if self.data_type == 'month':
             for category in self.raw_data.categories:
                 if len(self.raw_data.categories[category].fields) > 0:
                     return True
+        elif self.data_type == 'years':
+            if self.raw_data.totals('year'):
+                return True
         else:
             if len(self.raw_data.fields) > 0:
                 return True
         tk.messagebox.showwarning('Error', 'No data to plot')
         return False
-
-    @staticmethod
-    def show_values_on_bars(ax):
-        """
-        Add bar values as text on bars.
-
-        :param ax: Axes object.
-        """
-        for p in ax.patches:
-            _x = p.get_x() + p.get_width() / 2
-            _y = p.get_y() + p.get_height()
-            value = '{:.2f}'.format(p.get_height())
-            ax.text(_x, _y, value, ha="center")
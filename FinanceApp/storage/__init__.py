@@ -0,0 +1,5 @@
+"""Storage package."""
+from .storage import Storage
+from .sqlite_storage import SQLiteStorage
+from .journal_storage import JournalStorage
+from .year_file import YearFile, YearFileStorage, write_year_file
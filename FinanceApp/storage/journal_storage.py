@@ -0,0 +1,292 @@
+"""Append-only journal storage of the month data."""
+import bisect
+import glob
+import json
+import os
+import pickle
+import threading
+
+from FinanceApp.month_window import Ledger
+from FinanceApp.storage import Storage
+
+
+class JournalStorage(Storage):
+    """
+    Storage appending every change of the data to an operation log.
+
+    The log is split into numbered segments. Every ``snapshot_interval`` operations the current segment
+    is closed and the whole state is written as a binary snapshot of that segment number, then a
+    background thread removes the older segments and snapshots. Recovery loads the newest snapshot and
+    replays only the segments written after it. Saving a change costs one appended line regardless of
+    the ledger size.
+
+    The storage keeps the ledgers of all months; loaded categories share them with the month windows. The slots
+    of the categories in the grid are kept apart, the snapshots and logs written without them stay readable.
+
+    :param directory: directory of the log segments and snapshots
+    :type directory: str
+    :param snapshot_interval: number of operations between snapshots
+    :type snapshot_interval: int
+    :param read_only: only recover the state without opening a new log segment
+    :type read_only: bool
+    """
+
+    def __init__(self, directory, snapshot_interval=10000, read_only=False):
+        """Recover the state from the directory and open a new log segment."""
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_interval = snapshot_interval
+        self.categories = {}
+        self.slots = {}
+        self.next_category_id = 0
+        self.segment = 0
+        self.operations = 0
+        self.compaction = None
+        self.log = None
+        self._recover()
+        if not read_only:
+            self.segment += 1
+            self.log = open(self._segment_path(self.segment), 'a', encoding='utf-8')
+
+    def load_month(self, month_window):
+        """
+        Fill the month window with the categories of its month.
+
+        The categories are put into their logged slots, the categories logged without a slot take the free slots.
+
+        :param month_window: empty month window, its month number selects the data to load
+        :type month_window: month_window.month_window.MonthWindow
+        """
+        categories = [(storage_id, name, ledger) for storage_id, (month, name, ledger) in self.categories.items()
+                      if month == month_window.month]
+        categories.sort(key=lambda item: item[0] not in self.slots)
+        for storage_id, name, ledger in categories:
+            category = month_window.add_category(name, self.slots.get(storage_id))
+            category.storage_id = storage_id
+            category.fields = ledger
+
+    def category_created(self, month_window, category):
+        """
+        Log the category creation.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: created category
+        :type category: month_window.category_button.Category
+        """
+        category.storage_id = self.next_category_id
+        self.next_category_id += 1
+        self.categories[category.storage_id] = (month_window.month, category.name, category.fields)
+        self.slots[category.storage_id] = month_window.layout.slot(category.id)
+        self._append(['create', category.storage_id, month_window.month, category.name,
+                      self.slots[category.storage_id]])
+
+    def category_deleted(self, month_window, category):
+        """
+        Log the category deletion.
+
+        :param month_window: month window which contained the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        """
+        del self.categories[category.storage_id]
+        self.slots.pop(category.storage_id, None)
+        self._append(['delete', category.storage_id])
+
+    def category_moved(self, month_window, category):
+        """
+        Log the new slot of the category.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: moved category
+        :type category: month_window.category_button.Category
+        """
+        self.slots[category.storage_id] = month_window.layout.slot(category.id)
+        self._append(['move', category.storage_id, self.slots[category.storage_id]])
+
+    def field_added(self, category, index):
+        """
+        Log the data field addition.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the added field
+        :type index: int
+        """
+        field = category.fields[index]
+        self._append(['add', category.storage_id, category.fields.ids[index]] +
+                     [field[name] for name in Ledger.COLUMNS])
+
+    def field_changed(self, category, index, old):
+        """
+        Log the data field change.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the changed field
+        :type index: int
+        :param old: field values before the change
+        :type old: Dict[str, float]
+        """
+        field = category.fields[index]
+        self._append(['change', category.storage_id, category.fields.ids[index]] +
+                     [field[name] for name in Ledger.COLUMNS])
+
+    def field_deleted(self, category, index, row_id, old):
+        """
+        Log the data field deletion.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index the field had
+        :type index: int
+        :param row_id: id the field had
+        :type row_id: int
+        :param old: values of the deleted field
+        :type old: Dict[str, float]
+        """
+        self._append(['remove', category.storage_id, row_id])
+
+    def flush(self):
+        """Write the logged operations to the disk."""
+        if self.log is not None:
+            self.log.flush()
+            os.fsync(self.log.fileno())
+
+    def close(self):
+        """Flush the log and wait for the compaction to finish."""
+        self.flush()
+        if self.log is not None:
+            self.log.close()
+        if self.compaction is not None:
+            self.compaction.join()
+
+    def snapshot(self):
+        """
+        Write the state to a snapshot and start a new log segment.
+
+        Only the ledgers are copied in the calling thread, serializing and writing the snapshot and removing
+        the older files happens in the background.
+        """
+        categories = {storage_id: (month, name, ledger.copy())
+                      for storage_id, (month, name, ledger) in self.categories.items()}
+        state = (self.next_category_id, categories, dict(self.slots))
+        self.log.close()
+        snapshot_segment = self.segment
+        self.segment += 1
+        self.log = open(self._segment_path(self.segment), 'a', encoding='utf-8')
+        self.operations = 0
+        if self.compaction is not None:
+            self.compaction.join()
+        self.compaction = threading.Thread(target=self._compact, args=(snapshot_segment, state), daemon=True)
+        self.compaction.start()
+
+    def _append(self, operation):
+        """
+        Append the operation to the log.
+
+        :param operation: operation name and arguments
+        :type operation: List
+        """
+        self.log.write(json.dumps(operation, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.operations += 1
+        if self.operations >= self.snapshot_interval:
+            self.snapshot()
+
+    def _compact(self, segment, state):
+        """
+        Write the snapshot and remove the files it makes obsolete.
+
+        :param segment: number of the last segment included in the snapshot
+        :type segment: int
+        :param state: next category id, categories and slots, not shared with the calling thread
+        :type state: Tuple[int, Dict[int, Tuple[int, str, month_window.ledger.Ledger]], Dict[int, int]]
+        """
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        path = self._snapshot_path(segment)
+        with open(path + '.tmp', 'wb') as snapshot:
+            snapshot.write(data)
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(path + '.tmp', path)
+        for old_segment in self._numbers('journal-*.log'):
+            if old_segment <= segment:
+                os.remove(self._segment_path(old_segment))
+        for old_segment in self._numbers('snapshot-*.bin'):
+            if old_segment < segment:
+                os.remove(self._snapshot_path(old_segment))
+
+    def _recover(self):
+        """Load the newest snapshot and replay the log segments written after it."""
+        snapshots = self._numbers('snapshot-*.bin')
+        if snapshots:
+            self.segment = snapshots[-1]
+            with open(self._snapshot_path(self.segment), 'rb') as snapshot:
+                state = pickle.load(snapshot)
+            self.next_category_id, self.categories = state[:2]
+            self.slots = state[2] if len(state) > 2 else {}
+        for segment in self._numbers('journal-*.log'):
+            if segment > self.segment:
+                self._replay(segment)
+                self.segment = segment
+
+    def _replay(self, segment):
+        """
+        Apply the operations of the log segment to the state.
+
+        :param segment: log segment number
+        :type segment: int
+        """
+        with open(self._segment_path(segment), encoding='utf-8') as log:
+            for line in log:
+                try:
+                    operation = json.loads(line)
+                except ValueError:
+                    break
+                name, storage_id, *args = operation
+                if name == 'create':
+                    self.categories[storage_id] = (args[0], args[1], Ledger())
+                    if len(args) > 2:
+                        self.slots[storage_id] = args[2]
+                    self.next_category_id = max(self.next_category_id, storage_id + 1)
+                elif name == 'delete':
+                    del self.categories[storage_id]
+                    self.slots.pop(storage_id, None)
+                elif name == 'move':
+                    self.slots[storage_id] = args[0]
+                else:
+                    ledger = self.categories[storage_id][2]
+                    if name == 'add':
+                        ledger.insert(bisect.bisect_left(ledger.ids, args[0]), *args[1:], row_id=args[0])
+                    elif name == 'change':
+                        ledger.change(ledger.find(args[0]), **dict(zip(Ledger.COLUMNS, args[1:])))
+                    elif name == 'remove':
+                        del ledger[ledger.find(args[0])]
+
+    def _numbers(self, pattern):
+        """
+        Get the sorted numbers of the files matching the pattern.
+
+        :param pattern: file name pattern with a single wildcard for the number
+        :type pattern: str
+        :return: file numbers
+        :rtype: List[int]
+        """
+        prefix, suffix = pattern.split('*')
+        numbers = []
+        for path in glob.glob(os.path.join(self.directory, pattern)):
+            number = os.path.basename(path)[len(prefix):-len(suffix)]
+            if number.isdigit():
+                numbers.append(int(number))
+        return sorted(numbers)
+
+    def _segment_path(self, segment):
+        """Get the path of the log segment."""
+        return os.path.join(self.directory, f'journal-{segment}.log')
+
+    def _snapshot_path(self, segment):
+        """Get the path of the snapshot."""
+        return os.path.join(self.directory, f'snapshot-{segment}.bin')
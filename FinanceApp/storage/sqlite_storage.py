@@ -0,0 +1,228 @@
+"""SQLite storage of the month data."""
+import os
+import sqlite3
+
+from urllib.request import pathname2url
+
+from FinanceApp.storage import Storage
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY,
+    month INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    slot INTEGER
+);
+CREATE INDEX IF NOT EXISTS categories_month ON categories (month, id);
+CREATE TABLE IF NOT EXISTS fields (
+    month INTEGER NOT NULL,
+    category INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    date TEXT,
+    description TEXT,
+    subcategory TEXT,
+    PRIMARY KEY (month, category, row)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fields_month_category_date ON fields (month, category, date, amount);
+'''
+
+
+class SQLiteStorage(Storage):
+    """
+    Storage writing every change of the data through to a SQLite database.
+
+    The database works in WAL mode. Fields are clustered by month, so loading a month is a single range
+    scan, and the (month, category, date) index covers the amounts for aggregation. Changes are collected
+    in one transaction until :meth:`flush` is called or ``batch_size`` changes are pending, so a burst
+    of entries is committed with a single fsync.
+
+    :param path: database file path
+    :type path: str
+    :param batch_size: maximum number of changes in one transaction
+    :type batch_size: int
+    :param read_only: open an existing database without changing it, the tables are neither created nor upgraded
+    :type read_only: bool
+    """
+
+    def __init__(self, path, batch_size=1000, read_only=False):
+        """Open the database and create the tables."""
+        if read_only:
+            self.connection = sqlite3.connect(f'file:{pathname2url(os.path.abspath(path))}?mode=ro', uri=True)
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(path)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=FULL')
+            self.connection.executescript(SCHEMA)
+        self.slot_column = 'slot'
+        if 'slot' not in {column[1] for column in self.connection.execute('PRAGMA table_info(categories)')}:
+            if read_only:
+                self.slot_column = 'NULL'
+            else:
+                self.connection.execute('ALTER TABLE categories ADD COLUMN slot INTEGER')
+                self.connection.commit()
+        self.batch_size = batch_size
+        self.pending = 0
+        self.category_months = {}
+
+    def load_month(self, month_window):
+        """
+        Fill the month window with the stored categories and data fields.
+
+        The categories are put into their stored slots, the categories stored without a slot take the free slots.
+
+        :param month_window: empty month window, its month number selects the data to load
+        :type month_window: month_window.month_window.MonthWindow
+        """
+        month = month_window.month
+        categories = {}
+        for storage_id, name, slot in self.connection.execute(
+                f'SELECT id, name, {self.slot_column} FROM categories WHERE month = ? '
+                f'ORDER BY {self.slot_column} IS NULL, id', (month, )):
+            category = month_window.add_category(name, slot)
+            category.storage_id = storage_id
+            categories[storage_id] = category
+            self.category_months[storage_id] = month
+        for storage_id, row_id, amount, date, description, subcategory in self.connection.execute(
+                'SELECT category, row, amount, date, description, subcategory FROM fields WHERE month = ? '
+                'ORDER BY category, row', (month, )):
+            categories[storage_id].fields.append(amount, date, description, subcategory, row_id=row_id)
+
+    def category_created(self, month_window, category):
+        """
+        Insert the category.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: created category
+        :type category: month_window.category_button.Category
+        """
+        cursor = self.connection.execute('INSERT INTO categories (month, name, slot) VALUES (?, ?, ?)',
+                                         (month_window.month, category.name, month_window.layout.slot(category.id)))
+        category.storage_id = cursor.lastrowid
+        self.category_months[category.storage_id] = month_window.month
+        self._changed()
+
+    def category_deleted(self, month_window, category):
+        """
+        Delete the category with all its data fields.
+
+        :param month_window: month window which contained the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        """
+        month = self.category_months.pop(category.storage_id)
+        self.connection.execute('DELETE FROM fields WHERE month = ? AND category = ?', (month, category.storage_id))
+        self.connection.execute('DELETE FROM categories WHERE id = ?', (category.storage_id, ))
+        self._changed()
+
+    def category_moved(self, month_window, category):
+        """
+        Update the slot of the category.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: moved category
+        :type category: month_window.category_button.Category
+        """
+        self.connection.execute('UPDATE categories SET slot = ? WHERE id = ?',
+                                (month_window.layout.slot(category.id), category.storage_id))
+        self._changed()
+
+    def field_added(self, category, index):
+        """
+        Insert the data field.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the added field
+        :type index: int
+        """
+        field = category.fields[index]
+        self.connection.execute(
+            'INSERT INTO fields (month, category, row, amount, date, description, subcategory) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (self.category_months[category.storage_id], category.storage_id, category.fields.ids[index],
+             field['amount'], field['date'], field['description'], field['subcategory']))
+        self._changed()
+
+    def fields_added(self, category, start, stop):
+        """
+        Insert several data fields with one statement.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param start: index of the first added field
+        :type start: int
+        :param stop: index after the last added field
+        :type stop: int
+        """
+        month, fields = self.category_months[category.storage_id], category.fields
+        self.connection.executemany(
+            'INSERT INTO fields (month, category, row, amount, date, description, subcategory) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            ((month, category.storage_id, fields.ids[index], *fields.get_row(index).values())
+             for index in range(start, stop)))
+        self._changed(stop - start)
+
+    def field_changed(self, category, index, old):
+        """
+        Update the data field.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the changed field
+        :type index: int
+        :param old: field values before the change
+        :type old: Dict[str, float]
+        """
+        field = category.fields[index]
+        self.connection.execute(
+            'UPDATE fields SET amount = ?, date = ?, description = ?, subcategory = ? '
+            'WHERE month = ? AND category = ? AND row = ?',
+            (field['amount'], field['date'], field['description'], field['subcategory'],
+             self.category_months[category.storage_id], category.storage_id, category.fields.ids[index]))
+        self._changed()
+
+    def field_deleted(self, category, index, row_id, old):
+        """
+        Delete the data field.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index the field had
+        :type index: int
+        :param row_id: id the field had
+        :type row_id: int
+        :param old: values of the deleted field
+        :type old: Dict[str, float]
+        """
+        self.connection.execute('DELETE FROM fields WHERE month = ? AND category = ? AND row = ?',
+                                (self.category_months[category.storage_id], category.storage_id, row_id))
+        self._changed()
+
+    def flush(self):
+        """Commit the pending changes."""
+        if self.pending:
+            self.connection.commit()
+            self.pending = 0
+
+    def close(self):
+        """Commit the pending changes and close the database."""
+        self.flush()
+        self.connection.close()
+
+    def _changed(self, count=1):
+        """
+        Count the changes and commit the transaction when the batch is full.
+
+        :param count: number of changes
+        :type count: int
+        """
+        self.pending += count
+        if self.pending >= self.batch_size:
+            self.flush()
@@ -0,0 +1,25 @@
+"""Base class of the ledger storage engines."""
+from FinanceApp.month_window import LedgerObserver
+
+
+class Storage(LedgerObserver):
+    """
+    Persistent storage of the month data.
+
+    The storage is notified about every change of the data and loads the months on demand.
+    """
+
+    def load_month(self, month_window):
+        """
+        Fill the month window with the stored categories and data fields.
+
+        :param month_window: empty month window, its month number selects the data to load
+        :type month_window: month_window.month_window.MonthWindow
+        """
+
+    def flush(self):
+        """Make the pending changes persistent."""
+
+    def close(self):
+        """Flush the pending changes and release the storage resources."""
+        self.flush()
@@ -0,0 +1,427 @@
+"""Memory-mapped binary file with the data of a whole year."""
+import mmap
+import os
+import struct
+import time
+import weakref
+
+from FinanceApp.month_window import Ledger, StringPool
+from FinanceApp.storage import Storage
+
+MAGIC = b'FAYR'
+VERSION = 2
+SECTIONS = ('categories', 'amount', 'date', 'description', 'subcategory', 'ids', 'string_offsets', 'strings')
+HEADER = struct.Struct('<4sIIIQ' + 'Q' * len(SECTIONS))
+CATEGORY = struct.Struct('<IIQQQq')
+CATEGORY_V1 = struct.Struct('<IIQQQ')
+ALIGNMENT = 8
+FLUSH_INTERVAL = 60.
+
+
+class StringTable:
+    """
+    String table of a year file, decoded on demand.
+
+    Strings added after the file has been written are kept in memory and get the codes following the
+    codes of the file, the strings of the file keep their codes.
+
+    :param offsets: buffer with the string offsets, one more than the number of strings
+    :type offsets: memoryview
+    :param data: buffer with the UTF-8 encoded strings
+    :type data: memoryview
+    """
+
+    def __init__(self, offsets, data):
+        """Create a string table over the buffers."""
+        self.offsets = offsets.cast('Q')
+        self.data = data
+        self.count = len(self.offsets) - 1
+        self.cache = {}
+        self.codes = None
+        self.added = StringPool()
+
+    def __len__(self):
+        """Get the number of strings."""
+        return self.count + len(self.added)
+
+    def decode(self, code):
+        """
+        Get the string by its code.
+
+        :param code: string code
+        :type code: int
+        :return: string
+        :rtype: str
+        """
+        code = int(code)
+        if code >= self.count:
+            return self.added.decode(code - self.count)
+        value = self.cache.get(code)
+        if value is None:
+            value = self.cache[code] = str(self.data[self.offsets[code]:self.offsets[code + 1]], 'utf-8')
+        return value
+
+    def encode(self, value):
+        """
+        Get the code of a string, adding it after the strings of the file if necessary.
+
+        The codes of the file strings are looked up in a dictionary built on the first call.
+
+        :param value: string to encode
+        :type value: str
+        :return: string code
+        :rtype: int
+        """
+        if self.codes is None:
+            self.codes = {}
+            for code in range(self.count):
+                self.codes.setdefault(self.decode(code), code)
+        code = self.codes.get(value)
+        if code is not None:
+            return code
+        return self.count + self.added.encode(value)
+
+    def detach(self):
+        """Copy the viewed buffers, so that the table no longer depends on the mapped file."""
+        if isinstance(self.data, memoryview):
+            self.offsets, self.data = self.offsets.tolist(), bytes(self.data)
+
+
+class YearFile:
+    """
+    Reader of a year file.
+
+    The file starts with a header of section offsets, followed by the category table with the month, name,
+    rows and grid slot of every category, the amount, date, description, subcategory and row id columns of
+    all categories and the string table. Columns have the :attr:`month_window.ledger.Ledger.TYPECODES`
+    formats, the encoded ones contain string table codes. Version 1 files without the slots are still
+    read. Opening the file reads only the header and the category table, the columns are attached to
+    the ledgers as slices of the mapped file. The ledgers viewing the file are kept, so that they can be
+    detached before the file is unmapped.
+
+    :param path: year file path
+    :type path: str
+    """
+
+    def __init__(self, path):
+        """Map the file and read the category table."""
+        self.path = path
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self.map)
+        magic, version, category_count, string_count, self.rows, *offsets = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f'{path} is not a year file')
+        self.offsets = dict(zip(SECTIONS, offsets))
+        self.strings = StringTable(self.buffer[self.offsets['string_offsets']:self.offsets['strings']],
+                                   self.buffer[self.offsets['strings']:])
+        entry = CATEGORY if version == VERSION else CATEGORY_V1
+        self.categories = [entry.unpack_from(self.buffer, self.offsets['categories'] + index * entry.size)
+                           for index in range(category_count)]
+        if version == 1:
+            self.categories = [category + (-1, ) for category in self.categories]
+        self.ledgers = weakref.WeakSet()
+
+    def ledger(self, start, count, next_id):
+        """
+        Create a ledger viewing the rows of the file.
+
+        :param start: index of the first row
+        :type start: int
+        :param count: number of rows
+        :type count: int
+        :param next_id: next free row id
+        :type next_id: int
+        :return: ledger
+        :rtype: month_window.ledger.Ledger
+        """
+        columns = {}
+        for name, typecode in list(Ledger.TYPECODES.items()) + [('ids', 'q')]:
+            size = struct.calcsize(typecode)
+            offset = self.offsets[name] + start * size
+            columns[name] = self.buffer[offset:offset + count * size]
+        ids = columns.pop('ids')
+        ledger = Ledger.from_buffers(columns, ids, {name: self.strings for name in Ledger.ENCODED_COLUMNS}, next_id)
+        self.ledgers.add(ledger)
+        return ledger
+
+    def attach(self, ledger, index):
+        """
+        Make a ledger view the rows of a category of the file again.
+
+        The ledger must use a string table with the same codes as the table of the file, its running sums
+        and date index stay valid.
+
+        :param ledger: ledger with the rows of the category
+        :type ledger: month_window.ledger.Ledger
+        :param index: index of the category in the category table
+        :type index: int
+        """
+        month, name, start, count, next_id, slot = self.categories[index]
+        mapped = self.ledger(start, count, next_id)
+        ledger.columns, ledger.ids, ledger.pools, ledger.mapped = mapped.columns, mapped.ids, mapped.pools, True
+        self.ledgers.add(ledger)
+
+    def close(self):
+        """
+        Detach the ledgers and the string table from the file and unmap it.
+
+        :raises BufferError: if the file is still viewed, e.g. by the arrays of a ledger got before it was detached
+        """
+        for ledger in list(self.ledgers):
+            ledger.detach()
+        self.strings.detach()
+        try:
+            self.buffer.release()
+            self.map.close()
+        except BufferError as error:
+            raise BufferError(f'{self.path} cannot be unmapped while its data is viewed') from error
+
+
+def write_year_file(path, categories, base=None):
+    """
+    Write a year file.
+
+    :param path: year file path
+    :type path: str
+    :param categories: month number, name, ledger and grid slot of every category, the slot can be None
+    :type categories: Iterable[Tuple[int, str, month_window.ledger.Ledger, int]]
+    :param base: string table whose strings keep their codes, the ledgers using it are written without recoding
+    :type base: storage.year_file.StringTable
+    """
+    import numpy as np
+
+    strings = StringPool()
+    if base is not None:
+        strings.values = [base.decode(code) for code in range(len(base))]
+        for code, value in enumerate(strings.values):
+            strings.codes.setdefault(value, code)
+    table = []
+    columns = {name: [] for name in Ledger.COLUMNS}
+    columns['ids'] = []
+    rows = 0
+    for month, name, ledger, slot in categories:
+        table.append(CATEGORY.pack(month, strings.encode(name), rows, len(ledger), ledger.next_id,
+                                   slot if slot is not None else -1))
+        rows += len(ledger)
+        arrays = ledger.arrays()
+        for column, pool in ledger.pools.items():
+            if base is not None and pool is base:
+                continue
+            codes, inverse = np.unique(arrays[column], return_inverse=True)
+            recoded = np.array([strings.encode(str(pool.decode(code))) for code in codes], dtype=arrays[column].dtype)
+            arrays[column] = recoded[inverse.reshape(-1)]
+        for column in Ledger.COLUMNS:
+            columns[column].append(arrays[column].tobytes())
+        columns['ids'].append(bytes(ledger.ids))
+
+    encoded = [value.encode('utf-8') for value in strings.values]
+    string_offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(value) for value in encoded], out=string_offsets[1:])
+    sections = {
+        'categories': [b''.join(table)],
+        'string_offsets': [string_offsets.tobytes()],
+        'strings': encoded,
+        **columns
+    }
+
+    with open(path, 'wb') as file:
+        file.write(bytes(HEADER.size))
+        offsets = []
+        for section in SECTIONS:
+            file.write(bytes(-file.tell() % ALIGNMENT))
+            offsets.append(file.tell())
+            for chunk in sections[section]:
+                file.write(chunk)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, len(table), len(encoded), rows, *offsets))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+class YearFileStorage(Storage):
+    """
+    Storage of the year data in a memory-mapped year file.
+
+    Loading a month attaches the ledgers of its categories to the mapped columns without copying or
+    decoding them. The changes are kept in memory, the file is rewritten by :meth:`flush` at most once per
+    ``flush_interval`` seconds and when the storage is closed. The file is unmapped before it is replaced,
+    then the ledgers of the file view the new file; the written strings keep their codes, so the ledgers
+    and the indexes built on the codes stay valid.
+
+    :param path: year file path
+    :type path: str
+    :param read_only: keep the year file unchanged
+    :type read_only: bool
+    :param flush_interval: minimum interval in seconds between the writes of the file by :meth:`flush`
+    :type flush_interval: float
+    """
+
+    def __init__(self, path, read_only=False, flush_interval=FLUSH_INTERVAL):
+        """Open the year file if it exists."""
+        directory = os.path.dirname(path)
+        if directory and not read_only:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.read_only = read_only
+        self.flush_interval = flush_interval
+        self.changed = False
+        self.write_time = time.monotonic()
+        self.year_file = None
+        self.categories = {}
+        self.slots = {}
+        if os.path.exists(path):
+            self.year_file = YearFile(path)
+            for storage_id, (month, name, start, count, next_id, slot) in enumerate(self.year_file.categories):
+                self.categories[storage_id] = (month, self.year_file.strings.decode(name),
+                                               self.year_file.ledger(start, count, next_id))
+                if slot >= 0:
+                    self.slots[storage_id] = slot
+        self.next_category_id = len(self.categories)
+
+    def load_month(self, month_window):
+        """
+        Attach the month window categories to the mapped data.
+
+        The categories are put into their stored slots, the categories stored without a slot take the free slots.
+
+        :param month_window: empty month window, its month number selects the data to load
+        :type month_window: month_window.month_window.MonthWindow
+        """
+        categories = [(storage_id, name, ledger) for storage_id, (month, name, ledger) in self.categories.items()
+                      if month == month_window.month]
+        categories.sort(key=lambda item: item[0] not in self.slots)
+        for storage_id, name, ledger in categories:
+            category = month_window.add_category(name, self.slots.get(storage_id))
+            category.storage_id = storage_id
+            category.fields = ledger
+
+    def category_created(self, month_window, category):
+        """
+        Keep the created category.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: created category
+        :type category: month_window.category_button.Category
+        """
+        category.storage_id = self.next_category_id
+        self.next_category_id += 1
+        self.categories[category.storage_id] = (month_window.month, category.name, category.fields)
+        self.slots[category.storage_id] = month_window.layout.slot(category.id)
+        self.changed = True
+
+    def category_deleted(self, month_window, category):
+        """
+        Forget the deleted category.
+
+        :param month_window: month window which contained the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        """
+        del self.categories[category.storage_id]
+        self.slots.pop(category.storage_id, None)
+        self.changed = True
+
+    def category_moved(self, month_window, category):
+        """
+        Keep the new slot of the category.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: moved category
+        :type category: month_window.category_button.Category
+        """
+        self.slots[category.storage_id] = month_window.layout.slot(category.id)
+        self.changed = True
+
+    def field_added(self, category, index):
+        """
+        Mark the data as changed.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the added field
+        :type index: int
+        """
+        self.changed = True
+
+    def fields_added(self, category, start, stop):
+        """
+        Mark the data as changed.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param start: index of the first added field
+        :type start: int
+        :param stop: index after the last added field
+        :type stop: int
+        """
+        self.changed = True
+
+    def field_changed(self, category, index, old):
+        """
+        Mark the data as changed.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the changed field
+        :type index: int
+        :param old: field values before the change
+        :type old: Dict[str, float]
+        """
+        self.changed = True
+
+    def field_deleted(self, category, index, row_id, old):
+        """
+        Mark the data as changed.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index the field had
+        :type index: int
+        :param row_id: id the field had
+        :type row_id: int
+        :param old: values of the deleted field
+        :type old: Dict[str, float]
+        """
+        self.changed = True
+
+    def flush(self):
+        """Rewrite the year file if the data has changed and the flush interval has passed."""
+        if self.changed and time.monotonic() - self.write_time >= self.flush_interval:
+            self._write()
+
+    def close(self):
+        """Rewrite the year file if the data has changed."""
+        if self.changed:
+            self._write(remap=False)
+        self.year_file = None
+
+    def _write(self, remap=True):
+        """
+        Rewrite the year file through a temporary file.
+
+        :param remap: map the written file and attach the ledgers of its categories
+        :type remap: bool
+        :raises BufferError: if the old file cannot be unmapped, it is not replaced then
+        """
+        if self.read_only:
+            return
+        categories = sorted(((month, name, ledger, self.slots.get(storage_id))
+                             for storage_id, (month, name, ledger) in self.categories.items()),
+                            key=lambda category: category[0])
+        base = self.year_file.strings if self.year_file is not None else None
+        write_year_file(self.path + '.tmp', categories, base)
+        if self.year_file is not None:
+            self.year_file.close()
+            self.year_file = None
+        os.replace(self.path + '.tmp', self.path)
+        self.changed = False
+        self.write_time = time.monotonic()
+        if remap and base is not None:
+            self.year_file = YearFile(self.path)
+            for index, (month, name, ledger, slot) in enumerate(categories):
+                if ledger.pools.get(Ledger.ENCODED_COLUMNS[0]) is base:
+                    self.year_file.attach(ledger, index)
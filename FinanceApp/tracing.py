@@ -0,0 +1,164 @@
+"""Timing spans of the Tk callbacks and a watchdog of the callbacks blocking the event loop."""
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+SLOW_CALLBACK = 100
+MAX_EVENTS = 100000
+
+
+class Tracer:
+    """
+    Recorder of timing spans in the Chrome trace event format.
+
+    Tracing is off until :meth:`start` is called, callbacks wrapped by :func:`traced` before are not
+    timed. While tracing, a watchdog thread samples the stack of every callback running longer than the
+    threshold, and the callback is logged as a warning with the sample when it returns. Only the latest
+    ``max_events`` spans are kept.
+
+    :param max_events: maximum number of kept spans
+    :type max_events: int
+    """
+
+    def __init__(self, max_events=MAX_EVENTS):
+        """Create a stopped tracer."""
+        self.enabled = False
+        self.threshold = SLOW_CALLBACK
+        self.events = deque(maxlen=max_events)
+        self.threads = {}
+        self.active = {}
+        self.origin = time.perf_counter_ns()
+        self._stopped = threading.Event()
+        self._watchdog = None
+
+    def start(self, threshold=SLOW_CALLBACK):
+        """
+        Start recording the spans and watching the slow callbacks.
+
+        :param threshold: duration in milliseconds above which a callback is logged
+        :type threshold: float
+        """
+        self.threshold = threshold
+        self.enabled = True
+        self._stopped.clear()
+        self._watchdog = threading.Thread(target=self._watch, name='tracing watchdog', daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        """Stop recording the spans, the recorded spans are kept."""
+        self.enabled = False
+        self._stopped.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    def span(self, name):
+        """
+        Time a block of code.
+
+        :param name: span name
+        :type name: str
+        :return: context manager recording the span, doing nothing if tracing is off
+        :rtype: ContextManager
+        """
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._span(name)
+
+    @contextlib.contextmanager
+    def _span(self, name):
+        """
+        Record a span, the outermost span of a thread is watched by the watchdog.
+
+        :param name: span name
+        :type name: str
+        """
+        thread_id = threading.get_ident()
+        if thread_id not in self.threads:
+            self.threads[thread_id] = threading.current_thread().name
+        watched = thread_id not in self.active
+        start = time.perf_counter_ns()
+        if watched:
+            self.active[thread_id] = [name, start, None]
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {'name': name, 'cat': 'callback', 'ph': 'X', 'ts': (start - self.origin) / 1000,
+                     'dur': (end - start) / 1000, 'pid': os.getpid(), 'tid': thread_id}
+            if watched:
+                stack = self.active.pop(thread_id)[2]
+                duration = (end - start) / 10 ** 6
+                if duration > self.threshold:
+                    event['args'] = {'stack': stack}
+                    logger.warning('%s blocked the event loop for %.1f ms\n%s', name, duration,
+                                   stack or 'no stack sample\n')
+            self.events.append(event)
+
+    def _watch(self):
+        """Sample the stacks of the callbacks running longer than the threshold until stopped."""
+        while not self._stopped.wait(self.threshold / 2000):
+            now = time.perf_counter_ns()
+            frames = None
+            for thread_id, span in list(self.active.items()):
+                if span[2] is None and (now - span[1]) / 10 ** 6 > self.threshold:
+                    frames = frames if frames is not None else sys._current_frames()
+                    if thread_id in frames:
+                        span[2] = ''.join(traceback.format_stack(frames[thread_id]))
+
+    def trace(self):
+        """
+        Get the recorded spans as a trace.
+
+        :return: trace in the Chrome trace event format
+        :rtype: Dict
+        """
+        names = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': thread_id, 'args': {'name': name}}
+                 for thread_id, name in self.threads.items()]
+        return {'traceEvents': names + list(self.events), 'displayTimeUnit': 'ms'}
+
+    def export(self, path):
+        """
+        Write the recorded spans to a file which can be opened in chrome://tracing or Perfetto.
+
+        :param path: trace file path
+        :type path: str
+        """
+        with open(path, 'w', encoding='utf-8') as trace:
+            json.dump(self.trace(), trace)
+
+
+TRACER = Tracer()
+
+
+def traced(callback, name=None):
+    """
+    Wrap a callback in a timing span of the global tracer when tracing is on.
+
+    :param callback: callback function
+    :type callback: Callable
+    :param name: span name, the qualified name of the function defining the callback by default
+    :type name: str
+    :return: wrapped callback, the callback itself if tracing is off
+    :rtype: Callable
+    """
+    if not TRACER.enabled:
+        return callback
+    if name is None:
+        name = getattr(callback, '__qualname__', repr(callback)).split('.<locals>')[0]
+
+    @functools.wraps(callback)
+    def wrapper(*args, **kwargs):
+        with TRACER.span(name):
+            return callback(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,240 @@
+"""Expenses of a year summed by month, category and day."""
+from array import array
+
+from FinanceApp.month_window import LedgerObserver, parse_date
+
+MONTHS = 12
+DAYS = 32
+AXES = ('month', 'category', 'day')
+
+
+def day_of(date):
+    """
+    Get the day of month of a date.
+
+    :param date: date text
+    :type date: str
+    :return: day of month, 0 if the date is unknown
+    :rtype: int
+    """
+    date = parse_date(date)
+    return date.day if date is not None else 0
+
+
+class YearCube(LedgerObserver):
+    """
+    Dense cube of the year expenses indexed by month, category and day of month.
+
+    Every cell keeps the sum of the amounts and the number of the data fields, so a cell is empty when
+    its last field is deleted. The categories are joined on their ids, so the categories of different months
+    with the same id share a row of cells, the names only label the results. Months are numbered from 0 like
+    the month windows, day 0 holds the fields with unknown dates. The cube is updated as an observer of the
+    month data, months loaded from a storage are added with :meth:`add_month`.
+
+    The cells are kept in typed arrays with the category as the outermost axis, so that a new category
+    only appends cells. Queries slice and reduce NumPy views of the arrays.
+    """
+
+    def __init__(self):
+        """Create an empty cube."""
+        self.names = []
+        self.rows = {}
+        self.sums = array('d')
+        self.counts = array('q')
+        self.categories = {}
+
+    def category_row(self, category):
+        """
+        Get the row of the category id, adding a row to the cube if necessary.
+
+        :param category: category
+        :type category: month_window.category_button.Category
+        :return: row number
+        :rtype: int
+        """
+        row = self.rows.get(category.id)
+        if row is None:
+            row = self.rows[category.id] = len(self.names)
+            self.names.append(category.name)
+            self.sums.extend([0.] * (MONTHS * DAYS))
+            self.counts.extend([0] * (MONTHS * DAYS))
+        return row
+
+    def add_month(self, month_window):
+        """
+        Add the categories and data fields of a month.
+
+        :param month_window: month window with the loaded categories
+        :type month_window: month_window.month_window.MonthWindow
+        """
+        for category in month_window.categories.values():
+            self.category_created(month_window, category)
+
+    def category_created(self, month_window, category):
+        """
+        Add the category and its data fields.
+
+        :param month_window: month window containing the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: created category
+        :type category: month_window.category_button.Category
+        """
+        if month_window.month is None or category in self.categories:
+            return
+        self.categories[category] = (month_window.month, self.category_row(category))
+        self._add_category(category, 1)
+
+    def category_deleted(self, month_window, category):
+        """
+        Remove the data fields of the category.
+
+        :param month_window: month window which contained the category
+        :type month_window: month_window.month_window.MonthWindow
+        :param category: deleted category
+        :type category: month_window.category_button.Category
+        """
+        if category in self.categories:
+            self._add_category(category, -1)
+            del self.categories[category]
+
+    def field_added(self, category, index):
+        """
+        Add the data field.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the added field
+        :type index: int
+        """
+        self._add(category, category.fields.get_value(index, 'amount'), category.fields.get_value(index, 'date'))
+
+    def field_changed(self, category, index, old):
+        """
+        Move the data field to its new cell.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index of the changed field
+        :type index: int
+        :param old: field values before the change
+        :type old: Dict[str, float]
+        """
+        self._add(category, old['amount'], old['date'], -1)
+        self.field_added(category, index)
+
+    def field_deleted(self, category, index, row_id, old):
+        """
+        Remove the data field.
+
+        :param category: changed category
+        :type category: month_window.category_button.Category
+        :param index: index the field had
+        :type index: int
+        :param row_id: id the field had
+        :type row_id: int
+        :param old: values of the deleted field
+        :type old: Dict[str, float]
+        """
+        self._add(category, old['amount'], old['date'], -1)
+
+    def cube(self):
+        """
+        Get the cube as NumPy arrays without copying.
+
+        The arrays share memory with the cube, which cannot get new categories while they are alive.
+
+        :return: sums and numbers of the data fields indexed by month, category row and day
+        :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+        """
+        import numpy as np
+
+        shape = (len(self.names), MONTHS, DAYS)
+        return (np.frombuffer(self.sums, dtype=np.float64).reshape(shape).transpose(1, 0, 2),
+                np.frombuffer(self.counts, dtype=np.int64).reshape(shape).transpose(1, 0, 2))
+
+    def totals(self, axis, month=None, category=None, day=None):
+        """
+        Get the expenses along an axis of the cube, optionally sliced by the other axes.
+
+        :param axis: grouping axis, 'month', 'category' or 'day'
+        :type axis: str
+        :param month: month number, all months if not set
+        :type month: int
+        :param category: category name, all categories if not set
+        :type category: str
+        :param day: day of month, all days if not set
+        :type day: int
+        :return: sums of the amounts by month number, category name or day, for the groups having data fields
+        :rtype: Dict[str, float]
+        """
+        fixed = {'month': month, 'day': day}
+        selection = [slice(None) if fixed.get(name) is None else slice(fixed[name], fixed[name] + 1) for name in AXES]
+        rows = range(len(self.names))
+        if category is not None:
+            rows = [row for row, name in enumerate(self.names) if name == category]
+            if not rows:
+                return {}
+            selection[1] = rows
+        other = tuple(index for index, name in enumerate(AXES) if name != axis)
+        sums, counts = self.cube()
+        sums, counts = sums[tuple(selection)].sum(axis=other), counts[tuple(selection)].sum(axis=other)
+        if axis == 'category':
+            keys = [self.names[row] for row in rows]
+        else:
+            start = selection[AXES.index(axis)].start or 0
+            keys = range(start, start + len(sums))
+        totals = {}
+        for key, amount, count in zip(keys, sums.tolist(), counts.tolist()):
+            if count:
+                totals[key] = totals.get(key, 0.) + amount
+        return totals
+
+    def total(self, month=None, category=None, day=None):
+        """
+        Get the expenses of a slice of the cube.
+
+        :param month: month number, all months if not set
+        :type month: int
+        :param category: category name, all categories if not set
+        :type category: str
+        :param day: day of month, all days if not set
+        :type day: int
+        :return: sum of the amounts
+        :rtype: float
+        """
+        return sum(self.totals('month', month=month, category=category, day=day).values())
+
+    def _add_category(self, category, sign):
+        """
+        Add all data fields of the category to the cube or subtract them.
+
+        :param category: category of the cube
+        :type category: month_window.category_button.Category
+        :param sign: 1 to add the fields, -1 to subtract them
+        :type sign: int
+        """
+        totals = category.fields.group_totals('date')
+        for date, count in category.fields.group_counts('date').items():
+            self._add(category, totals[date], date, sign, count)
+
+    def _add(self, category, amount, date, sign=1, count=1):
+        """
+        Add data fields to the cell of their category and date or subtract them.
+
+        :param category: category of the fields
+        :type category: month_window.category_button.Category
+        :param amount: sum of the amounts
+        :type amount: float
+        :param date: date of the fields
+        :type date: str
+        :param sign: 1 to add the fields, -1 to subtract them
+        :type sign: int
+        :param count: number of the fields
+        :type count: int
+        """
+        if category not in self.categories:
+            return
+        month, row = self.categories[category]
+        cell = (row * MONTHS + month) * DAYS + day_of(date)
+        self.counts[cell] += sign * count
+        self.sums[cell] = self.sums[cell] + sign * amount if self.counts[cell] else 0.
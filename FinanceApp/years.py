@@ -0,0 +1,287 @@
+"""Years of the ledger kept as separate partitions loaded on demand."""
+import json
+import os
+
+from collections import OrderedDict
+
+from FinanceApp.month_window import CategoryIds, History, MonthData
+from FinanceApp.search_index import SearchIndex
+from FinanceApp.year_cube import MONTHS, YearCube
+
+MAX_YEARS = 3
+
+
+def year_path(path, year):
+    """
+    Get the path of the ledger file of a year.
+
+    :param path: ledger file path given for all years
+    :type path: str
+    :param year: year
+    :type year: int
+    :return: path with the year added before the extension
+    :rtype: str
+    """
+    root, extension = os.path.splitext(path.rstrip(os.sep))
+    return f'{root}-{year}{extension}'
+
+
+class YearSummaries:
+    """
+    Expenses of every year summed by month and category.
+
+    The summaries are small enough to be kept for all years, so the years can be compared without loading
+    their data fields. They are saved to a JSON file if a path is given.
+
+    :param path: summaries file path, the summaries are kept in memory only if not set
+    :type path: str
+    """
+
+    def __init__(self, path=None):
+        """Read the summaries file if it exists."""
+        self.path = path
+        self.years = {}
+        if path is not None and os.path.exists(path):
+            with open(path, encoding='utf-8') as summaries:
+                for year, months in json.load(summaries).items():
+                    self.years[int(year)] = {int(month): totals for month, totals in months.items()}
+
+    def __contains__(self, year):
+        """Check if the year has a summary."""
+        return year in self.years
+
+    def get(self, year):
+        """
+        Get the summary of a year.
+
+        :param year: year
+        :type year: int
+        :return: sums of the amounts by category name by month number, None if the year has no summary
+        :rtype: Dict[int, Dict[str, float]]
+        """
+        return self.years.get(year)
+
+    def update(self, year, summary):
+        """
+        Replace the summary of a year.
+
+        :param year: year
+        :type year: int
+        :param summary: sums of the amounts by category name by month number
+        :type summary: Dict[int, Dict[str, float]]
+        """
+        self.years[year] = summary
+
+    def totals(self, axis):
+        """
+        Get the expenses of all years along an axis.
+
+        :param axis: grouping axis, 'year', 'month' or 'category'
+        :type axis: str
+        :return: sums of the amounts by year, month number or category name
+        :rtype: Dict[str, float]
+        """
+        totals = {}
+        for year, months in self.years.items():
+            for month, categories in months.items():
+                for name, amount in categories.items():
+                    key = {'year': year, 'month': month, 'category': name}[axis]
+                    totals[key] = totals.get(key, 0.) + amount
+        return totals
+
+    def save(self):
+        """Write the summaries file."""
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as summaries:
+            json.dump({year: months for year, months in sorted(self.years.items())}, summaries)
+        os.replace(self.path + '.tmp', self.path)
+
+
+class YearPartition:
+    """
+    Data of one year: its storage, category ids, year cube, search index, month windows and log of the changes.
+
+    :param year: year
+    :type year: int
+    :param storage: storage of the year, the data is kept in memory only if not set
+    :type storage: storage.storage.Storage
+    """
+
+    def __init__(self, year, storage=None):
+        """Create a partition without loaded months."""
+        self.year = year
+        self.storage = storage
+        self.category_ids = CategoryIds()
+        self.year_cube = YearCube()
+        self.search_index = SearchIndex()
+        self.observers = ([storage] if storage is not None else []) + [self.year_cube, self.search_index]
+        self.months_groups = {}
+        self.months_data = {}
+        self.loaded_months = set()
+        self.history = History()
+
+    def load_data(self, month):
+        """
+        Load a month from the storage without widgets and add it to the year cube and the search index.
+
+        The loaded categories wait in ``months_data`` until the month window of the month takes them over,
+        so the month is never read from the storage twice.
+
+        :param month: month number
+        :type month: int
+        """
+        if self.storage is None or month in self.loaded_months:
+            return
+        month_data = MonthData(month, observers=self.observers, category_ids=self.category_ids)
+        self.storage.load_month(month_data)
+        self.loaded_months.add(month)
+        self.months_data[month] = month_data
+        self.year_cube.add_month(month_data)
+        self.search_index.add_month(month_data)
+
+    def summary(self, previous=None):
+        """
+        Sum the expenses of the year by month and category.
+
+        Loaded months are summed from the year cube. Months which have not been loaded cannot have changed,
+        so they are taken from the previous summary, or loaded from the storage without widgets if there is none.
+
+        :param previous: previous summary of the year
+        :type previous: Dict[int, Dict[str, float]]
+        :return: sums of the amounts by category name by month number
+        :rtype: Dict[int, Dict[str, float]]
+        """
+        sums, counts = self.year_cube.cube()
+        sums, counts = sums.sum(axis=2).tolist(), counts.sum(axis=2).tolist()
+        summary = {}
+        for month in range(MONTHS):
+            if month in self.loaded_months or self.storage is None:
+                totals = {}
+                for name, amount, count in zip(self.year_cube.names, sums[month], counts[month]):
+                    if count:
+                        totals[name] = totals.get(name, 0.) + amount
+            elif previous is not None:
+                totals = previous.get(month, {})
+            else:
+                month_data = MonthData(month)
+                self.storage.load_month(month_data)
+                totals = month_data.category_totals()
+            if totals:
+                summary[month] = totals
+        return summary
+
+    def destroy(self):
+        """Destroy the month windows of the year and forget its changes."""
+        for month_window in self.months_groups.values():
+            month_window.destroy()
+        self.months_groups.clear()
+        self.months_data.clear()
+        self.loaded_months.clear()
+        self.history.clear()
+
+    def close(self):
+        """Flush the pending changes and release the storage of the year."""
+        if self.storage is not None:
+            self.storage.close()
+
+
+class YearPartitions:
+    """
+    Least recently used cache of the year partitions.
+
+    A partition is opened when its year is selected. When more than ``max_years`` years are open, the least
+    recently used year is summarized, its month windows are destroyed and its storage is closed; it is loaded
+    again from the storage when selected. Without ``open_storage`` the years are kept in memory only and are
+    never evicted.
+
+    :param open_storage: function opening the storage of a year
+    :type open_storage: Callable[[int], storage.storage.Storage]
+    :param max_years: maximum number of open years
+    :type max_years: int
+    :param summaries: summaries of the years, kept in memory if not set
+    :type summaries: years.YearSummaries
+    """
+
+    def __init__(self, open_storage=None, max_years=MAX_YEARS, summaries=None):
+        """Create a cache without open years."""
+        self.open_storage = open_storage
+        self.max_years = max_years
+        self.summaries = summaries if summaries is not None else YearSummaries()
+        self.partitions = OrderedDict()
+
+    def __contains__(self, year):
+        """Check if the year is open."""
+        return year in self.partitions
+
+    def add(self, partition):
+        """
+        Add an open year, it becomes the most recently used one.
+
+        :param partition: year partition
+        :type partition: years.YearPartition
+        """
+        self.partitions[partition.year] = partition
+        self.partitions.move_to_end(partition.year)
+        self._evict()
+
+    def get(self, year):
+        """
+        Get the partition of a year, opening it if necessary.
+
+        :param year: year
+        :type year: int
+        :return: year partition
+        :rtype: years.YearPartition
+        """
+        partition = self.partitions.get(year)
+        if partition is not None:
+            self.partitions.move_to_end(year)
+            return partition
+        storage = self.open_storage(year) if self.open_storage is not None else None
+        partition = YearPartition(year, storage)
+        self.add(partition)
+        return partition
+
+    def summarize(self, year=None):
+        """
+        Update the summaries of the open years.
+
+        :param year: year to summarize, all open years if not set
+        :type year: int
+        :return: summaries of all years
+        :rtype: years.YearSummaries
+        """
+        for partition in self.partitions.values() if year is None else [self.partitions[year]]:
+            self.summaries.update(partition.year, partition.summary(self.summaries.get(partition.year)))
+        return self.summaries
+
+    def flush(self):
+        """Make the pending changes of all open years persistent."""
+        for partition in self.partitions.values():
+            if partition.storage is not None:
+                partition.storage.flush()
+
+    def close(self):
+        """Summarize the open years, save the summaries and close the storages."""
+        try:
+            self.summarize()
+            self.summaries.save()
+        finally:
+            for partition in self.partitions.values():
+                partition.close()
+            self.partitions.clear()
+
+    def _evict(self):
+        """Close the least recently used years while too many years are open."""
+        if self.open_storage is None:
+            return
+        while len(self.partitions) > self.max_years:
+            year, partition = next(iter(self.partitions.items()))
+            self.summarize(year)
+            del self.partitions[year]
+            partition.destroy()
+            partition.close()
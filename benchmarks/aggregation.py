@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Compare the statistics tables built with pandas group-by and with the ledger sums."""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.ledgers import make_year
+
+
+def pandas_tables(categories):
+    """
+    Build the month and year tables with a concatenated DataFrame and group-by.
+
+    :param categories: month number, category name and ledger of every category
+    :return: tables by category, date and month
+    """
+    data = []
+    for month, name, ledger in categories:
+        category_data = pd.DataFrame(ledger.decoded_arrays())
+        category_data['category'] = name
+        category_data['month'] = month + 1
+        data.append(category_data)
+    data = pd.concat(data, ignore_index=True)
+    data.replace({'date': {'': 'unknown'}}, inplace=True)
+    return (data.groupby(['category'])['amount'].sum().reset_index(),
+            data.groupby(['date'])['amount'].sum().reset_index(),
+            data.groupby(['month'])['amount'].sum().reset_index())
+
+
+def ledger_tables(categories):
+    """
+    Build the month and year tables from the ledger sums.
+
+    :param categories: month number, category name and ledger of every category
+    :return: tables by category, date and month
+    """
+    by_category, by_date, by_month = {}, {}, {}
+    for month, name, ledger in categories:
+        by_category[name] = by_category.get(name, 0.) + ledger.total()
+        by_month[month + 1] = by_month.get(month + 1, 0.) + ledger.total()
+        for date, amount in ledger.group_totals('date').items():
+            by_date[date] = by_date.get(date, 0.) + amount
+    return tuple(pd.DataFrame({column: sorted(totals), 'amount': [totals[key] for key in sorted(totals)]})
+                 for column, totals in (('category', by_category), ('date', by_date), ('month', by_month)))
+
+
+def measure(function, *args):
+    """
+    Call the function once.
+
+    :param function: function to call
+    :return: result and seconds spent
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Benchmark entry."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10 ** 4, 10 ** 6, 10 ** 7])
+    args = parser.parse_args()
+    print(f'{"rows":>10} {"pandas, s":>10} {"first sums, s":>14} {"kept sums, s":>13}')
+    for rows in args.rows:
+        categories = make_year(rows)
+        expected, pandas_seconds = measure(pandas_tables, categories)
+        tables, first_seconds = measure(ledger_tables, categories)
+        _, kept_seconds = measure(ledger_tables, categories)
+        for table, expected_table in zip(tables, expected):
+            np.testing.assert_allclose(table['amount'], expected_table['amount'])
+        print(f'{rows:>10} {pandas_seconds:>10.4f} {first_seconds:>14.4f} {kept_seconds:>13.6f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Measure the latency and memory of turning a drawn chart into an image."""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import PIL.Image
+
+from FinanceApp.statistic_window import bar_chart, statistic_window
+
+
+def copied_image(fig):
+    """
+    Get the figure pixels the way the charts were converted before: RGB bytes copied into a new image.
+
+    :param fig: drawn figure
+    :return: figure pixels
+    """
+    canvas = fig.canvas
+    if hasattr(canvas, 'tostring_rgb'):
+        data = canvas.tostring_rgb()
+    else:
+        data = np.asarray(canvas.buffer_rgba())[..., :3].tobytes()
+    return PIL.Image.frombytes('RGB', canvas.get_width_height(), data)
+
+
+def make_figure(size, bars):
+    """
+    Draw a bar chart.
+
+    :param size: image width and height
+    :param bars: number of bars
+    :return: drawn figure
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    dpi = size[0] / bar_chart.FIGURE_WIDTH
+    fig = Figure(figsize=(bar_chart.FIGURE_WIDTH, size[1] / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    fig.subplots().bar(range(bars), np.arange(1, bars + 1))
+    fig.canvas.draw()
+    return fig
+
+
+def measure(convert, fig, repeat, tk_root):
+    """
+    Convert the figure pixels several times.
+
+    :param convert: conversion function
+    :param fig: drawn figure
+    :param repeat: number of conversions
+    :param tk_root: Tk root to create photo images with, photo images are not created if not set
+    :return: mean latency in milliseconds and peak traced memory in bytes
+    """
+    if tk_root is not None:
+        from PIL import ImageTk
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        image = convert(fig)
+        if tk_root is not None:
+            ImageTk.PhotoImage(image, master=tk_root)
+    latency = (time.perf_counter() - start) / repeat * 1000
+    tracemalloc.start()
+    image = convert(fig)
+    if tk_root is not None:
+        ImageTk.PhotoImage(image, master=tk_root)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return latency, peak
+
+
+def main():
+    """Benchmark entry."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, nargs=2, default=[1200, 800])
+    parser.add_argument('--bars', type=int, default=31)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--tk', action='store_true', help='also create the Tk photo images, needs a display')
+    args = parser.parse_args()
+    statistic_window.load_backend()
+    tk_root = None
+    if args.tk:
+        import tkinter as tk
+
+        tk_root = tk.Tk()
+        tk_root.withdraw()
+    fig = make_figure(tuple(args.size), args.bars)
+    print(f'{"pixel path":>12} {"latency, ms":>12} {"peak memory, MB":>16}')
+    for name, convert in (('copied', copied_image), ('buffer view', bar_chart.figure_image)):
+        latency, peak = measure(convert, fig, args.repeat, tk_root)
+        print(f'{name:>12} {latency:>12.3f} {peak / 2 ** 20:>16.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Measure the statement import speed and memory."""
+import argparse
+import os
+import random
+import tempfile
+import tracemalloc
+
+from FinanceApp import importer
+from FinanceApp.month_window import Category
+
+
+def write_statement(path, rows, seed=0):
+    """
+    Write a synthetic CSV statement.
+
+    :param path: statement file path
+    :param rows: number of transactions
+    :param seed: random seed
+    """
+    generator = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('Date,Description,Amount\n')
+        for _ in range(rows):
+            file.write(f'2021-{generator.randint(1, 12):02}-{generator.randint(1, 28):02},'
+                       f'shop {generator.randrange(1000)},-{generator.uniform(1, 500):.2f}\n')
+
+
+def measure(path, batch_size, trace):
+    """
+    Import the statement into in-memory categories.
+
+    :param path: statement file path
+    :param batch_size: number of transactions appended at once
+    :param trace: measure the peak memory of the import or not
+    :return: import report and peak memory in bytes
+    """
+    categories = {}
+
+    def resolve(name, field):
+        month = field['date'][5:7]
+        if month not in categories:
+            categories[month] = Category(0, month)
+        return categories[month]
+
+    if trace:
+        tracemalloc.start()
+    report = importer.import_fields(importer.to_fields(importer.read_statement(path)), resolve, batch_size=batch_size)
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    tracemalloc.stop()
+    return report, peak
+
+
+def main():
+    """Benchmark entry."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument('--batch-size', type=int, default=10000)
+    args = parser.parse_args()
+    print(f'{"rows":>10} {"file, MB":>9} {"rows/s":>10} {"peak memory, MB":>16}')
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            path = os.path.join(directory, f'statement-{rows}.csv')
+            write_statement(path, rows)
+            report, _ = measure(path, args.batch_size, trace=False)
+            _, peak = measure(path, args.batch_size, trace=True)
+            print(f'{rows:>10} {os.path.getsize(path) / 2 ** 20:>9.1f} {report.rows_per_second:>10.0f} '
+                  f'{peak / 2 ** 20:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
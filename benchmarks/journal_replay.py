@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Compare the journal recovery time with and without snapshots."""
+import argparse
+import os
+import tempfile
+import time
+
+from FinanceApp.month_window import MonthData
+from FinanceApp.storage import JournalStorage
+
+
+def fill_journal(directory, rows, tail, snapshot):
+    """
+    Write a journal with one category per month.
+
+    :param directory: journal directory
+    :param rows: number of data fields
+    :param tail: number of data fields logged after the snapshot
+    :param snapshot: take a snapshot before the tail or not
+    """
+    storage = JournalStorage(directory, snapshot_interval=rows + tail + 100)
+    categories = []
+    for month in range(12):
+        month_data = MonthData(month, observers=[storage])
+        category = month_data.add_category(f'category {month}')
+        storage.category_created(month_data, category)
+        categories.append(category)
+    for index in range(rows + tail):
+        if snapshot and index == rows:
+            storage.snapshot()
+        categories[index % 12].add_field(float(index), f'2021-{index % 12 + 1:02}-{index % 28 + 1:02}',
+                                         f'description {index % 1000}', f'subcategory {index % 20}')
+    storage.close()
+
+
+def measure(rows, tail, snapshot):
+    """
+    Measure the recovery of a journal.
+
+    :param rows: number of data fields
+    :param tail: number of data fields logged after the snapshot
+    :param snapshot: take a snapshot before the tail or not
+    :return: recovery time in seconds and snapshot size in bytes
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        fill_journal(directory, rows, tail, snapshot)
+        size = sum(os.path.getsize(os.path.join(directory, name))
+                   for name in os.listdir(directory) if name.startswith('snapshot'))
+        start = time.perf_counter()
+        JournalStorage(directory).close()
+        return time.perf_counter() - start, size
+
+
+def main():
+    """Benchmark entry."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6])
+    parser.add_argument('--tail', type=int, default=1000, help='data fields logged after the snapshot')
+    args = parser.parse_args()
+    print(f'{"rows":>10} {"snapshot, MB":>13} {"snapshot + tail, s":>19} {"full replay, s":>15}')
+    for rows in args.rows:
+        snapshot_time, size = measure(rows, args.tail, snapshot=True)
+        replay_time, _ = measure(rows, args.tail, snapshot=False)
+        print(f'{rows:>10} {size / 2 ** 20:>13.2f} {snapshot_time:>19.4f} {replay_time:>15.4f}')
+
+
+if __name__ == '__main__':
+    main()
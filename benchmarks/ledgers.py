@@ -0,0 +1,66 @@
+"""Seeded synthetic ledgers for the benchmarks."""
+import numpy as np
+
+from FinanceApp.month_window import Ledger, StringPool
+
+MONTHS = 12
+CATEGORIES = 8
+SUBCATEGORIES = 50
+DESCRIPTIONS = 1000
+YEAR = np.datetime64('2021-01-01')
+
+
+def make_pools():
+    """
+    Create the string pools of the synthetic ledgers.
+
+    :return: encoded dates, descriptions and subcategories by column name
+    """
+    dates = StringPool()
+    for day in range(365):
+        dates.encode(str(YEAR + day))
+    descriptions = StringPool()
+    descriptions.encode('')
+    for code in range(1, DESCRIPTIONS):
+        descriptions.encode(f'description {code}')
+    subcategories = StringPool()
+    for code in range(SUBCATEGORIES):
+        subcategories.encode(f'subcategory {code}')
+    return {'date': dates, 'description': descriptions, 'subcategory': subcategories}
+
+
+def make_ledger(rows, generator, pools, month=0):
+    """
+    Create a synthetic ledger of a month attached to NumPy buffers.
+
+    :param rows: number of rows
+    :param generator: random generator
+    :param pools: string pools made by :func:`make_pools`
+    :param month: month number of the dates, from 0
+    :return: ledger
+    """
+    first = (np.datetime64(f'2021-{month + 1:02}') - YEAR).astype(int)
+    last = (np.datetime64(f'2021-{month + 1:02}') + np.timedelta64(1, 'M') - YEAR).astype(int)
+    columns = {
+        'amount': generator.uniform(1, 500, rows).round(2),
+        'date': generator.integers(first, last, rows, dtype=np.int64),
+        'description': generator.integers(0, DESCRIPTIONS, rows, dtype=np.int32),
+        'subcategory': generator.integers(0, SUBCATEGORIES, rows, dtype=np.int32),
+    }
+    return Ledger.from_buffers(columns, np.arange(rows, dtype=np.int64), pools, rows)
+
+
+def make_year(rows, seed=0, months=MONTHS):
+    """
+    Create synthetic ledgers of several months, the same seed gives the same ledgers.
+
+    :param rows: total number of rows, split evenly between the categories
+    :param seed: random seed
+    :param months: number of months from January
+    :return: month number, category name and ledger of every category
+    """
+    generator = np.random.default_rng(seed)
+    pools = make_pools()
+    count = rows // (months * CATEGORIES)
+    return [(month, f'category {category}', make_ledger(count, generator, pools, month))
+            for month in range(months) for category in range(CATEGORIES)]
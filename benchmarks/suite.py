@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Time the hot paths of the application on synthetic ledgers and keep the results as JSON.
+
+The ledgers are generated with a seeded generator, so runs on different commits time the same data.
+Compare a run with the results of another commit to find the regressions::
+
+    python -m benchmarks.suite --output main.json
+    python -m benchmarks.suite --output branch.json --baseline main.json
+
+The Tk cases need a display. Without one they are run under Xvfb when it is installed and skipped otherwise.
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.ledgers import make_ledger, make_pools, make_year
+from FinanceApp.month_window import Category, MonthData
+
+ROWS = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+OPERATIONS = 1000
+FIELD = (152., '2021-01-15', 'description 1', 'subcategory 1')
+STARTUP = ('from FinanceApp.application import Application; '
+           'app = Application(prewarm=False); app.update(); app.master.destroy()')
+
+
+def make_category(rows, seed):
+    """
+    Create a category with a synthetic ledger which can be changed.
+
+    :param rows: number of data fields
+    :param seed: random seed
+    :return: category
+    """
+    category = Category(0, 'category')
+    category.fields = make_ledger(rows, np.random.default_rng(seed), make_pools())
+    category.add_field(*FIELD)
+    category.delete_field(len(category.fields) - 1)
+    return category
+
+
+def make_month(rows, seed, month_data=None):
+    """
+    Add the categories of a synthetic month to the month data.
+
+    :param rows: total number of data fields
+    :param seed: random seed
+    :param month_data: month data or window, a new month data by default
+    :return: month data
+    """
+    month_data = month_data if month_data is not None else MonthData(0)
+    for _, name, ledger in make_year(rows, seed, months=1):
+        month_data.add_category(name).fields = ledger
+    return month_data
+
+
+def time_add_field(rows, seed, repeat, root):
+    """Time adding a data field to a category."""
+    times = []
+    for _ in range(repeat):
+        category = make_category(rows, seed)
+        start = time.perf_counter()
+        for _ in range(OPERATIONS):
+            category.add_field(*FIELD)
+        times.append((time.perf_counter() - start) / OPERATIONS)
+    return times
+
+
+def time_delete_field(rows, seed, repeat, root):
+    """Time deleting a data field from the middle of a category."""
+    times = []
+    for _ in range(repeat):
+        category = make_category(rows + OPERATIONS, seed)
+        start = time.perf_counter()
+        for _ in range(OPERATIONS):
+            category.delete_field(len(category.fields) // 2)
+        times.append((time.perf_counter() - start) / OPERATIONS)
+    return times
+
+
+def time_search(rows, seed, repeat, root):
+    """Time searching the data fields of a year by a description prefix."""
+    from FinanceApp.search_index import SearchIndex
+
+    index = SearchIndex()
+    months = [MonthData(month, observers=[index]) for month in range(12)]
+    for month, name, ledger in make_year(rows, seed):
+        category = months[month].add_category(name)
+        category.fields = ledger
+        index.category_created(months[month], category)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        index.search('description 12')
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def time_update_list(rows, seed, repeat, root):
+    """Time showing the data fields of a category in the information window."""
+    import tkinter as tk
+
+    from FinanceApp.month_window import InformationWindow
+
+    frame = tk.Frame(root)
+    frame.grid()
+    window = InformationWindow(frame)
+    fields = make_category(rows, seed).fields
+    root.update()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        window.update_list(fields, delete_list=True)
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+    frame.destroy()
+    return times
+
+
+def time_collect_data(rows, seed, repeat, root):
+    """Time building the month statistics tables of a month loaded without the running sums."""
+    from FinanceApp.statistic_window import StatisticsWindow
+
+    window = StatisticsWindow(make_month(rows, seed), data_type='month', draw=False, master=root)
+    times = []
+    for _ in range(repeat):
+        window.raw_data = make_month(rows, seed)
+        start = time.perf_counter()
+        window._collect_data()
+        times.append(time.perf_counter() - start)
+    window.destroy()
+    return times
+
+
+def time_collect_year_data(rows, seed, repeat, root):
+    """Time building the year statistics tables of the application."""
+    import tkinter as tk
+
+    from FinanceApp.application import Application
+    from FinanceApp.statistic_window import StatisticsWindow
+
+    app = Application(master=tk.Toplevel(root))
+    for month, name, ledger in make_year(rows, seed):
+        month_window = app.load_month(month)
+        category = month_window.add_category(name)
+        category.fields = ledger
+        app.year_cube.category_created(month_window, category)
+    window = StatisticsWindow(app.load_month(0), data_type='month', draw=False, master=app)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        window._collect_year_data()
+        times.append(time.perf_counter() - start)
+    app.master.destroy()
+    return times
+
+
+def time_plot(rows, seed, repeat, root):
+    """Time plotting the month expenses by date until the chart is shown."""
+    from FinanceApp.statistic_window import StatisticsWindow, statistic_window
+
+    window = StatisticsWindow(make_month(rows, seed), data_type='month', master=root)
+    widget = window.widgets[1]
+    times = []
+    for _ in range(repeat):
+        while 'render' in widget:
+            root.update()
+        statistic_window._renders.clear()
+        start = time.perf_counter()
+        window.plot(1, window.data_by_date, x='date', y='amount', title=window.titles['date'])
+        while 'render' in widget:
+            root.update()
+            time.sleep(0.001)
+        times.append(time.perf_counter() - start)
+    window.destroy()
+    return times
+
+
+def time_startup(rows, seed, repeat, root):
+    """Time starting the application in a new interpreter until its window is drawn."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', STARTUP], check=True)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+CASES = {
+    'add_field': (time_add_field, False, True),
+    'delete_field': (time_delete_field, False, True),
+    'search': (time_search, False, True),
+    'update_list': (time_update_list, True, True),
+    'collect_data': (time_collect_data, True, True),
+    'collect_year_data': (time_collect_year_data, True, True),
+    'plot': (time_plot, True, True),
+    'startup': (time_startup, True, False),
+}
+
+
+@contextlib.contextmanager
+def virtual_display():
+    """
+    Provide a display for the Tk cases, starting Xvfb if there is no display.
+
+    :return: context giving the reason the Tk cases cannot run, None if they can
+    """
+    if os.environ.get('DISPLAY'):
+        yield None
+        return
+    if shutil.which('Xvfb') is None:
+        yield 'no display and Xvfb is not installed'
+        return
+    read_fd, write_fd = os.pipe()
+    server = subprocess.Popen(['Xvfb', '-displayfd', str(write_fd), '-screen', '0', '1600x1200x24', '-nolisten',
+                               'tcp'], pass_fds=(write_fd, ), stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as display:
+        number = display.readline().strip()
+    if not number:
+        server.wait()
+        yield 'Xvfb failed to start'
+        return
+    os.environ['DISPLAY'] = f':{number}'
+    try:
+        yield None
+    finally:
+        del os.environ['DISPLAY']
+        server.terminate()
+        server.wait()
+
+
+def run_suite(cases, rows_list, seed, repeat, tk_cases=True):
+    """
+    Run the benchmark cases.
+
+    :param cases: names of the cases to run
+    :param rows_list: numbers of data fields of the synthetic ledgers
+    :param seed: random seed
+    :param repeat: number of measurements of every case
+    :param tk_cases: run the cases creating Tk widgets or skip them
+    :return: measurement by '<case>/<rows>' key
+    """
+    results = {}
+    with virtual_display() if tk_cases else contextlib.nullcontext('disabled with --no-tk') as skip_reason:
+        root = None
+        if skip_reason is None:
+            import tkinter as tk
+
+            try:
+                root = tk.Tk()
+            except tk.TclError as error:
+                skip_reason = str(error)
+        for name in cases:
+            function, needs_tk, by_rows = CASES[name]
+            for rows in rows_list if by_rows else [None]:
+                key = name if rows is None else f'{name}/{rows}'
+                result = results[key] = {'case': name, 'rows': rows}
+                if needs_tk and skip_reason is not None:
+                    result['skipped'] = skip_reason
+                else:
+                    times = function(rows, seed, repeat, root)
+                    result.update(times=times, min=min(times), median=statistics.median(times))
+                print_result(key, result)
+        if root is not None:
+            root.destroy()
+    return results
+
+
+def print_result(key, result):
+    """
+    Print a measurement.
+
+    :param key: measurement key
+    :param result: measurement
+    """
+    if 'skipped' in result:
+        print(f'{key:>28} skipped: {result["skipped"]}', flush=True)
+    else:
+        print(f'{key:>28} {result["min"] * 1000:>12.4f} {result["median"] * 1000:>12.4f}', flush=True)
+
+
+def compare(results, baseline, threshold):
+    """
+    Print the cases which got slower than in the baseline.
+
+    Minimum times are compared, they are the least affected by the noise of the machine.
+
+    :param results: measurements by key
+    :param baseline: measurements of the baseline by key
+    :param threshold: ratio of the times above which a case is a regression
+    :return: keys of the regressed cases
+    """
+    regressions = []
+    for key, result in results.items():
+        old = baseline.get(key, {})
+        if 'min' not in result or not old.get('min'):
+            continue
+        ratio = result['min'] / old['min']
+        if ratio > threshold:
+            regressions.append(key)
+            print(f'{key:>28} {old["min"] * 1000:>12.4f} {result["min"] * 1000:>12.4f} {ratio:>8.2f}x slower')
+    return regressions
+
+
+def commit():
+    """
+    Get the commit of the working tree.
+
+    :return: commit hash, None outside of a git repository
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """Benchmark entry."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=ROWS)
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-tk', action='store_true', help='skip the cases creating Tk widgets')
+    parser.add_argument('--output', help='JSON file to write the results to')
+    parser.add_argument('--baseline', help='JSON results of another commit to compare with')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='ratio of the times above which a case is reported as a regression')
+    args = parser.parse_args()
+    print(f'{"case":>28} {"min, ms":>12} {"median, ms":>12}')
+    results = run_suite(args.cases, args.rows, args.seed, args.repeat, tk_cases=not args.no_tk)
+    report = {
+        'commit': commit(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(report, output, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline:
+            regressions = compare(results, json.load(baseline)['results'], args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,12 @@
+import os
+import tempfile
 import unittest
 
 from FinanceApp import Application
+from FinanceApp.month_window import MonthData
+from FinanceApp.search_window import SearchWindow
+from FinanceApp.storage import SQLiteStorage
+from FinanceApp.years import YearPartitions, year_path
 from test import TkinterTestCase
 
 
@@ -34,7 +40,8 @@ class TestFinanceApplication(TkinterTestCase):
         group.category_window.create_button.widget.event_generate('<Button-1>')
         self.pump_events()
         self.root.iconify()
-        self.assertEqual(group.category_window.buttons[group.active_category].text, test_string)
+        position = group.layout.position(group.layout.slot(group.active_category))
+        self.assertEqual(group.category_window.buttons[position].text, test_string)
 
     def test_3_add_field(self):
         category_name = 'dog'
@@ -60,6 +67,113 @@ class TestFinanceApplication(TkinterTestCase):
         self.root.iconify()
         self.assertEqual(group.categories[group.active_category].fields[0]['amount'], test_amount)
 
+    def test_4_lazy_months(self):
+        test_month = 3
+
+        app = Application(self.root)
+        self.pump_events()
+        self.assertEqual(list(app.months_groups), [0])
+        app.months_buttons[test_month].invoke()
+        self.pump_events()
+        self.assertEqual(sorted(app.months_groups), [0, test_month])
+
+    def test_5_search(self):
+        test_month = 2
+
+        app = Application(self.root)
+        self.pump_events()
+        category = app.load_month(test_month).create_category('food')
+        category.add_field(152., '2021-03-27', 'fresh milk', 'dairy')
+        search_window = SearchWindow(app)
+        search_window.query.set('mil')
+        search_window.search()
+        self.assertEqual(search_window.listbox.size(), 1)
+        search_window.listbox.selection_set(0)
+        search_window.listbox.event_generate('<Return>')
+        self.pump_events()
+        self.assertEqual(app.current_month, test_month)
+        self.assertEqual(app.months_groups[test_month].information_window.get_selected_index(), 0)
+
+    def test_6_years(self):
+        app = Application(self.root, year=2021)
+        self.pump_events()
+        app.load_month(0).create_category('food').add_field(152., '2021-01-27', '', '')
+        app.change_year(2022)
+        self.pump_events()
+        self.assertFalse(app.load_month(0).categories)
+        app.change_year(2021)
+        self.assertEqual(app.year_cube.total(), 152.)
+        self.assertEqual(app.partitions.summarize().totals('year'), {2021: 152.})
+
+    def test_7_undo(self):
+        app = Application(self.root)
+        self.pump_events()
+        group = app.months_groups[0]
+        group.control_window.widgets['category']['widget'].insert(0, 'food')
+        group.category_window.create_button.widget.event_generate('<Button-1>')
+        self.pump_events()
+        group.control_window.widgets['amount']['widget'].insert(0, '152')
+        group.information_window.control_widgets['add']['widget'].event_generate('<Button-1>')
+        self.pump_events()
+        category = group.categories[group.active_category]
+        self.assertEqual(len(category.fields), 1)
+        app.undo()
+        self.assertEqual(len(category.fields), 0)
+        self.assertEqual(len(group.information_window.fields), 0)
+        app.undo()
+        self.assertFalse(group.categories)
+        app.redo()
+        app.redo()
+        self.assertEqual(len(group.categories[group.active_category].fields), 1)
+
+    def test_8_delete_category(self):
+        app = Application(self.root)
+        self.pump_events()
+        group = app.months_groups[0]
+        food, rent, pets = (group.create_category(name) for name in ('food', 'rent', 'pets'))
+        group.select_category(food.id)
+        group.information_window.control_widgets['delete']['widget'].event_generate('<Button-1>')
+        self.pump_events()
+        self.assertEqual(group.active_category, rent.id)
+        self.assertEqual(group.category_window.buttons[(0, 0)].get_state(), 'hidden')
+        self.assertEqual(group.category_window.buttons[(0, 2)].text, 'pets')
+        self.assertEqual(group.category_window.create_button.position, (0, 0))
+        group.move_category(pets, 0)
+        self.assertEqual(group.category_window.buttons[(0, 0)].text, 'pets')
+        self.assertEqual(group.category_window.create_button.position, (0, 2))
+
+    def test_9_start_year_storage(self):
+        with tempfile.TemporaryDirectory() as directory:
+            opened = {}
+
+            def open_storage(year):
+                opened[year] = SQLiteStorage(year_path(os.path.join(directory, 'ledger.db'), year))
+                return opened[year]
+
+            partitions = YearPartitions(open_storage)
+            app = Application(self.root, year=2021, partitions=partitions)
+            self.pump_events()
+            self.assertIs(app.storage, opened[2021])
+            app.load_month(0).create_category('food').add_field(152., '2021-01-27', '', '')
+            partitions.close()
+            month = MonthData(0)
+            storage = open_storage(2021)
+            storage.load_month(month)
+            storage.close()
+            self.assertEqual(month.category_totals(), {'food': 152.})
+
+    def test_10_import_dates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'statement.csv')
+            with open(path, 'w', encoding='utf-8') as statement:
+                statement.write('Date;Description;Amount\n03.05.2021;Cinema;-10\n'
+                                '2021-06-01;Shop;-5\n01/02/2020;Old;-7\n;Undated;-1\n')
+            app = Application(self.root, year=2021)
+            self.pump_events()
+            report = app.import_statement(path)
+        self.assertEqual((report.rows, report.skipped), (3, 1))
+        self.assertEqual(app.year_cube.totals('month'), {4: 10., 5: 5., app.current_month: 1.})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+
+from FinanceApp.month_window import History, MonthData
+from FinanceApp.month_window.history import AddField, ChangeField, DeleteCategory, DeleteField
+from FinanceApp.storage import SQLiteStorage
+from FinanceApp.year_cube import YearCube
+
+
+class TestHistory(unittest.TestCase):
+    test_data = {
+        'amount': 152.,
+        'date': '2021-05-27',
+        'description': 'description',
+        'subcategory': 'cat food'
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = SQLiteStorage(os.path.join(self.directory.name, 'ledger.db'))
+        self.cube = YearCube()
+        self.month = MonthData(0, observers=[self.storage, self.cube])
+        self.category = self.month.add_category('food')
+        for observer in self.month.observers:
+            observer.category_created(self.month, self.category)
+        for amount in range(3):
+            self.category.add_field(**dict(self.test_data, amount=float(amount)))
+        self.history = History(coalesce_interval=0.)
+
+    def tearDown(self):
+        self.storage.close()
+        self.directory.cleanup()
+
+    def amounts(self):
+        return [field['amount'] for field in self.category.fields]
+
+    def test_0_fields(self):
+        old = self.category.fields.get_row(1)
+        self.month.change_field(self.category, 1, {'amount': 10.})
+        self.history.record(ChangeField(self.month, self.category, 1, old))
+        row_id, values = self.category.fields.ids[0], self.category.fields.get_row(0)
+        self.month.delete_field(self.category, 0)
+        self.history.record(DeleteField(self.month, self.category, 0, row_id, values))
+        self.month.insert_field(self.category, 2, dict(self.test_data, amount=5.))
+        self.history.record(AddField(self.month, self.category, 2))
+        self.assertEqual(self.amounts(), [10., 2., 5.])
+
+        self.history.undo()
+        self.history.undo()
+        self.assertEqual(self.amounts(), [0., 10., 2.])
+        self.assertEqual(list(self.category.fields.ids), [0, 1, 2])
+        self.history.undo()
+        self.assertIsNone(self.history.undo())
+        self.assertEqual(self.amounts(), [0., 1., 2.])
+        self.assertEqual(self.cube.total(), 3.)
+        self.history.redo()
+        self.history.redo()
+        self.history.redo()
+        self.assertIsNone(self.history.redo())
+        self.assertEqual(self.amounts(), [10., 2., 5.])
+        self.assertEqual(self.cube.total(), 17.)
+
+    def test_1_coalesce(self):
+        history = History(coalesce_interval=60.)
+        for amount in (10., 20.):
+            old = self.category.fields.get_row(0)
+            self.month.change_field(self.category, 0, {'amount': amount})
+            history.record(ChangeField(self.month, self.category, 0, old))
+        self.assertEqual(len(history.undo_commands), 1)
+        history.undo()
+        self.assertEqual(self.amounts(), [0., 1., 2.])
+        history.redo()
+        self.assertEqual(self.amounts(), [20., 1., 2.])
+
+    def test_2_category(self):
+        self.history.record(DeleteCategory(self.month, self.category))
+        self.month.remove_category(self.category)
+        self.assertEqual(self.cube.total(), 0.)
+        self.history.undo()
+        self.assertIn(self.category, self.month.categories.values())
+        self.assertEqual(self.amounts(), [0., 1., 2.])
+        self.assertEqual(self.cube.total(), 3.)
+        self.storage.flush()
+        month = MonthData(0)
+        self.storage.load_month(month)
+        self.assertEqual([field['amount'] for field in month.categories[0].fields], [0., 1., 2.])
+        self.history.redo()
+        self.assertFalse(self.month.categories)
+
+    def test_3_bounded_size(self):
+        history = History(max_size=4)
+        history.record(DeleteCategory(self.month, self.category))
+        for index in range(2):
+            old = self.category.fields.get_row(index)
+            self.month.change_field(self.category, index, {'amount': 7.})
+            history.record(ChangeField(self.month, self.category, index, old))
+        self.assertEqual(len(history.undo_commands), 2)
+        self.assertEqual(history.size, 2)
+
+    def test_4_category_slot(self):
+        rent = self.month.add_category('rent')
+        self.history.record(DeleteCategory(self.month, self.category))
+        self.month.remove_category(self.category)
+        self.assertEqual(list(self.month.layout.slots[:2]), [None, rent.id])
+        self.history.undo()
+        self.assertEqual(list(self.month.layout.slots[:2]), [self.category.id, rent.id])
+
+    def test_5_deleted_field_of_deleted_category(self):
+        row_id, values = self.category.fields.ids[0], self.category.fields.get_row(0)
+        self.month.delete_field(self.category, 0)
+        self.history.record(DeleteField(self.month, self.category, 0, row_id, values))
+        self.history.record(DeleteCategory(self.month, self.category))
+        self.month.remove_category(self.category)
+        self.history.undo()
+        self.history.undo()
+        self.assertEqual(list(self.category.fields.ids), [0, 1, 2])
+        self.storage.flush()
+        month = MonthData(0)
+        self.storage.load_month(month)
+        self.assertEqual([field['amount'] for field in month.categories[0].fields], [0., 1., 2.])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+from FinanceApp.month_window import ImageCache
+from FinanceApp.month_window.category_window import BUTTON_IMAGE, CREATE_IMAGE
+from test import TkinterTestCase
+
+
+class TestImageCache(TkinterTestCase):
+    def test_0_shared_size(self):
+        cache = ImageCache()
+        image = cache.get(self.root, BUTTON_IMAGE, (40, 30))
+        self.assertIs(cache.get(self.root, BUTTON_IMAGE, (40, 30)), image)
+        self.assertEqual((image.width(), image.height()), (40, 30))
+        self.assertIsNot(cache.get(self.root, BUTTON_IMAGE, (41, 30)), image)
+
+    def test_1_eviction(self):
+        cache = ImageCache(maxsize=2)
+        first = cache.get(self.root, BUTTON_IMAGE, (10, 10))
+        cache.get(self.root, CREATE_IMAGE, (10, 10))
+        cache.get(self.root, BUTTON_IMAGE, (10, 10))
+        cache.get(self.root, BUTTON_IMAGE, (20, 20))
+        self.assertEqual(len(cache.images), 2)
+        self.assertIs(cache.get(self.root, BUTTON_IMAGE, (10, 10)), first)
+        self.assertEqual(len(cache.sources), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
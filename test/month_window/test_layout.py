@@ -0,0 +1,41 @@
+import unittest
+
+from FinanceApp.month_window import CategoryIds, CategoryLayout
+
+
+class TestCategoryLayout(unittest.TestCase):
+    def test_0_category_ids(self):
+        ids = CategoryIds()
+        food = ids.get('food')
+        self.assertEqual(ids.get('rent'), food + 1)
+        self.assertEqual(ids.get('food'), food)
+        self.assertNotIn(ids.get('food', taken={food}), (food, food + 1))
+
+    def test_1_place(self):
+        layout = CategoryLayout((2, 2))
+        for category_id in (10, 11, 12):
+            layout.place(category_id)
+        self.assertEqual(layout.remove(10), 0)
+        self.assertEqual(layout.slots, [None, 11, 12, None])
+        self.assertEqual(list(layout), [11, 12])
+        self.assertEqual(layout.place(13), 0)
+        self.assertEqual(layout.place(14, slot=1), 3)
+        self.assertEqual(layout.position(3), (1, 1))
+        self.assertEqual(layout.at((1, 0)), 12)
+        with self.assertRaises(ValueError):
+            layout.place(15)
+
+    def test_2_move(self):
+        layout = CategoryLayout((2, 2))
+        for category_id in (10, 11, 12):
+            layout.place(category_id)
+        self.assertEqual(layout.move(10, 2), (0, 2))
+        self.assertEqual(layout.slots, [12, 11, 10, None])
+        layout.move(11, 3)
+        self.assertEqual(layout.slots, [12, None, 10, 11])
+        self.assertEqual(layout.slot(11), 3)
+        self.assertEqual(layout.free_slot(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+
+import datetime
+
+from FinanceApp.month_window import UNKNOWN_DATE, Category, Ledger, date_ordinal, parse_date
+
+
+class TestLedger(unittest.TestCase):
+    test_data = {
+        'amount': 152.,
+        'date': '2021-05-27',
+        'description': 'description',
+        'subcategory': 'cat food'
+    }
+
+    def test_0_add_field(self):
+        category = Category(0, 'food')
+        category.add_field(**self.test_data)
+        category.add_field(**self.test_data)
+        self.assertEqual(len(category.fields), 2)
+        self.assertEqual(dict(category.fields[1]), self.test_data)
+        self.assertEqual(len(category.fields.pools['subcategory']), 1)
+
+    def test_1_change_field(self):
+        category = Category(0, 'food')
+        category.add_field(**self.test_data)
+        category.change_field(0, amount=10., subcategory='dog food')
+        self.assertEqual(category.fields[0]['amount'], 10.)
+        self.assertEqual(category.fields[0]['subcategory'], 'dog food')
+        self.assertEqual(category.fields[0]['date'], self.test_data['date'])
+
+    def test_2_delete_field(self):
+        category = Category(0, 'food')
+        for amount in range(3):
+            category.add_field(**dict(self.test_data, amount=float(amount)))
+        category.delete_field(1)
+        self.assertEqual([field['amount'] for field in category.fields], [0., 2.])
+
+    def test_3_arrays(self):
+        ledger = Ledger([self.test_data, dict(self.test_data, amount=1.)])
+        arrays = ledger.decoded_arrays()
+        self.assertEqual(list(arrays['amount']), [152., 1.])
+        self.assertEqual(list(arrays['subcategory']), ['cat food', 'cat food'])
+        del arrays
+        ledger.append(**self.test_data)
+        self.assertEqual(len(ledger), 3)
+
+    def test_4_totals(self):
+        category = Category(0, 'food')
+        category.add_field(**self.test_data)
+        category.add_field(**dict(self.test_data, amount=8., subcategory='dog food'))
+        category.add_field(**dict(self.test_data, amount=40., date='2021-05-28'))
+        self.assertEqual(category.fields.total(), 200.)
+        self.assertEqual(category.fields.group_totals('subcategory'), {'cat food': 192., 'dog food': 8.})
+        category.change_field(1, subcategory='cat food')
+        category.delete_field(2)
+        self.assertEqual(category.fields.total(), 160.)
+        self.assertEqual(category.fields.group_totals('subcategory'), {'cat food': 160.})
+        self.assertEqual(category.fields.group_totals('date'), {'2021-05-27': 160.})
+
+    def test_5_mapped_totals(self):
+        source = Ledger([self.test_data, dict(self.test_data, amount=8., subcategory='dog food')])
+        ledger = Ledger.from_buffers(source.columns, source.ids, source.pools, source.next_id)
+        self.assertIsNone(ledger.totals)
+        self.assertEqual(ledger.group_totals('subcategory'), {'cat food': 152., 'dog food': 8.})
+        del ledger[0]
+        self.assertEqual(ledger.total(), 8.)
+
+    def test_6_parse_date(self):
+        self.assertEqual(parse_date('2021-05-27'), datetime.date(2021, 5, 27))
+        self.assertEqual(parse_date('27.05.2021'), datetime.date(2021, 5, 27))
+        self.assertEqual(parse_date('27/05/2021'), datetime.date(2021, 5, 27))
+        self.assertIsNone(parse_date(''))
+        self.assertIsNone(parse_date('yesterday'))
+        self.assertEqual(date_ordinal('yesterday'), UNKNOWN_DATE)
+
+    def test_7_date_range(self):
+        dates = ['2021-05-28', '27.05.2021', '', '2021-05-01', '2021-05-27']
+        ledger = Ledger([dict(self.test_data, amount=float(amount), date=date) for amount, date in enumerate(dates)])
+        first, last = date_ordinal('2021-05-02'), date_ordinal('2021-05-27')
+        self.assertEqual(list(ledger.date_rows()), [2, 3, 1, 4, 0])
+        self.assertEqual(list(ledger.date_rows(first, last)), [1, 4])
+        self.assertEqual(ledger.total(first, last), 5.)
+        ledger.append(amount=10., date='2021-05-10', description='', subcategory='')
+        ledger.change(0, date='2021-05-02')
+        del ledger[1]
+        self.assertEqual(list(ledger.date_rows()), [1, 2, 0, 4, 3])
+        self.assertEqual(ledger.group_totals('date', first, last),
+                         {'2021-05-02': 0., '2021-05-10': 10., '2021-05-27': 4.})
+
+    def test_8_mapped_date_range(self):
+        source = Ledger([dict(self.test_data, date=date) for date in ('2021-05-28', '2021-05-27')])
+        ledger = Ledger.from_buffers(source.columns, source.ids, source.pools, source.next_id)
+        self.assertEqual(list(ledger.date_rows(last=date_ordinal('2021-05-27'))), [1])
+        del ledger[1]
+        self.assertEqual(list(ledger.date_rows()), [0])
+
+    def test_9_insert(self):
+        ledger = Ledger([dict(self.test_data, amount=float(day), date=f'2021-05-0{day + 1}') for day in range(3)])
+        ledger.date_rows()
+        del ledger[1]
+        self.assertEqual(ledger.insert(1, 1., '2021-05-02', '', '', row_id=1), 1)
+        self.assertEqual([field['amount'] for field in ledger], [0., 1., 2.])
+        self.assertEqual(list(ledger.ids), [0, 1, 2])
+        self.assertEqual(list(ledger.date_rows(last=date_ordinal('2021-05-02'))), [0, 1])
+        self.assertEqual(ledger.total(), 3.)
+
+
+if __name__ == '__main__':
+    unittest.main()
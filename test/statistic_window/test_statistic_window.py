@@ -1,7 +1,9 @@
+import time
 import unittest
 
-from FinanceApp.month_window import Category
-from FinanceApp.statistic_window import StatisticsWindow
+from FinanceApp.month_window import Category, date_ordinal
+from FinanceApp.statistic_window import BarChart, StatisticsWindow, load_backend
+from FinanceApp.statistic_window import statistic_window
 from test import TkinterTestCase
 
 
@@ -29,6 +31,61 @@ class TestStatisticWindow(TkinterTestCase):
         self.pump_events()
         self.assertEqual(app.data[app.columns['amount']][0], self.test_data['amount'])
 
+    def test_2_date_range(self):
+        category = Category(0, 'food')
+        category.add_field(**dict(self.test_data, date='2021-05-27'))
+        category.add_field(**dict(self.test_data, amount=8., date='2021-06-01'))
+        app = StatisticsWindow(category, draw=False, master=self.root)
+        app.iconify()
+        app.date_range = (date_ordinal('2021-06-01'), None)
+        app._collect_data()
+        self.assertEqual(list(app.data_by_date[app.columns['amount']]), [8.])
+
+    def test_3_first_render_size(self):
+        category = Category(0, 'food')
+        category.add_field(**dict(self.test_data, date='2021-05-27'))
+        app = StatisticsWindow(category, master=self.root)
+        self.assertNotIn('render', app.widgets[0])
+        for _ in range(200):
+            self.pump_events()
+            if all('img' in widget for widget in app.widgets.values()):
+                break
+            time.sleep(0.05)
+        for widget in app.widgets.values():
+            canvas = widget['canvas']
+            self.assertEqual(widget['img'].size, (canvas.winfo_width(), canvas.winfo_height()))
+        app.destroy()
+
+
+class TestSortedTotals(unittest.TestCase):
+    def test_0_chronological_dates(self):
+        totals = {'2021-06-01': 1., '': 2., '27.05.2021': 3., '2021-05-28': 4.}
+        self.assertEqual(statistic_window.sorted_totals('date', totals),
+                         (['27.05.2021', '2021-05-28', '2021-06-01', 'unknown'], [3., 4., 1., 2.]))
+
+
+class TestRenderChart(unittest.TestCase):
+    def test_0_render_size(self):
+        load_backend()
+        data = statistic_window.pd.DataFrame({'category': ['food', 'rent'], 'amount': [152., 300.]})
+        image = statistic_window.render_chart(data, 'category', 'amount', 'title', (600, 400))
+        self.assertEqual(image.mode, 'RGBA')
+        self.assertEqual(image.size, (600, 400))
+        self.assertIs(statistic_window.render_chart(data, 'category', 'amount', 'title', (600, 400)), image)
+
+    def test_1_update_bars(self):
+        load_backend()
+        chart = BarChart()
+        chart.update(['food', 'rent'], [152., 300.])
+        bars = list(chart.bars)
+        chart.update(['food', 'rent', 'travel'], [152., 310., 20.])
+        self.assertEqual(chart.bars[:2], bars)
+        self.assertEqual([bar.get_height() for bar in chart.bars], [152., 310., 20.])
+        self.assertEqual(chart.labels[1].get_text(), '310.00')
+        chart.update(['food'], [1.])
+        self.assertEqual((len(chart.bars), len(chart.ax.patches)), (1, 1))
+        self.assertEqual(chart.render((600, 400)).size, (600, 400))
+
 
 if __name__ == '__main__':
     unittest.main()
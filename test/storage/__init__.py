@@ -0,0 +1,18 @@
+from FinanceApp.month_window import Category, CategoryIds, CategoryLayout
+
+
+class MonthData:
+    """Month window without widgets."""
+
+    def __init__(self, month, observers=None, category_ids=None):
+        self.month = month
+        self.observers = observers if observers is not None else []
+        self.category_ids = category_ids if category_ids is not None else CategoryIds()
+        self.categories = {}
+        self.layout = CategoryLayout((6, 4))
+
+    def add_category(self, name, slot=None):
+        category = Category(self.category_ids.get(name, self.categories), name, observers=self.observers)
+        self.categories[category.id] = category
+        self.layout.place(category.id, slot)
+        return category
@@ -0,0 +1,113 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from FinanceApp import month_window
+from FinanceApp.storage import JournalStorage
+from test.storage import MonthData
+
+
+class TestJournalStorage(unittest.TestCase):
+    test_data = {
+        'amount': 152.,
+        'date': '2021-05-27',
+        'description': 'description',
+        'subcategory': 'cat food'
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _fill(self, storage, rows):
+        month_data = MonthData(2, observers=[storage])
+        category = month_data.add_category('food')
+        storage.category_created(month_data, category)
+        for amount in range(rows):
+            category.add_field(**dict(self.test_data, amount=float(amount)))
+        category.change_field(0, description='changed')
+        category.delete_field(1)
+        return month_data
+
+    def _load(self, **kwargs):
+        storage = JournalStorage(self.directory.name, **kwargs)
+        month_data = MonthData(2)
+        storage.load_month(month_data)
+        storage.close()
+        return month_data.categories[0]
+
+    def test_0_replay(self):
+        storage = JournalStorage(self.directory.name)
+        self._fill(storage, 3)
+        storage.close()
+        category = self._load()
+        self.assertEqual([field['amount'] for field in category.fields], [0., 2.])
+        self.assertEqual(category.fields[0]['description'], 'changed')
+
+    def test_1_snapshot(self):
+        storage = JournalStorage(self.directory.name, snapshot_interval=5)
+        self._fill(storage, 10)
+        storage.close()
+        files = sorted(os.listdir(self.directory.name))
+        self.assertEqual([name for name in files if name.startswith('snapshot')], ['snapshot-2.bin'])
+        self.assertNotIn('journal-1.log', files)
+        category = self._load()
+        self.assertEqual([field['amount'] for field in category.fields], [0.] + [float(i) for i in range(2, 10)])
+
+    def test_2_other_month(self):
+        storage = JournalStorage(self.directory.name)
+        self._fill(storage, 3)
+        storage.close()
+        storage = JournalStorage(self.directory.name)
+        month_data = MonthData(0)
+        storage.load_month(month_data)
+        storage.close()
+        self.assertEqual(month_data.categories, {})
+
+    def test_3_restored_field(self):
+        storage = JournalStorage(self.directory.name)
+        category = self._fill(storage, 3).categories[0]
+        category.insert_field(1, **dict(self.test_data, amount=1.), row_id=1)
+        storage.close()
+        category = self._load()
+        self.assertEqual([field['amount'] for field in category.fields], [0., 1., 2.])
+
+    def test_4_slots(self):
+        storage = JournalStorage(self.directory.name)
+        month_data = month_window.MonthData(2, observers=[storage])
+        for name in ('food', 'rent', 'fuel'):
+            storage.category_created(month_data, month_data.add_category(name))
+        month_data.move_category(month_data.categories[0], 2)
+        storage.snapshot()
+        month_data.move_category(month_data.categories[1], 5)
+        storage.close()
+
+        storage = JournalStorage(self.directory.name)
+        month_data = MonthData(2)
+        storage.load_month(month_data)
+        storage.close()
+        self.assertEqual([month_data.categories[category_id].name if category_id is not None else None
+                          for category_id in month_data.layout.slots[:6]], ['fuel', None, 'food', None, None, 'rent'])
+
+    def test_5_snapshot_copy(self):
+        storage = JournalStorage(self.directory.name)
+        category = self._fill(storage, 3).categories[0]
+        storage.snapshot()
+        category.change_field(0, amount=10.)
+        category.add_field(**self.test_data)
+        storage.compaction.join()
+        with open(os.path.join(self.directory.name, 'snapshot-1.bin'), 'rb') as snapshot:
+            _, categories, _ = pickle.load(snapshot)
+        self.assertEqual([field['amount'] for field in categories[0][2]], [0., 2.])
+        self.assertEqual(categories[0][2].group_totals('subcategory'), {'cat food': 2.})
+        storage.close()
+        category = self._load()
+        self.assertEqual([field['amount'] for field in category.fields], [10., 2., 152.])
+        self.assertEqual(category.fields.total(), 164.)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from FinanceApp import month_window
+from FinanceApp.storage import SQLiteStorage
+from test.storage import MonthData
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    test_data = {
+        'amount': 152.,
+        'date': '2021-05-27',
+        'description': 'description',
+        'subcategory': 'cat food'
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ledger.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _create_month(self, storage, month, name):
+        month_data = MonthData(month, observers=[storage])
+        category = month_data.add_category(name)
+        storage.category_created(month_data, category)
+        return month_data, category
+
+    def test_0_write_through(self):
+        storage = SQLiteStorage(self.path)
+        _, category = self._create_month(storage, 3, 'food')
+        for amount in range(3):
+            category.add_field(**dict(self.test_data, amount=float(amount)))
+        category.change_field(0, description='changed')
+        category.delete_field(1)
+        storage.close()
+
+        storage = SQLiteStorage(self.path)
+        month_data = MonthData(3)
+        storage.load_month(month_data)
+        storage.close()
+        category = month_data.categories[0]
+        self.assertEqual(category.name, 'food')
+        self.assertEqual([field['amount'] for field in category.fields], [0., 2.])
+        self.assertEqual(category.fields[0]['description'], 'changed')
+        self.assertEqual(list(category.fields.ids), [0, 2])
+
+    def test_1_load_selected_month(self):
+        storage = SQLiteStorage(self.path)
+        _, category = self._create_month(storage, 0, 'food')
+        category.add_field(**self.test_data)
+        self._create_month(storage, 1, 'rent')
+        month_data = MonthData(1)
+        storage.load_month(month_data)
+        self.assertEqual([category.name for category in month_data.categories.values()], ['rent'])
+        storage.close()
+
+    def test_2_delete_category(self):
+        storage = SQLiteStorage(self.path)
+        month_data, category = self._create_month(storage, 0, 'food')
+        category.add_field(**self.test_data)
+        storage.category_deleted(month_data, category)
+        storage.flush()
+        self.assertEqual(storage.connection.execute('SELECT COUNT(*) FROM fields').fetchone(), (0, ))
+        storage.close()
+
+    def test_3_batched_commits(self):
+        storage = SQLiteStorage(self.path, batch_size=10)
+        _, category = self._create_month(storage, 0, 'food')
+        for _ in range(5):
+            category.add_field(**self.test_data)
+        self.assertEqual(storage.pending, 6)
+        storage.flush()
+        self.assertEqual(storage.pending, 0)
+        storage.close()
+
+    def test_4_slots(self):
+        storage = SQLiteStorage(self.path)
+        month_data = month_window.MonthData(3, observers=[storage])
+        for name in ('food', 'rent', 'fuel'):
+            storage.category_created(month_data, month_data.add_category(name))
+        month_data.move_category(month_data.categories[0], 2)
+        month_data.move_category(month_data.categories[1], 5)
+        storage.close()
+
+        storage = SQLiteStorage(self.path)
+        month_data = MonthData(3)
+        storage.load_month(month_data)
+        storage.close()
+        self.assertEqual([month_data.categories[category_id].name if category_id is not None else None
+                          for category_id in month_data.layout.slots[:6]], ['fuel', None, 'food', None, None, 'rent'])
+
+
+if __name__ == '__main__':
+    unittest.main()
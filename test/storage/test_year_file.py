@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+
+from FinanceApp import month_window
+from FinanceApp.storage import YearFile, YearFileStorage
+from test.storage import MonthData
+
+
+class TestYearFileStorage(unittest.TestCase):
+    test_data = {
+        'amount': 152.,
+        'date': '2021-05-27',
+        'description': 'description',
+        'subcategory': 'cat food'
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ledger.year')
+        storage = YearFileStorage(self.path)
+        months = {month: MonthData(month, observers=[storage]) for month in (0, 4)}
+        for month, name in ((4, 'food'), (4, 'rent'), (0, 'cinema')):
+            month_data = months[month]
+            category = month_data.add_category(name)
+            storage.category_created(month_data, category)
+            for amount in range(3):
+                category.add_field(**dict(self.test_data, amount=float(amount)))
+            category.delete_field(0)
+        storage.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_0_mapped_load(self):
+        storage = YearFileStorage(self.path)
+        month_data = MonthData(4)
+        storage.load_month(month_data)
+        self.assertEqual([category.name for category in month_data.categories.values()], ['food', 'rent'])
+        fields = month_data.categories[1].fields
+        self.assertTrue(fields.mapped)
+        self.assertEqual(list(fields.arrays()['amount']), [1., 2.])
+        self.assertEqual(dict(fields[0]), dict(self.test_data, amount=1.))
+        self.assertEqual(list(fields.ids), [1, 2])
+
+    def test_1_change_mapped(self):
+        storage = YearFileStorage(self.path)
+        month_data = MonthData(0, observers=[storage])
+        storage.load_month(month_data)
+        category = month_data.categories[0]
+        category.add_field(**dict(self.test_data, subcategory='dog food'))
+        category.change_field(0, amount=10.)
+        self.assertFalse(category.fields.mapped)
+        storage.close()
+
+        storage = YearFileStorage(self.path)
+        month_data = MonthData(0)
+        storage.load_month(month_data)
+        fields = month_data.categories[0].fields
+        self.assertEqual([field['amount'] for field in fields], [10., 2., 152.])
+        self.assertEqual(fields[2]['subcategory'], 'dog food')
+        self.assertEqual(list(fields.ids), [1, 2, 3])
+
+    def test_2_flush(self):
+        storage = YearFileStorage(self.path, flush_interval=0.)
+        month_data = MonthData(4, observers=[storage])
+        storage.load_month(month_data)
+        category = month_data.categories[0]
+        category.add_field(**dict(self.test_data, amount=5., description='new'))
+        self.assertFalse(category.fields.mapped)
+        old_map = storage.year_file.map
+        storage.flush()
+        self.assertTrue(old_map.closed)
+        self.assertFalse(storage.changed)
+        self.assertTrue(category.fields.mapped)
+        self.assertEqual([field['amount'] for field in category.fields], [1., 2., 5.])
+        self.assertEqual(category.fields[2]['description'], 'new')
+        self.assertEqual(category.fields.total(), 8.)
+        self.assertEqual(category.fields.group_totals('subcategory'), {'cat food': 8.})
+
+        month_data = MonthData(4)
+        YearFileStorage(self.path, read_only=True).load_month(month_data)
+        self.assertEqual(len(month_data.categories[0].fields), 3)
+        storage.close()
+
+    def test_3_flush_interval(self):
+        storage = YearFileStorage(self.path)
+        month_data = MonthData(0, observers=[storage])
+        storage.load_month(month_data)
+        month_data.categories[0].delete_field(0)
+        storage.flush()
+        self.assertTrue(storage.changed)
+        storage.close()
+        month_data = MonthData(0)
+        YearFileStorage(self.path, read_only=True).load_month(month_data)
+        self.assertEqual(len(month_data.categories[0].fields), 1)
+
+    def test_4_slots(self):
+        storage = YearFileStorage(self.path)
+        month_data = month_window.MonthData(4, observers=[storage])
+        storage.load_month(month_data)
+        month_data.move_category(month_data.categories[0], 3)
+        storage.close()
+
+        month_data = MonthData(4)
+        YearFileStorage(self.path, read_only=True).load_month(month_data)
+        self.assertEqual([month_data.categories[category_id].name if category_id is not None else None
+                          for category_id in month_data.layout.slots[:4]], [None, 'rent', None, 'food'])
+
+    def test_5_close_viewed(self):
+        year_file = YearFile(self.path)
+        ledger = year_file.ledger(*year_file.categories[0][2:5])
+        arrays = ledger.arrays()
+        with self.assertRaises(BufferError):
+            year_file.close()
+        self.assertFalse(year_file.map.closed)
+        del arrays
+        year_file.close()
+        self.assertTrue(year_file.map.closed)
+        self.assertEqual(list(ledger.arrays()['amount']), [1., 2.])
+
+        storage = YearFileStorage(self.path, flush_interval=0.)
+        month_data = MonthData(4, observers=[storage])
+        storage.load_month(month_data)
+        arrays = month_data.categories[1].fields.arrays()
+        month_data.categories[0].add_field(**self.test_data)
+        with self.assertRaises(BufferError):
+            storage.flush()
+        self.assertTrue(storage.changed)
+        del arrays
+        storage.flush()
+        self.assertFalse(storage.changed)
+        storage.close()
+        month_data = MonthData(4)
+        YearFileStorage(self.path, read_only=True).load_month(month_data)
+        self.assertEqual(len(month_data.categories[0].fields), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+
+import numpy as np
+
+from FinanceApp import aggregation
+
+
+class TestAggregation(unittest.TestCase):
+    amounts = np.array([1., 2., 4., 8.])
+
+    def test_0_dense_codes(self):
+        groups, sums, counts = aggregation.code_sums(np.array([3, 0, 3, 3]), self.amounts)
+        self.assertEqual(groups.tolist(), [0, 3])
+        self.assertEqual(sums.tolist(), [2., 13.])
+        self.assertEqual(counts.tolist(), [1, 3])
+
+    def test_1_sparse_codes(self):
+        groups, sums, counts = aggregation.code_sums(np.array([10 ** 9, 5, 10 ** 9, 5]), self.amounts)
+        self.assertEqual(groups.tolist(), [5, 10 ** 9])
+        self.assertEqual(sums.tolist(), [10., 5.])
+        self.assertEqual(counts.tolist(), [2, 2])
+
+    def test_2_empty(self):
+        groups, sums, counts = aggregation.code_sums(np.zeros(0, dtype=np.int64), np.zeros(0))
+        self.assertEqual((len(groups), len(sums), len(counts)), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+import io
+import unittest
+
+from FinanceApp import import_time
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_0_lazy_plotting(self):
+        modules = {name for _, _, name in import_time.measure()}
+        self.assertIn('FinanceApp.statistic_window', modules)
+        self.assertFalse(modules & {'pandas', 'matplotlib', 'seaborn'})
+
+    def test_1_budget(self):
+        output = io.StringIO()
+        self.assertEqual(import_time.report('json', budget=0., file=output), 1)
+        self.assertIn('modules imported in', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import gc
+import os
+import re
+import tempfile
+import unittest
+import weakref
+
+from FinanceApp import importer
+from FinanceApp.month_window import Category
+
+
+class TestImporter(unittest.TestCase):
+    csv_statement = (
+        'Date;Description;Amount\n'
+        '2021-05-01;Pet shop  Nr 1;-152,50\n'
+        '2021-05-02;Salary;1000\n'
+        '2021-05-03;Cinema;-10\n'
+    )
+    ofx_statement = (
+        'OFXHEADER:100\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n'
+        '<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20210501120000<TRNAMT>-152.50<NAME>Pet shop\n'
+        '<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20210503<TRNAMT>-10.00<MEMO>Cinema</STMTTRN>\n'
+        '</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n'
+    )
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(text)
+        return path
+
+    def test_0_read_csv(self):
+        transactions = list(importer.read_csv(self._write('statement.csv', self.csv_statement)))
+        self.assertEqual(transactions[0], {'amount': '-152,50', 'date': '2021-05-01', 'description': 'Pet shop  Nr 1'})
+        self.assertEqual(len(transactions), 3)
+        path = self._write('short.csv', self.csv_statement + '2021-05-04;Truncated\n;;\n\n')
+        transactions = list(importer.read_csv(path))
+        self.assertEqual(transactions[3], {'date': '2021-05-04', 'description': 'Truncated'})
+        self.assertEqual(len(transactions), 4)
+        skipped = importer.SkipCounter()
+        self.assertEqual(len(list(importer.to_fields(transactions, skipped=skipped))), 2)
+        self.assertEqual(skipped.count, 1)
+
+    def test_1_read_ofx(self):
+        path = self._write('statement.ofx', self.ofx_statement)
+        for block_size in (7, 1 << 16):
+            transactions = list(importer.read_ofx(path, block_size=block_size))
+            self.assertEqual(transactions, [
+                {'date': '2021-05-01', 'amount': '-152.50', 'description': 'Pet shop'},
+                {'date': '2021-05-03', 'amount': '-10.00', 'description': 'Cinema'},
+            ])
+
+    def test_2_rules(self):
+        rules = [importer.Rule(re.compile('pet', re.IGNORECASE), 'pets', 'shop')]
+        transactions = importer.read_csv(self._write('statement.csv', self.csv_statement))
+        fields = list(importer.to_fields(transactions, rules))
+        self.assertEqual(fields[0], ('pets', {'amount': 152.5, 'date': '2021-05-01', 'description': 'Pet shop Nr 1',
+                                              'subcategory': 'shop'}))
+        self.assertEqual(fields[1][0], None)
+        self.assertEqual(len(fields), 2)
+
+    def test_3_import_batches(self):
+        categories = {'pets': Category(0, 'pets'), None: Category(1, 'other')}
+        batches = []
+        fields = [('pets', {'amount': float(i), 'date': '', 'description': '', 'subcategory': ''}) for i in range(5)]
+        fields.append((None, {'amount': 1., 'date': '', 'description': '', 'subcategory': ''}))
+        report = importer.import_fields(fields, lambda name, field: categories[name], batch_size=4,
+                                        on_batch=batches.append)
+        self.assertEqual(report.rows, 6)
+        self.assertEqual(len(batches), 2)
+        self.assertEqual([field['amount'] for field in categories['pets'].fields], [0., 1., 2., 3., 4.])
+        self.assertEqual(len(categories[None].fields), 1)
+
+    def test_4_amounts(self):
+        for text, amount in (('-1,234.56', -1234.56), ('-1.234,56', -1234.56), ('-152,50', -152.5),
+                             ('1 000 000', 1e6), ('1,234,567', 1234567.), ("1'234.5", 1234.5)):
+            self.assertEqual(importer.parse_amount(text), amount)
+        with self.assertRaises(ValueError):
+            importer.parse_amount('1,234.5.6')
+        skipped = importer.SkipCounter()
+        transactions = [{'amount': '-1,234.56'}, {'amount': 'n/a'}, {'description': 'no amount'}, {'amount': '5'}]
+        fields = list(importer.to_fields(transactions, skipped=skipped))
+        self.assertEqual([field['amount'] for name, field in fields], [1234.56])
+        self.assertEqual(skipped.count, 2)
+        report = importer.import_fields(fields, lambda name, field: Category(0, 'other'), skipped=skipped)
+        self.assertEqual((report.rows, report.skipped), (1, 2))
+
+    def test_5_skipped_not_kept(self):
+        class Transaction(dict):
+            pass
+
+        references = []
+
+        def transactions():
+            for index in range(1000):
+                transaction = Transaction(amount='-1' if index % 10 == 0 else 'n/a')
+                references.append(weakref.ref(transaction))
+                yield transaction
+
+        skipped = importer.SkipCounter()
+        fields = importer.to_fields(transactions(), skipped=skipped)
+        report = importer.import_fields(fields, lambda name, field: Category(0, 'other'), skipped=skipped)
+        self.assertEqual((report.rows, report.skipped), (100, 900))
+        gc.collect()
+        self.assertEqual([reference for reference in references if reference() is not None], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import csv
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from FinanceApp import report
+from FinanceApp.storage import SQLiteStorage
+from test.storage import MonthData
+
+
+class TestReport(unittest.TestCase):
+    test_data = {
+        'amount': 152.,
+        'date': '2021-05-27',
+        'description': 'description',
+        'subcategory': 'cat food'
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ledger.db')
+        self.output = os.path.join(self.directory.name, 'reports')
+        storage = SQLiteStorage(self.path)
+        for month, name, amounts in ((4, 'food', (1., 2.)), (4, 'cat', (3.,)), (6, 'food', (4.,))):
+            month_data = MonthData(month, observers=[storage])
+            category = month_data.add_category(name)
+            storage.category_created(month_data, category)
+            for day, amount in enumerate(amounts, 1):
+                category.add_field(**dict(self.test_data, amount=amount, date=f'2021-0{month + 1}-0{day}'))
+        storage.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read(self, name):
+        with open(os.path.join(self.output, 'ledger', f'{name}.csv'), newline='', encoding='utf-8') as table:
+            return list(csv.reader(table))[1:]
+
+    def test_0_tables(self):
+        written = report.write_report(self.path, self.output, charts=False)
+        self.assertEqual(sorted(os.path.basename(path) for path in written),
+                         ['05-category.csv', '05-date.csv', '07-category.csv', '07-date.csv',
+                          'year-category.csv', 'year-month.csv'])
+        self.assertEqual(self.read('year-category'), [['cat', '3.0'], ['food', '7.0']])
+        self.assertEqual(self.read('year-month'), [['5', '6.0'], ['7', '4.0']])
+        self.assertEqual(self.read('05-date'), [['2021-05-01', '4.0'], ['2021-05-02', '2.0']])
+
+    def test_1_charts(self):
+        written = report.write_report(self.path, self.output)
+        charts = [path for path in written if path.endswith('.png')]
+        self.assertEqual(len(charts), 6)
+        self.assertTrue(all(os.path.getsize(path) for path in charts))
+
+    def test_2_parallel(self):
+        missing = os.path.join(self.directory.name, 'missing.db')
+        results = report.write_reports([self.path, missing], self.output, charts=False, jobs=2)
+        self.assertEqual(len(results[self.path]), 6)
+        self.assertIsInstance(results[missing], FileNotFoundError)
+        self.assertFalse(os.path.exists(missing))
+
+    def test_3_read_only(self):
+        path = os.path.join(self.directory.name, 'old.db')
+        connection = sqlite3.connect(path)
+        connection.executescript('''
+            CREATE TABLE categories (id INTEGER PRIMARY KEY, month INTEGER NOT NULL, name TEXT NOT NULL);
+            CREATE TABLE fields (month INTEGER NOT NULL, category INTEGER NOT NULL, row INTEGER NOT NULL,
+                                 amount REAL NOT NULL, date TEXT, description TEXT, subcategory TEXT,
+                                 PRIMARY KEY (month, category, row)) WITHOUT ROWID;
+            INSERT INTO categories VALUES (1, 4, 'food');
+            INSERT INTO fields VALUES (4, 1, 0, 5., '2021-05-01', '', '');
+        ''')
+        connection.close()
+        with open(path, 'rb') as database:
+            content = database.read()
+        written = report.write_report(path, self.output, charts=False)
+        self.assertEqual(len(written), 4)
+        with open(path, 'rb') as database:
+            self.assertEqual(database.read(), content)
+        self.assertEqual(sorted(name for name in os.listdir(self.directory.name) if name.startswith('old')),
+                         ['old.db'])
+
+    def test_4_same_names(self):
+        paths = []
+        for folder in ('a', 'b'):
+            os.makedirs(os.path.join(self.directory.name, folder))
+            paths.append(shutil.copy(self.path, os.path.join(self.directory.name, folder, 'ledger-2021.db')))
+        results = report.write_reports(paths + [self.path], self.output, charts=False, jobs=2)
+        self.assertIsInstance(results[paths[0]], ValueError)
+        self.assertIsInstance(results[paths[1]], ValueError)
+        self.assertEqual(len(results[self.path]), 6)
+        self.assertEqual(os.listdir(self.output), ['ledger'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from FinanceApp.search_index import SearchIndex, edit_distance
+from test.storage import MonthData
+
+
+class TestSearchIndex(unittest.TestCase):
+    test_data = {
+        'amount': 152.,
+        'date': '2021-05-27',
+        'description': 'description',
+        'subcategory': 'cat food'
+    }
+
+    def setUp(self):
+        self.index = SearchIndex()
+        self.months = [MonthData(month, observers=[self.index]) for month in range(2)]
+
+    def create(self, month, name):
+        category = self.months[month].add_category(name)
+        self.index.category_created(self.months[month], category)
+        return category
+
+    def found(self, query, **kwargs):
+        return [(result.month, result.category.name, result.index) for result in self.index.search(query, **kwargs)]
+
+    def test_0_prefix(self):
+        food = self.create(0, 'food')
+        food.add_field(**dict(self.test_data, description='Fresh Milk'))
+        food.add_field(**dict(self.test_data, description='bread', subcategory='bakery'))
+        pets = self.create(1, 'pets')
+        pets.add_fields([dict(self.test_data, description='milk bone')] * 2)
+        self.assertEqual(self.found('milk'), [(0, 'food', 0), (1, 'pets', 0), (1, 'pets', 1)])
+        self.assertEqual(self.found('MIL bo'), [(1, 'pets', 0), (1, 'pets', 1)])
+        self.assertEqual(self.found('bak'), [(0, 'food', 1)])
+        self.assertEqual(self.found('cat'), [(0, 'food', 0), (1, 'pets', 0), (1, 'pets', 1)])
+        self.assertEqual(self.found('milk', limit=2), [(0, 'food', 0), (1, 'pets', 0)])
+        self.assertEqual(self.found('  '), [])
+        self.assertEqual(self.found('tea'), [])
+
+    def test_1_fuzzy(self):
+        self.create(0, 'food').add_field(**dict(self.test_data, description='groceries'))
+        self.assertEqual(self.found('grocereis'), [])
+        self.assertEqual(self.found('grocereis', fuzzy=True), [(0, 'food', 0)])
+        self.assertEqual(self.found('grocries', fuzzy=True), [(0, 'food', 0)])
+        self.assertEqual(self.found('grccries', fuzzy=True), [])
+        self.assertEqual(edit_distance('ab', 'ba'), 1)
+        self.assertEqual(edit_distance('abc', 'bca'), 2)
+
+    def test_2_changes(self):
+        food = self.create(0, 'food')
+        for description in ('milk', 'bread', 'milk'):
+            food.add_field(**dict(self.test_data, description=description))
+        food.delete_field(0)
+        self.assertEqual(self.found('milk'), [(0, 'food', 1)])
+        food.change_field(1, description='tea')
+        self.assertEqual(self.found('milk'), [])
+        self.assertEqual(self.found('tea'), [(0, 'food', 1)])
+        self.assertNotIn('milk', self.index.sorted_tokens)
+        self.assertNotIn('mil', self.index.variants)
+        self.index.category_deleted(self.months[0], food)
+        self.assertEqual(self.found('tea'), [])
+        self.assertEqual(self.index.sorted_tokens, [])
+        self.assertEqual(self.index.postings, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from FinanceApp import tracing
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        self.global_tracer = tracing.TRACER
+        self.tracer = tracing.TRACER = tracing.Tracer()
+
+    def tearDown(self):
+        self.tracer.stop()
+        tracing.TRACER = self.global_tracer
+
+    def test_0_disabled(self):
+        callback = self.test_0_disabled
+        self.assertIs(tracing.traced(callback), callback)
+        with self.tracer.span('span'):
+            pass
+        self.assertFalse(self.tracer.events)
+
+    def test_1_spans(self):
+        self.tracer.start()
+
+        def handler(value):
+            with self.tracer.span('inner'):
+                return value * 2
+
+        self.assertEqual(tracing.traced(handler)(2), 4)
+        self.assertEqual([event['name'] for event in self.tracer.events],
+                         ['inner', 'TestTracing.test_1_spans'])
+        inner, outer = self.tracer.events
+        self.assertLessEqual(outer['ts'], inner['ts'])
+        self.assertGreaterEqual(outer['dur'], inner['dur'])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'trace.json')
+            self.tracer.export(path)
+            with open(path, encoding='utf-8') as trace:
+                events = json.load(trace)['traceEvents']
+        self.assertEqual([event['ph'] for event in events], ['M', 'X', 'X'])
+
+    def test_2_slow_callback(self):
+        self.tracer.start(threshold=20)
+
+        def slow_handler():
+            time.sleep(0.1)
+
+        with self.assertLogs('FinanceApp.tracing', 'WARNING') as logs:
+            tracing.traced(slow_handler, name='slow')()
+        self.assertIn('slow blocked the event loop', logs.output[0])
+        self.assertIn('in slow_handler', logs.output[0])
+        self.assertIn('stack', self.tracer.events[-1]['args'])
+
+
+if __name__ == '__main__':
+    unittest.main()
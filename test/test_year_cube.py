@@ -0,0 +1,73 @@
+import unittest
+
+from FinanceApp.month_window import CategoryIds
+from FinanceApp.year_cube import YearCube, day_of
+from test.storage import MonthData
+
+
+class TestYearCube(unittest.TestCase):
+    test_data = {
+        'amount': 152.,
+        'date': '2021-05-27',
+        'description': 'description',
+        'subcategory': 'cat food'
+    }
+
+    def setUp(self):
+        self.cube = YearCube()
+        category_ids = CategoryIds()
+        self.months = [MonthData(month, observers=[self.cube], category_ids=category_ids) for month in range(2)]
+
+    def create(self, month, name):
+        category = self.months[month].add_category(name)
+        self.cube.category_created(self.months[month], category)
+        return category
+
+    def test_0_day_of(self):
+        self.assertEqual(day_of('2021-05-07'), 7)
+        self.assertEqual(day_of(''), 0)
+        self.assertEqual(day_of(0), 0)
+
+    def test_1_totals(self):
+        food = self.create(0, 'food')
+        food.add_field(**self.test_data)
+        food.add_field(**dict(self.test_data, amount=8., date='2021-05-01'))
+        self.create(1, 'food').add_field(**dict(self.test_data, amount=40., date=''))
+        self.create(1, 'rent').add_field(**dict(self.test_data, amount=500.))
+        self.assertEqual(self.cube.totals('category'), {'food': 200., 'rent': 500.})
+        self.assertEqual(self.cube.totals('month'), {0: 160., 1: 540.})
+        self.assertEqual(self.cube.totals('day', month=1), {0: 40., 27: 500.})
+        self.assertEqual(self.cube.totals('month', category='food', day=1), {0: 8.})
+        self.assertEqual(self.cube.total(), 700.)
+        self.assertEqual(self.cube.totals('category', category='travel'), {})
+
+    def test_2_changes(self):
+        food = self.create(0, 'food')
+        for amount in range(3):
+            food.add_field(**dict(self.test_data, amount=float(amount + 1)))
+        food.change_field(0, amount=10., date='2021-05-02')
+        food.delete_field(1)
+        self.assertEqual(self.cube.totals('day'), {2: 10., 27: 3.})
+        self.cube.category_deleted(self.months[0], food)
+        self.assertEqual(self.cube.totals('category'), {})
+
+    def test_3_add_month(self):
+        category = self.months[1].add_category('food')
+        category.fields.append(**self.test_data)
+        self.cube.add_month(self.months[1])
+        self.assertEqual(self.cube.totals('month'), {1: 152.})
+
+    def test_4_category_ids(self):
+        food = self.create(0, 'food')
+        self.assertEqual(self.create(1, 'food').id, food.id)
+        other = self.create(0, 'food')
+        self.assertNotEqual(other.id, food.id)
+        food.add_field(**self.test_data)
+        other.add_field(**dict(self.test_data, amount=8.))
+        self.assertEqual(len(self.cube.names), 2)
+        self.assertEqual(self.cube.totals('category'), {'food': 160.})
+        self.assertEqual(self.cube.totals('month', category='food'), {0: 160.})
+
+
+if __name__ == '__main__':
+    unittest.main()
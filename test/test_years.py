@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+
+from FinanceApp import month_window
+from FinanceApp.storage import SQLiteStorage
+from FinanceApp.years import YearPartition, YearPartitions, YearSummaries, year_path
+from test.storage import MonthData
+
+
+class TestYears(unittest.TestCase):
+    test_data = {
+        'amount': 152.,
+        'date': '2021-05-27',
+        'description': 'description',
+        'subcategory': 'cat food'
+    }
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ledger.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def open_storage(self, year):
+        return SQLiteStorage(year_path(self.path, year))
+
+    def fill(self, partition, month, name, amount):
+        month_data = MonthData(month, observers=partition.observers)
+        partition.storage.load_month(month_data)
+        partition.year_cube.add_month(month_data)
+        category = month_data.add_category(name)
+        for observer in partition.observers:
+            observer.category_created(month_data, category)
+        category.add_field(**dict(self.test_data, amount=amount))
+        partition.loaded_months.add(month)
+
+    def test_0_year_path(self):
+        self.assertEqual(year_path(os.path.join('data', 'ledger.db'), 2021), os.path.join('data', 'ledger-2021.db'))
+        self.assertEqual(year_path('journal' + os.sep, 2021), 'journal-2021')
+
+    def test_1_summary(self):
+        partition = YearPartition(2021, self.open_storage(2021))
+        self.fill(partition, 0, 'food', 10.)
+        self.fill(partition, 3, 'rent', 300.)
+        partition.close()
+
+        partition = YearPartition(2021, self.open_storage(2021))
+        self.fill(partition, 0, 'food', 5.)
+        self.assertEqual(partition.summary(), {0: {'food': 15.}, 3: {'rent': 300.}})
+        self.assertEqual(partition.summary({3: {'rent': 1.}}), {0: {'food': 15.}, 3: {'rent': 1.}})
+        partition.close()
+
+    def test_2_eviction(self):
+        summaries = YearSummaries(os.path.join(self.directory.name, 'summaries.json'))
+        partitions = YearPartitions(self.open_storage, max_years=2, summaries=summaries)
+        for year in (2019, 2020, 2021):
+            self.fill(partitions.get(year), 0, 'food', float(year))
+        self.assertNotIn(2019, partitions)
+        self.assertEqual(summaries.get(2019), {0: {'food': 2019.}})
+        partitions.get(2020)
+        partitions.get(2019)
+        self.assertEqual(list(partitions.partitions), [2020, 2019])
+        partitions.close()
+
+        summaries = YearSummaries(summaries.path)
+        self.assertEqual(summaries.totals('year'), {2019: 2019., 2020: 2020., 2021: 2021.})
+        self.assertEqual(summaries.totals('category'), {'food': 6060.})
+
+    def test_3_memory_years(self):
+        partitions = YearPartitions(max_years=1)
+        for year in (2020, 2021):
+            month_data = MonthData(0, observers=partitions.get(year).observers)
+            category = month_data.add_category('food')
+            partitions.get(year).year_cube.category_created(month_data, category)
+            category.add_field(**self.test_data)
+        self.assertIn(2020, partitions)
+        self.assertEqual(partitions.summarize().totals('month'), {0: 304.})
+
+    def test_4_load_data(self):
+        partition = YearPartition(2021, self.open_storage(2021))
+        self.fill(partition, 4, 'food', 10.)
+        partition.close()
+
+        partition = YearPartition(2021, self.open_storage(2021))
+        partition.load_data(4)
+        partition.load_data(4)
+        self.assertEqual(partition.year_cube.total(), 10.)
+        self.assertEqual(len(partition.search_index.search('cat food')), 1)
+        month = month_window.MonthData(4, observers=partition.observers, category_ids=partition.category_ids)
+        month.take_categories(partition.months_data.pop(4))
+        month.category_by_name('food').add_field(**self.test_data)
+        self.assertEqual(partition.year_cube.total(), 162.)
+        self.assertEqual(partition.summary(), {4: {'food': 162.}})
+        partition.close()
+
+
+if __name__ == '__main__':
+    unittest.main()